@@ -4,9 +4,10 @@
 ####################################################
 import math
 
-import pygame
 import stop_and_go_globals as sg
-from stop_and_go_data_type import CarState, CarTurn, HeadingDirection
+from stop_and_go_approach import Arc_Table, get_approach
+from stop_and_go_data_type import CarState, CarTurn
+from stop_and_go_world import World_Column
 
 ####################################################
 
@@ -20,7 +21,7 @@ class Stop_Area(object):
                 y(float)              : Y-position of the stop area where it starts in x-coordinate
                 width(float)          : Width of the stop area where it ends in x-direction
                 length(float)         : Length of the stop area where it ends in y-direction
-                window(pygame window) : Current frame
+                window(canvas)        : Current frame
         """
         self.x = x  # X-position of the stop area
         self.y = y  # Y-position of the stop area
@@ -50,9 +51,9 @@ class Stop_Area(object):
                 color(list)           : Default is white color to draw the intersection
         """
         if no_car:
-            pygame.draw.rect(self.window, sg.GREEN, (self.x, self.y, self.width, self.length))
+            self.window.rect(sg.GREEN, (self.x, self.y, self.width, self.length))
         else:
-            pygame.draw.rect(self.window, sg.WHITE, (self.x, self.y, self.width, self.length))
+            self.window.rect(sg.WHITE, (self.x, self.y, self.width, self.length))
 
 
 ####################################################################
@@ -80,16 +81,20 @@ class Stop_Line(object):
     def draw(self, window):
         """ Draw the stop lines.
             Args:
-                window(pygame window)        : Current frame
+                window(canvas)               : Current frame
         """
-        pygame.draw.line(window, sg.BLACK, self.start, self.stop, self.line_width)
-        pygame.draw.line(window, sg.RED, self.start, self.stop, self.line_width)
+        window.line(sg.BLACK, self.start, self.stop, self.line_width)
+        window.line(sg.RED, self.start, self.stop, self.line_width)
 
 
 ###################################################################################################
 
 
 class Turn_Status(object):
+    # Stored in the World_State columns once the car is bound to a world
+    turning = World_Column("turning")
+    turned = World_Column("turned")
+
     def __init__(self, car_seq, car_turn, car_width, car_length):
         """ Maintain the turn status properties of the cars. This gets the center of curvature ,
             and center points of the car about to take turn. It is applied during turning of the car.
@@ -108,6 +113,7 @@ class Turn_Status(object):
         self.car_turn = car_turn  # Car's turn type
         self.car_width = car_width  # Car's width
         self.car_length = car_length  # car's length
+        self.arc_table = None  # Precomputed poses along the turn ( Arc_Table )
 
     #############################################################################
 
@@ -119,35 +125,16 @@ class Turn_Status(object):
                 center_y(float)         : Y coordinate of the center around car is about to take turn
                 seq(int)                : Sequence of the car
                 turn(int)               : Turn type ( left, right , no)
-                window(pygame window)   : Current frame
+                window(canvas)          : Current frame
         """
-        if (seq == sg.CAR_SEQ_2) or (seq == sg.CAR_SEQ_4):
-            intersection_y = path_list_y
-            self.radius = abs(center_y - intersection_y)
-        if (seq == sg.CAR_SEQ_1) or (seq == sg.CAR_SEQ_3):
-            intersection_x = path_list_y
-            self.radius = abs(center_x - intersection_x)
-        if ((seq == sg.CAR_SEQ_4) and (turn == CarTurn.RIGHT.value)) or (
-            (seq == sg.CAR_SEQ_2) and (turn == CarTurn.LEFT.value)
-        ):
-            self.turn_center_x = center_x + self.radius
-            self.turn_center_y = center_y
-        elif ((seq == sg.CAR_SEQ_4) and (turn == CarTurn.LEFT.value)) or (
-            (seq == sg.CAR_SEQ_2) and (turn == CarTurn.RIGHT.value)
-        ):
-            self.turn_center_x = center_x - self.radius
-            self.turn_center_y = center_y
-        elif ((seq == sg.CAR_SEQ_1) and (turn == CarTurn.RIGHT.value)) or (
-            (seq == sg.CAR_SEQ_3) and (turn == CarTurn.LEFT.value)
-        ):
-            self.turn_center_x = center_x
-            self.turn_center_y = center_y + self.radius
-        elif ((seq == sg.CAR_SEQ_1) and (turn == CarTurn.LEFT.value)) or (
-            (seq == sg.CAR_SEQ_3) and (turn == CarTurn.RIGHT.value)
-        ):
-            self.turn_center_x = center_x
-            self.turn_center_y = center_y - self.radius
-
+        approach = get_approach(seq, turn)
+        center = (center_x, center_y)
+        self.radius = abs(center[approach.axis] - path_list_y)
+        self.turn_center_x = center_x + approach.center_direction[0] * self.radius
+        self.turn_center_y = center_y + approach.center_direction[1] * self.radius
+
+        # Arc table is built from the final radius when the car starts turning
+        self.arc_table = None
         self.turning = True
 
 
@@ -155,6 +142,9 @@ class Turn_Status(object):
 
 
 class Pose(object):
+    x = World_Column("x")
+    y = World_Column("y")
+
     def __init__(self, x, y, heading_angle):
         """ Car's Pose information e.g current position, heading angle
             Args:
@@ -171,6 +161,9 @@ class Pose(object):
 
 
 class DynamicState(object):
+    speed = World_Column("speed")
+    set_speed = World_Column("set_speed")
+
     def __init__(self):
         """ Car's dynamic state information e.g speed, acceleartion """
         self.speed = 0  # Current speed of the car
@@ -198,6 +191,11 @@ class PhysicalProperties(object):
 
 
 class SimState(object):
+    dp = World_Column("dp")
+    end = World_Column("end")
+    overlap = World_Column("overlap")
+    stop_car = World_Column("stop_car")
+
     def __init__(self, seq):
         """ Car's simulation State information.
             Args:
@@ -217,6 +215,8 @@ class SimState(object):
 
 
 class Car(object):
+    time_index = World_Column("time_index")
+
     def __init__(self, x, y, width, length, seq, sim, heading_angle, window):
         """ Car's information. This contains the information about the car
             at particular time.
@@ -229,7 +229,7 @@ class Car(object):
                 sim(object)           : Car' simulation object which contains simulation data for
                                         the car instance
                 heading_angle(rad)    : Car's current heading angle
-                window(pygame window) : Current frame
+                window(canvas)        : Current frame
         """
         self.pose = Pose(x, y, heading_angle)
         self.prev_pose = Pose(0, 0, 0)
@@ -245,38 +245,15 @@ class Car(object):
         self.Turn_Status = Turn_Status(
             self.sim_state.seq, self.sim.turn, self.physical_properties.width, self.physical_properties.length
         )  # Instantiate the Turn_Status
-        self.car_turn_path = {}  # Store the car seq key and path turn no as { no_turn, left_turn, right_turn }
-        self.populate_car_turn_path_no()  # Populate the car_turn_path
 
     ####################################################
 
-    def populate_car_turn_path_no(self):
-        """ Mapping of the car's turn information based on the type of turn
-            Car seq_no (key) , List[no_path_seq_no, left_turn_path_seq_no, right_turn_path_seq_no]
+    def get_approach(self):
+        """ Get the approach descriptor for the car's sequence number and turn
+            Returns:
+                object       : Approach of the car
         """
-        self.car_turn_path[sg.CAR_SEQ_1] = [
-            (sg.PATH_SEQ_0, HeadingDirection.EAST.value),
-            (sg.PATH_SEQ_3, HeadingDirection.NORTH.value),
-            (sg.PATH_SEQ_1, HeadingDirection.SOUTH.value),
-        ]
-
-        self.car_turn_path[sg.CAR_SEQ_2] = [
-            (sg.PATH_SEQ_1, HeadingDirection.SOUTH.value),
-            (sg.PATH_SEQ_0, HeadingDirection.EAST.value),
-            (sg.PATH_SEQ_2, HeadingDirection.WEST.value),
-        ]
-
-        self.car_turn_path[sg.CAR_SEQ_3] = [
-            (sg.PATH_SEQ_2, HeadingDirection.WEST.value),
-            (sg.PATH_SEQ_1, HeadingDirection.SOUTH.value),
-            (sg.PATH_SEQ_3, HeadingDirection.NORTH.value),
-        ]
-
-        self.car_turn_path[sg.CAR_SEQ_4] = [
-            (sg.PATH_SEQ_3, HeadingDirection.NORTH.value),
-            (sg.PATH_SEQ_2, HeadingDirection.WEST.value),
-            (sg.PATH_SEQ_0, HeadingDirection.EAST.value),
-        ]
+        return get_approach(self.sim_state.seq, self.sim.turn)
 
     ####################################################
 
@@ -319,46 +296,6 @@ class Car(object):
 
     ####################################################
 
-    def rotate_point_origin(self, angle):
-        """ Rotate the car around it's center and
-            return the car's new boundary points to draw on farme.
-            Args:
-                angle(radian)  : Angle about which car is taking turn.
-            Returns:
-                list           : Returns the new car's center and new boundary points
-                                 after the rotation.
-        """
-        new_points = []
-        (o_x, o_y) = self.get_car_center()
-        points = self.get_car_point_list()
-
-        # Anticlockwise Rotation
-        if (
-            (self.sim_state.seq == sg.CAR_SEQ_4)
-            or (self.sim_state.seq == sg.CAR_SEQ_1 and self.sim.turn == CarTurn.RIGHT.value)
-            or (self.sim_state.seq == sg.CAR_SEQ_3 and self.sim.turn == CarTurn.RIGHT.value)
-        ):
-            for point in points:
-                x1 = o_x + math.cos(angle) * (point[0] - o_x) + math.sin(angle) * (point[1] - o_y)
-                y1 = o_y - math.sin(angle) * (point[0] - o_x) + math.cos(angle) * (point[1] - o_y)
-                new_points.append([x1, y1])
-
-        # Clockwise Rotation
-        elif (
-            (self.sim_state.seq == sg.CAR_SEQ_2)
-            or (self.sim_state.seq == sg.CAR_SEQ_1 and self.sim.turn == CarTurn.LEFT.value)
-            or (self.sim_state.seq == sg.CAR_SEQ_3 and self.sim.turn == CarTurn.LEFT.value)
-        ):
-            for point in points:
-                x1 = o_x + math.cos(angle) * (point[0] - o_x) - math.sin(angle) * (point[1] - o_y)
-                y1 = o_y + math.sin(angle) * (point[0] - o_x) + math.cos(angle) * (point[1] - o_y)
-
-                new_points.append([x1, y1])
-
-        return new_points
-
-    ####################################################
-
     def get_car_center(self):
         """ Returns the center of the car
             Returns:
@@ -368,60 +305,6 @@ class Car(object):
 
     ####################################################
 
-    def get_turning_angle(self, ang_rad):
-        """ Get the turning angle of car around center of the curvature.
-            Args:
-                ang_rad(radian)       : Based on the car's displacement, get the actual angle of rotation
-            Returns:
-                radian                : Returns the turning angle of the car from the
-                                        center of curvature
-        """
-        if ((self.sim.turn == CarTurn.RIGHT.value) and (self.sim_state.seq == sg.CAR_SEQ_4)) or (
-            (self.sim_state.seq == sg.CAR_SEQ_2) and (self.sim.turn == CarTurn.LEFT.value)
-        ):
-            cur_ang = math.pi - ang_rad
-        elif ((self.sim.turn == CarTurn.LEFT.value) and (self.sim_state.seq == sg.CAR_SEQ_4)) or (
-            (self.sim_state.seq == sg.CAR_SEQ_2) and (self.sim.turn == CarTurn.RIGHT.value)
-        ):
-            cur_ang = ang_rad
-        elif (self.sim_state.seq == sg.CAR_SEQ_1) or (self.sim_state.seq == sg.CAR_SEQ_3):
-            cur_ang = math.pi / 2 - ang_rad
-
-        return cur_ang
-
-    ####################################################
-
-    def get_delta_increments(self, cur_ang):
-        """ Delta increment of the car while turning.
-            Args:
-                cur_ang(radian)     : Car's displacement in x-y direction based on the car's turn
-                                      around the angle.
-            Returns:
-                float               : Returns the car's displacement in x direction
-                float               : Returns the car's displacement in y direction
-        """
-        # Calculate delta increment about the center of AV
-        if (self.sim_state.seq == sg.CAR_SEQ_4) or (
-            self.sim_state.seq == sg.CAR_SEQ_1 and self.sim.turn == CarTurn.RIGHT.value
-        ):
-            dx = self.Turn_Status.radius * math.cos(cur_ang)
-            dy = -self.Turn_Status.radius * math.sin(cur_ang)
-        elif (self.sim_state.seq == sg.CAR_SEQ_2) or (
-            self.sim_state.seq == sg.CAR_SEQ_1 and self.sim.turn == CarTurn.LEFT.value
-        ):
-            dx = self.Turn_Status.radius * math.cos(cur_ang)
-            dy = self.Turn_Status.radius * math.sin(cur_ang)
-        elif (self.sim_state.seq == sg.CAR_SEQ_3) and (self.sim.turn == CarTurn.RIGHT.value):
-            dx = -self.Turn_Status.radius * math.cos(cur_ang)
-            dy = self.Turn_Status.radius * math.sin(cur_ang)
-        elif (self.sim_state.seq == sg.CAR_SEQ_3) and (self.sim.turn == CarTurn.LEFT.value):
-            dx = -self.Turn_Status.radius * math.cos(cur_ang)
-            dy = -self.Turn_Status.radius * math.sin(cur_ang)
-
-        return dx, dy
-
-    ####################################################
-
     def set_turning_car_points(self, path_list, Stop_Area):
         """ Get the new boundary points while turning to draw it on frame
             Args:
@@ -429,21 +312,13 @@ class Car(object):
                                     at the end of the turn
                 Stop_area(object) : Get the previous x, y positions of the car based on the stop area
         """
-        path_const_xy = path_list[self.car_turn_path[self.sim_state.seq][self.sim.turn][0]].const_xy
-
-        cur_ang = 0
+        approach = self.get_approach()
+        path_const_xy = path_list[approach.path_seq].const_xy
 
         self.sim_state.t_dp += self.sim_state.dp
 
         # Angle made by car based on its total displacement along the path trajectory
         av_ang_rad = self.sim_state.t_dp / self.Turn_Status.radius
-        cur_ang = self.get_turning_angle(av_ang_rad)
-
-        dx, dy = self.get_delta_increments(cur_ang)
-
-        # Turned around the center of object. Exact initial points of the object (x, y).
-        self.pose.x = self.Turn_Status.turn_center_x + dx - self.physical_properties.width / 2
-        self.pose.y = self.Turn_Status.turn_center_y + dy - self.physical_properties.length / 2
 
         # When to stop turning : Each AV is making 90 degree turn
         if av_ang_rad > math.pi / 2:
@@ -453,13 +328,11 @@ class Car(object):
             self.Turn_Status.turned = True
             # Set the heading angle PI/2
             self.pose.heading_angle = math.pi / 2
-            # Get the final x and y
-            if (self.sim_state.seq == sg.CAR_SEQ_4) or (self.sim_state.seq == sg.CAR_SEQ_2):
-                self.pose.x = self.prev_pose.x
-                self.pose.y = path_const_xy - self.physical_properties.width / 2
-            else:
-                self.pose.x = path_const_xy - self.physical_properties.length / 2
-                self.pose.y = self.prev_pose.y
+            # Get the final x and y. Car is centered on the new path and keeps its position across it
+            extents = (self.physical_properties.width, self.physical_properties.length)
+            position = [self.prev_pose.x, self.prev_pose.y]
+            position[approach.axis] = path_const_xy - extents[1 - approach.axis] / 2
+            self.pose.x, self.pose.y = position
 
             # Switch length and width of the car , as AV made 90 degree turn
             tmp = self.physical_properties.length
@@ -467,25 +340,35 @@ class Car(object):
             self.physical_properties.width = tmp
 
             # Update the heading direction
-            self.pose.heading_direction = self.car_turn_path[self.sim_state.seq][self.sim.turn][1]
+            self.pose.heading_direction = approach.heading_direction
 
             return
 
-        if (self.sim_state.seq == sg.CAR_SEQ_2) or (self.sim_state.seq == sg.CAR_SEQ_4):
+        if self.Turn_Status.arc_table is None:
+            self.Turn_Status.arc_table = Arc_Table(
+                approach, self.Turn_Status.radius, self.physical_properties.width, self.physical_properties.length
+            )
+
+        # Center offset, heading and boundary points around the center at the travelled arc length
+        row = self.Turn_Status.arc_table.lookup(self.sim_state.t_dp).tolist()
+        center_x = self.Turn_Status.turn_center_x + row[0]
+        center_y = self.Turn_Status.turn_center_y + row[1]
+
+        # Turned around the center of object. Exact initial points of the object (x, y).
+        self.pose.x = center_x - self.physical_properties.width / 2
+        self.pose.y = center_y - self.physical_properties.length / 2
+
+        if approach.axis == 1:
             self.prev_pose.y = self.pose.y
-        if (self.sim_state.seq == sg.CAR_SEQ_1) or (self.sim_state.seq == sg.CAR_SEQ_3):
+        else:
             self.prev_pose.x = self.pose.x
 
-        # Angle made by object with x-axis
-        if (self.sim_state.seq == sg.CAR_SEQ_1) or (self.sim_state.seq == sg.CAR_SEQ_3):
-            cur_ang = math.pi / 2 + cur_ang
-
         if sg.DEBUG == sg.DEBUG_LEVEL_1:
-            print(" av_ang_rad = and cur_ang = , seq ", av_ang_rad, cur_ang, self.sim_state.seq)
+            print(" av_ang_rad = , seq ", av_ang_rad, self.sim_state.seq)
 
-        self.pose.heading_angle = av_ang_rad
+        self.pose.heading_angle = row[2]
 
-        new_points = self.rotate_point_origin(cur_ang)
+        new_points = [[center_x + row[3 + 2 * k], center_y + row[4 + 2 * k]] for k in range(4)]
 
         self.update_prev_xy(Stop_Area)
 
@@ -498,33 +381,22 @@ class Car(object):
             Args:
                 Stop_Area(object) : Based on Stop area position, set the car's previous x, y
         """
-        # Left Turns
-        if self.sim.turn == CarTurn.LEFT.value and self.sim_state.seq == sg.CAR_SEQ_1:
-            self.prev_pose.y = (
-                Stop_Area.corners[self.sim_state.seq][1] - self.physical_properties.width - sg.STOP_SAFE_OFFSET
-            )
-        if self.sim.turn == CarTurn.LEFT.value and self.sim_state.seq == sg.CAR_SEQ_2:
-            self.prev_pose.x = Stop_Area.corners[self.sim_state.seq][1] + sg.STOP_SAFE_OFFSET
-        if self.sim.turn == CarTurn.LEFT.value and self.sim_state.seq == sg.CAR_SEQ_3:
-            self.prev_pose.y = Stop_Area.corners[self.sim_state.seq][1] + sg.STOP_SAFE_OFFSET
-        if self.sim.turn == CarTurn.LEFT.value and self.sim_state.seq == sg.CAR_SEQ_4:
-            self.prev_pose.x = (
-                Stop_Area.corners[self.sim_state.seq][1] - self.physical_properties.length - sg.STOP_SAFE_OFFSET
-            )
+        approach = self.get_approach()
+        if approach.turn == CarTurn.NO.value:
+            return
 
-        # Right Turns
-        if self.sim.turn == CarTurn.RIGHT.value and self.sim_state.seq == sg.CAR_SEQ_1:
-            self.prev_pose.y = Stop_Area.corners[self.sim_state.seq][2] + sg.STOP_SAFE_OFFSET
-        if self.sim.turn == CarTurn.RIGHT.value and self.sim_state.seq == sg.CAR_SEQ_2:
-            self.prev_pose.x = (
-                Stop_Area.corners[self.sim_state.seq][2] - self.physical_properties.length - sg.STOP_SAFE_OFFSET
-            )
-        if self.sim.turn == CarTurn.RIGHT.value and self.sim_state.seq == sg.CAR_SEQ_3:
-            self.prev_pose.y = (
-                Stop_Area.corners[self.sim_state.seq][2] - self.physical_properties.width - sg.STOP_SAFE_OFFSET
-            )
-        if self.sim.turn == CarTurn.RIGHT.value and self.sim_state.seq == sg.CAR_SEQ_4:
-            self.prev_pose.x = Stop_Area.corners[self.sim_state.seq][2] + sg.STOP_SAFE_OFFSET
+        # Position across the path from the stop area corner of the turn ( 1 = left, 2 = right )
+        corner = Stop_Area.corners[self.sim_state.seq][approach.turn]
+        if approach.prev_extent_index is None:
+            prev_xy = corner + sg.STOP_SAFE_OFFSET
+        else:
+            extents = (self.physical_properties.width, self.physical_properties.length)
+            prev_xy = corner - extents[approach.prev_extent_index] - sg.STOP_SAFE_OFFSET
+
+        if approach.axis == 0:
+            self.prev_pose.y = prev_xy
+        else:
+            self.prev_pose.x = prev_xy
 
     ####################################################
 
@@ -535,18 +407,16 @@ class Car(object):
                 color(list)        : Default color to draw the car is blue
         """
         if collision:
-            pygame.draw.rect(
-                self.window,
-                sg.RED,
-                (self.pose.x, self.pose.y, self.physical_properties.width, self.physical_properties.length),
+            self.window.rect(
+                sg.RED, (self.pose.x, self.pose.y, self.physical_properties.width, self.physical_properties.length)
             )
         else:
             if self.Turn_Status.turning:
                 points = self.get_car_point_list(Create=False)
-                pygame.draw.polygon(self.window, color, points, 0)
+                self.window.polygon(color, points)
             else:
                 points = self.get_car_point_list()
-                pygame.draw.polygon(self.window, color, points, 0)
+                self.window.polygon(color, points)
 
     ####################################################
 
@@ -563,55 +433,17 @@ class Car(object):
 
     def no_turn_update(self):
         """ Incremental movement of the car in case of no turns """
-        if self.sim_state.seq == sg.CAR_SEQ_1:
-            dx = self.sim_state.dp
-            dy = 0
-        elif self.sim_state.seq == sg.CAR_SEQ_2:
-            dx = 0
-            dy = self.sim_state.dp
-        elif self.sim_state.seq == sg.CAR_SEQ_3:
-            dx = -self.sim_state.dp
-            dy = 0
-        elif self.sim_state.seq == sg.CAR_SEQ_4:
-            dx = 0
-            dy = -self.sim_state.dp
-
-        self.update(dx, dy)
+        direction = self.get_approach().direction
+
+        self.update(direction[0] * self.sim_state.dp, direction[1] * self.sim_state.dp)
 
     ####################################################
 
     def after_turn_update(self):
         """ Incremental movement of the car in case of turns """
-        if self.sim_state.seq == sg.CAR_SEQ_1:
-            if self.sim.turn == CarTurn.RIGHT.value:
-                dx = 0
-                dy = self.sim_state.dp
-            elif self.sim.turn == CarTurn.LEFT.value:
-                dx = 0
-                dy = -self.sim_state.dp
-        elif self.sim_state.seq == sg.CAR_SEQ_2:
-            if self.sim.turn == CarTurn.RIGHT.value:
-                dx = -self.sim_state.dp
-                dy = 0
-            elif self.sim.turn == CarTurn.LEFT.value:
-                dx = self.sim_state.dp
-                dy = 0
-        elif self.sim_state.seq == sg.CAR_SEQ_3:
-            if self.sim.turn == CarTurn.RIGHT.value:
-                dx = 0
-                dy = -self.sim_state.dp
-            elif self.sim.turn == CarTurn.LEFT.value:
-                dx = 0
-                dy = self.sim_state.dp
-        elif self.sim_state.seq == sg.CAR_SEQ_4:
-            if self.sim.turn == CarTurn.RIGHT.value:
-                dx = self.sim_state.dp
-                dy = 0
-            elif self.sim.turn == CarTurn.LEFT.value:
-                dx = -self.sim_state.dp
-                dy = 0
-
-        self.update(dx, dy)
+        direction = self.get_approach().turned_direction
+
+        self.update(direction[0] * self.sim_state.dp, direction[1] * self.sim_state.dp)
 
     ####################################################
 
@@ -637,12 +469,12 @@ class Car(object):
         """
         if not self.sim_state.stop_car:
             # Going through the Constant speed/CRUISE Before zone
-            round_time_index = round(self.time_index, 2)
-            if round_time_index in self.sim.sim_motion_state_dict:
+            tick = self.sim.time_to_tick(self.time_index)
+            if self.sim.is_valid_tick(tick):
                 if self.dynamic_state.set_speed:
                     self.sim_state.dp = self.dynamic_state.speed * sg.TIME_INCREMENT_STEP
                 else:
-                    self.sim_state.dp = self.sim.sim_motion_state_dict[round_time_index][2]
+                    self.sim_state.dp = self.sim.tick_delta_dist[tick]
 
             # If car has reached end, no need to update the x-y positions
             if self.sim_state.end:
@@ -665,7 +497,7 @@ class Car(object):
             if self.sim.turn == CarTurn.LEFT.value or self.sim.turn == CarTurn.RIGHT.value:
                 center_x, center_y = self.get_car_center()
                 self.Turn_Status.get_turn_circle_center(
-                    path_list[self.car_turn_path[self.sim_state.seq][self.sim.turn][0]].const_xy,
+                    path_list[self.get_approach().path_seq].const_xy,
                     center_x,
                     center_y,
                     self.sim_state.seq,
@@ -698,12 +530,12 @@ class Path(object):
     def render_path(self, window, is_green=False):
         """ Utility to draw the path
             Args:
-                window(pygame window)    : To draw the object on the frame
+                window(canvas)           : To draw the object on the frame
                 is_green(bool)           : Default color is GREEN
         """
         colour = sg.GREEN if is_green else sg.WHITE
 
-        pygame.draw.line(window, colour, self.start, self.stop, sg.PATH_LINE_WIDTH)
+        window.line(colour, self.start, self.stop, sg.PATH_LINE_WIDTH)
 
 
 ############################################################################################
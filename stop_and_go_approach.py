@@ -0,0 +1,184 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : Descriptors of the car's approach to the intersection
+#               for each (car sequence, turn) and the precomputed
+#               turning arc tables
+#####################################################################
+import math
+
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_data_type import CarTurn, HeadingDirection
+
+#####################################################################
+
+
+class Approach(object):
+    """ Geometry of the car's motion for one (car sequence, turn). Axis 0 is x and axis 1 is y """
+
+    def __init__(
+        self,
+        seq,
+        turn,
+        direction,
+        path_seq,
+        heading_direction,
+        turned_direction=(0, 0),
+        angle_base=0.0,
+        angle_sign=0,
+        delta_sign=(0, 0),
+        rotation_sign=0,
+        center_direction=(0, 0),
+        prev_extent_index=None,
+    ):
+        """ Initializes the approach with
+            Args:
+                seq(int)                  : Car sequence number
+                turn(int)                 : Car turn { left, right, no }
+                direction(tuple)          : Unit displacement (dx, dy) before the turn
+                path_seq(int)             : Sequence number of the path the car ends on
+                heading_direction(int)    : HeadingDirection value after the turn
+                turned_direction(tuple)   : Unit displacement (dx, dy) after the turn
+                angle_base(radian)        : Turning angle when the car starts turning
+                angle_sign(int)           : Sign of the turning angle change with the travelled angle
+                delta_sign(tuple)         : Signs of the (cos, sin) terms of the car center around the turn center
+                rotation_sign(int)        : 1 for the clockwise rotation of the car's body, -1 for anticlockwise
+                center_direction(tuple)   : Unit offset of the turn center from the car center at the stop line
+                prev_extent_index(int)    : Car extent ( 0 = width, 1 = length ) subtracted from the stop area
+                                            corner for the position across the path, None to add the offset
+        """
+        self.seq = seq
+        self.turn = turn
+        self.direction = direction
+        self.path_seq = path_seq
+        self.heading_direction = heading_direction
+        self.turned_direction = turned_direction
+        self.angle_base = angle_base
+        self.angle_sign = angle_sign
+        self.delta_sign = delta_sign
+        self.rotation_sign = rotation_sign
+        self.center_direction = center_direction
+        self.prev_extent_index = prev_extent_index
+
+        # Car 1 & 3 travel along x and car 2 & 4 along y
+        self.axis = 0 if direction[0] != 0 else 1
+        # Car 1 & 3 body rotation is measured from the y-axis
+        self.rotation_offset = math.pi / 2 if self.axis == 0 else 0.0
+
+
+#####################################################################
+
+NO = CarTurn.NO.value
+LEFT = CarTurn.LEFT.value
+RIGHT = CarTurn.RIGHT.value
+EAST = HeadingDirection.EAST.value
+WEST = HeadingDirection.WEST.value
+NORTH = HeadingDirection.NORTH.value
+SOUTH = HeadingDirection.SOUTH.value
+HALF_PI = math.pi / 2
+
+APPROACHES = {
+    (sg.CAR_SEQ_1, NO): Approach(sg.CAR_SEQ_1, NO, (1, 0), sg.PATH_SEQ_0, EAST),
+    (sg.CAR_SEQ_1, LEFT): Approach(
+        sg.CAR_SEQ_1, LEFT, (1, 0), sg.PATH_SEQ_3, NORTH, (0, -1), HALF_PI, -1, (1, 1), 1, (0, -1), 0
+    ),
+    (sg.CAR_SEQ_1, RIGHT): Approach(
+        sg.CAR_SEQ_1, RIGHT, (1, 0), sg.PATH_SEQ_1, SOUTH, (0, 1), HALF_PI, -1, (1, -1), -1, (0, 1), None
+    ),
+    (sg.CAR_SEQ_2, NO): Approach(sg.CAR_SEQ_2, NO, (0, 1), sg.PATH_SEQ_1, SOUTH),
+    (sg.CAR_SEQ_2, LEFT): Approach(
+        sg.CAR_SEQ_2, LEFT, (0, 1), sg.PATH_SEQ_0, EAST, (1, 0), math.pi, -1, (1, 1), 1, (1, 0), None
+    ),
+    (sg.CAR_SEQ_2, RIGHT): Approach(
+        sg.CAR_SEQ_2, RIGHT, (0, 1), sg.PATH_SEQ_2, WEST, (-1, 0), 0.0, 1, (1, 1), 1, (-1, 0), 1
+    ),
+    (sg.CAR_SEQ_3, NO): Approach(sg.CAR_SEQ_3, NO, (-1, 0), sg.PATH_SEQ_2, WEST),
+    (sg.CAR_SEQ_3, LEFT): Approach(
+        sg.CAR_SEQ_3, LEFT, (-1, 0), sg.PATH_SEQ_1, SOUTH, (0, 1), HALF_PI, -1, (-1, -1), 1, (0, 1), None
+    ),
+    (sg.CAR_SEQ_3, RIGHT): Approach(
+        sg.CAR_SEQ_3, RIGHT, (-1, 0), sg.PATH_SEQ_3, NORTH, (0, -1), HALF_PI, -1, (-1, 1), -1, (0, -1), 0
+    ),
+    (sg.CAR_SEQ_4, NO): Approach(sg.CAR_SEQ_4, NO, (0, -1), sg.PATH_SEQ_3, NORTH),
+    (sg.CAR_SEQ_4, LEFT): Approach(
+        sg.CAR_SEQ_4, LEFT, (0, -1), sg.PATH_SEQ_2, WEST, (-1, 0), 0.0, 1, (1, -1), -1, (-1, 0), 1
+    ),
+    (sg.CAR_SEQ_4, RIGHT): Approach(
+        sg.CAR_SEQ_4, RIGHT, (0, -1), sg.PATH_SEQ_0, EAST, (1, 0), math.pi, -1, (1, -1), -1, (1, 0), None
+    ),
+}
+
+#####################################################################
+
+
+def get_approach(seq, turn):
+    """ Get the approach descriptor of the car
+        Args:
+            seq(int)       : Car sequence number
+            turn(int)      : Car turn { left, right, no }
+        Returns:
+            object         : Approach of the car
+    """
+    return APPROACHES[(seq, turn)]
+
+
+#####################################################################
+
+
+class Arc_Table(object):
+    """ Precomputed poses of a turning car indexed by the arc length travelled
+        from the start of the turn. Each row has the car center offset from the
+        turn center, the heading angle and the 4 boundary points relative to the
+        car center. Poses between the rows are linearly interpolated.
+    """
+
+    def __init__(self, approach, radius, width, length, num_rows=sg.TURN_ARC_TABLE_SIZE):
+        """ Build the table for the turn
+            Args:
+                approach(object)   : Approach of the turning car
+                radius(float)      : Radius of curvature of the turn
+                width(float)       : Car's width when it starts turning
+                length(float)      : Car's length when it starts turning
+                num_rows(int)      : Number of rows over the quarter circle
+        """
+        self.radius = radius
+        self.arc_length = HALF_PI * radius
+        self.num_rows = num_rows
+        self.row_step = self.arc_length / (num_rows - 1)
+
+        travelled_ang = np.linspace(0.0, HALF_PI, num_rows)
+        cur_ang = approach.angle_base + approach.angle_sign * travelled_ang
+        offset_x = approach.delta_sign[0] * radius * np.cos(cur_ang)
+        offset_y = approach.delta_sign[1] * radius * np.sin(cur_ang)
+
+        # Rotate the car's body around its center
+        rotation = approach.rotation_sign * (cur_ang + approach.rotation_offset)
+        cos_rot = np.cos(rotation)[:, np.newaxis]
+        sin_rot = np.sin(rotation)[:, np.newaxis]
+        corner_x = np.array([-width, width, width, -width]) / 2
+        corner_y = np.array([-length, -length, length, length]) / 2
+        points_x = cos_rot * corner_x - sin_rot * corner_y
+        points_y = sin_rot * corner_x + cos_rot * corner_y
+
+        # Columns : offset_x, offset_y, heading, (x, y) of each boundary point
+        points = np.stack((points_x, points_y), axis=2).reshape(num_rows, 8)
+        self.rows = np.column_stack((offset_x, offset_y, travelled_ang, points))
+
+    #####################################################################
+
+    def lookup(self, arc_length):
+        """ Interpolate the pose at the arc length
+            Args:
+                arc_length(float)   : Arc length travelled from the start of the turn
+            Returns:
+                numpy               : Row with the center offset, heading and boundary points
+        """
+        position = min(max(arc_length / self.row_step, 0.0), self.num_rows - 1)
+        index = min(int(position), self.num_rows - 2)
+        weight = position - index
+        row = self.rows[index]
+
+        return row + weight * (self.rows[index + 1] - row)
+
+
+#####################################################################
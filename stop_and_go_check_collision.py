@@ -57,8 +57,8 @@ class CollisionCheck(object):
         car1 = car_list[seq1]
         car2 = car_list[seq2]
         dist = -1
-        head_dir1 = car1.car_turn_path[car1.sim_state.seq][car1.sim.turn][1]
-        head_dir2 = car2.car_turn_path[car2.sim_state.seq][car2.sim.turn][1]
+        head_dir1 = car1.get_approach().heading_direction
+        head_dir2 = car2.get_approach().heading_direction
         lead_vehicle = seq1
         trail_vehicle = seq2
 
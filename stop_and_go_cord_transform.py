@@ -265,7 +265,7 @@ class CoordinateTransform(object):
     def update_from_main_to_sub(self, window, frame, image_name):
         """ Update the rotated positions in case of turn
             Args:
-                window (pygame window) : Current window
+                window (canvas)        : Current window
                 frame (int)            : Current Frame number
                 image_name (string)    : Image name
             Returns:
@@ -297,10 +297,17 @@ class CoordinateTransform(object):
 
         rotate_img_trns = RotateImage(self.car_list, self.path_list, self.save_sim_flow_data, heading_ang_rad)
 
-        # Images without rotation
-        sub_window_image, ref_car_end = subimg.create_subimage(window, camera_pos_x, camera_pos_y)
-        sub_mask_img = subimg.create_sub_mask_image(sub_window_image)
-        sub_window_image, sub_mask_img = rotate_img_trns.get_rotated_images(cur_time, sub_window_image, sub_mask_img)
+        if window.renders_camera_view:
+            # The window is already drawn in the camera view ( see Drawer.set_camera_view )
+            sub_window_image, ref_car_end = subimg.get_camera_view(window, camera_pos_x, camera_pos_y)
+            sub_mask_img = subimg.create_sub_mask_image(sub_window_image)
+        else:
+            # Images without rotation
+            sub_window_image, ref_car_end = subimg.create_subimage(window, camera_pos_x, camera_pos_y)
+            sub_mask_img = subimg.create_sub_mask_image(sub_window_image)
+            sub_window_image, sub_mask_img = rotate_img_trns.get_rotated_images(
+                cur_time, sub_window_image, sub_mask_img
+            )
 
         # Save once at the end of drawing traffic
         if image_name == sg.TRAFFIC_IMAGE_KEYWORD:
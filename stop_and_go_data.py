@@ -3,10 +3,12 @@
 # Description : Regenerated data after the simulation
 ####################################################
 import json
+import os
 
+import numpy as np
 import stop_and_go_globals as sg
 from stop_and_go_check_collision import CollisionCheck
-from stop_and_go_data_type import CarState
+from stop_and_go_data_type import CarState, CarTurn
 
 #####################################################################################
 
@@ -33,6 +35,205 @@ class JsonFileManager(object):
             json_file.write(json_string)
             json_file.write("\n")
 
+    def end_experiment(self, exp_no, complete):
+        """ The frames are in the file as soon as they are written """
+        pass
+
+    def close(self):
+        """ Nothing is held open """
+        pass
+
+
+#####################################################################
+
+
+class JsonLinesFileManager(object):
+    """ Json lines file manager. Each frame is serialized once into a compact json object on
+        its own line, so the file is read back line by line with any json parser. The file stays
+        open and the frames of an experiment are written together at the end of the experiment,
+        those of a rejected attempt are dropped.
+    """
+
+    def __init__(self, filename):
+        """ Initialize the JsonLinesFileManager object with the filename
+            Args:
+                filename(string)       : Name of the json lines file
+        """
+        self.filename = filename
+        self.json_file = open(filename, "a")
+        self.lines = []  # Frames of the current experiment
+
+    def write_json(self, content_list):
+        """ Serialize the reference car, traffic cars, stop line information at given time
+            Args:
+                content_list(dict)     : Information of the frame
+        """
+        self.lines.append(json.dumps(content_list, sort_keys=True, separators=(",", ":")))
+
+    def end_experiment(self, exp_no, complete):
+        """ Write the frames of the experiment
+            Args:
+                exp_no(int)            : Experiment number
+                complete(bool)         : False if the experiment is rejected, its frames are dropped
+        """
+        lines, self.lines = self.lines, []
+        if complete and lines:
+            self.json_file.write("\n".join(lines))
+            self.json_file.write("\n")
+            self.json_file.flush()
+
+    def close(self):
+        """ Close the file, the frames of an unfinished experiment are dropped """
+        self.lines = []
+        self.json_file.close()
+
+
+#####################################################################
+
+
+# Frame fields of the columns and their types
+FRAME_COLUMNS = [("seq_no", np.int32), ("frame_no", np.int32), ("ref_frame_no", np.int32), ("pix_per_m", np.float32)]
+# Fields of the reference car and of each traffic car
+VEHICLE_COLUMNS = ["loc_x_p", "loc_y_p", "width_p", "length_p", "heading_rad", "speed_pps", "acc_ppss"]
+# Fields of each stop sign
+STOP_SIGN_COLUMNS = ["loc_x_p", "loc_y_p"]
+# Code of the turn, the value of its CarTurn
+TURN_CODES = {turn.name.lower(): turn.value for turn in CarTurn}
+
+
+def frame_columns(frames):
+    """ Convert the frames into typed columns
+        Args:
+            frames(list)           : Frame dicts of DatasetGenerator.write_file_content
+        Returns:
+            dict                   : Column name -> array with a row per frame
+    """
+    columns = {}
+    for name, dtype in FRAME_COLUMNS:
+        columns[name] = np.array([frame[name] for frame in frames], dtype)
+
+    for name in VEHICLE_COLUMNS:
+        columns["ref_state_" + name] = np.array([frame["ref_state"][name] for frame in frames], np.float32)
+        columns["traffic_" + name] = np.array(
+            [[actor[name] for actor in frame["traffic"]] for frame in frames], np.float32
+        )
+    columns["ref_state_turn"] = np.array([TURN_CODES[frame["ref_state"]["turn"]] for frame in frames], np.uint8)
+    columns["traffic_turn"] = np.array(
+        [[TURN_CODES[actor["turn"]] for actor in frame["traffic"]] for frame in frames], np.uint8
+    )
+
+    for name in STOP_SIGN_COLUMNS:
+        columns["stop_signs_" + name] = np.array(
+            [[stop_sign[name] for stop_sign in frame["stop_signs"]] for frame in frames], np.float32
+        )
+
+    return columns
+
+
+#####################################################################
+
+
+def append_columns(filename, columns_list):
+    """ Append the rows of the columns to the .npz file, which is created if it doesn't exist
+        Args:
+            filename(string)       : Name of the .npz file
+            columns_list(list)     : Dicts of column name -> array, in row order
+    """
+    if os.path.exists(filename):
+        with np.load(filename) as npz_file:
+            columns_list = [{name: npz_file[name] for name in npz_file.files}] + list(columns_list)
+    if not columns_list:
+        return
+
+    columns = {name: np.concatenate([columns[name] for columns in columns_list]) for name in columns_list[0]}
+    # A file object keeps np.savez from renaming the file
+    with open(filename, "wb") as npz_file:
+        np.savez(npz_file, **columns)
+
+
+#####################################################################
+
+
+class NpzColumnsFileManager(object):
+    """ Columnar metadata file manager. The frames of an experiment are converted into typed
+        columns at the end of the experiment and the columns of the run are appended to a .npz
+        file when it is closed, so a run is loaded with one np.load. Each column has a row per
+        frame: int32 seq_no, frame_no and ref_frame_no, float32 pix_per_m, float32
+        ref_state_<field> and [frames, actors] traffic_<field> for the fields of VEHICLE_COLUMNS,
+        [frames, stop signs] stop_signs_loc_x_p and stop_signs_loc_y_p, and uint8 ref_state_turn
+        and traffic_turn holding the CarTurn values. sim_name is seq_no zero filled and isn't kept.
+    """
+
+    def __init__(self, filename):
+        """ Initialize the NpzColumnsFileManager object with the filename
+            Args:
+                filename(string)       : Name of the .npz file
+        """
+        self.filename = filename
+        self.frames = []  # Frames of the current experiment
+        self.experiments = []  # Columns of each complete experiment
+
+    def write_json(self, content_list):
+        """ Keep the reference car, traffic cars, stop line information at given time
+            Args:
+                content_list(dict)     : Information of the frame
+        """
+        self.frames.append(content_list)
+
+    def end_experiment(self, exp_no, complete):
+        """ Convert the frames of the experiment into columns
+            Args:
+                exp_no(int)            : Experiment number
+                complete(bool)         : False if the experiment is rejected, its frames are dropped
+        """
+        frames, self.frames = self.frames, []
+        if complete and frames:
+            self.experiments.append(frame_columns(frames))
+
+    def close(self):
+        """ Append the columns of the complete experiments to the file """
+        self.frames = []
+        append_columns(self.filename, self.experiments)
+        self.experiments = []
+
+
+#####################################################################
+
+
+def metadata_filename(json_filename):
+    """ Name of the metadata file of sg.OUTPUT_JSON_FORMAT
+        Args:
+            json_filename(string)      : Name of the json file
+        Returns:
+            string                     : json_filename, with .npz appended for the columns
+    """
+    if sg.OUTPUT_JSON_FORMAT == sg.JSON_FORMAT_COLUMNS:
+        return json_filename + ".npz"
+    return json_filename
+
+
+#####################################################################
+
+
+def create_metadata_writer(filename=None):
+    """ Create the metadata writer of sg.OUTPUT_JSON_FORMAT
+        Args:
+            filename(string)           : Name of the json file, sg.OUPUT_JSON_FILENAME if None
+        Returns:
+            object                     : JsonFileManager, JsonLinesFileManager or NpzColumnsFileManager
+        Raises:
+            ValueError                 : If sg.OUTPUT_JSON_FORMAT is unknown
+    """
+    if filename is None:
+        filename = sg.OUPUT_JSON_FILENAME
+    if sg.OUTPUT_JSON_FORMAT == sg.JSON_FORMAT_PRETTY:
+        return JsonFileManager(filename)
+    if sg.OUTPUT_JSON_FORMAT == sg.JSON_FORMAT_LINES:
+        return JsonLinesFileManager(filename)
+    if sg.OUTPUT_JSON_FORMAT == sg.JSON_FORMAT_COLUMNS:
+        return NpzColumnsFileManager(metadata_filename(filename))
+    raise ValueError("Unknown json format " + str(sg.OUTPUT_JSON_FORMAT))
+
 
 #####################################################################
 
@@ -2,7 +2,6 @@
 # Uber, Inc. (c) 2019
 ####################################################
 # from av.ml.petastorm_utilities.tetrys.write_tetrys import write_tetrys
-import cv2
 import numpy as np
 import stop_and_go_globals as sg
 import yaml
@@ -11,6 +10,18 @@ from pyspark.sql import SparkSession
 from stop_and_go_data import JsonFileManager
 from stop_and_go_data_type import OptionChoice
 from stop_and_go_dataset_schema import create_image_schema, create_lane_schema, create_schema
+from stop_and_go_image_writer import Image_Files
+from stop_and_go_tetrys_stream import (
+    TETRYS_DATASET_TABLE,
+    TETRYS_IMAGE_TABLE,
+    TETRYS_LANE_TABLE,
+    LocalTetrysSink,
+    TetrysStreamer,
+    image_rows,
+    lane_rows,
+    partition_rows,
+    write_tables_concurrently,
+)
 
 from atg.ml.tetrystables.impl.write_tetrys import write_tetrys
 
@@ -31,11 +42,17 @@ class DatasetGenerator(object):
             save_sim_flow_data(dict)    : Contains the car's trajectory information indexed by time
             daatset_choice(int)         : The input choice to user to select to store the
                                           datasets
+            image_writer(object)        : Image_Writer the images are queued to, None if they are
+                                          written synchronously
+            metadata_writer(object)     : JsonFileManager, JsonLinesFileManager, NpzColumnsFileManager or
+                                          TetrysStreamer the frames are written to, a JsonFileManager of
+                                          sg.OUPUT_JSON_FILENAME if None
     """
 
-    def __init__(self, save_sim_flow_data, dataset_choice):
+    def __init__(self, save_sim_flow_data, dataset_choice, image_writer=None, metadata_writer=None):
         self.save_sim_flow_data = save_sim_flow_data
-        self.jsonManager = JsonFileManager(sg.OUPUT_JSON_FILENAME)
+        self.image_writer = image_writer
+        self.jsonManager = metadata_writer if metadata_writer is not None else JsonFileManager(sg.OUPUT_JSON_FILENAME)
         self.dataset_storage_choice = dataset_choice
 
     ####################################################
@@ -98,6 +115,10 @@ class DatasetGenerator(object):
 
         if self.dataset_storage_choice == OptionChoice.JSON_OPTION:
             self.jsonManager.write_json(json_obj)
+        elif self.dataset_storage_choice == OptionChoice.TETRYS_OPTION and sg.TETRYS_FLUSH_EXPERIMENTS:
+            # The rows are streamed to the tables per group of experiments by the TetrysStreamer
+            self._store_tetrys_object(json_obj)
+            self.jsonManager.write_json(json_obj)
         elif self.dataset_storage_choice == OptionChoice.TETRYS_OPTION:
             # Store the object as tetrys object
             self._store_tetrys_object(json_obj)
@@ -109,9 +130,7 @@ class DatasetGenerator(object):
                 self._set_spark_session_and_config()
 
                 # dump into tetrys tables
-                self._dump_into_tetrys_table(tetrys_content_list)
-                self._dump_images_into_images_tetrys_table()
-                self._dump_lanes_into_lanes_tetrys_table()
+                self._dump_tetrys_tables(tetrys_content_list)
 
     ####################################################
 
@@ -216,149 +235,117 @@ class DatasetGenerator(object):
 
     #####################################################################
 
-    def _dump_into_tetrys_table(self, tetrys_content_list):
-        """ Dump the tetrys object list for all the iterations into
-            configured tetrys table location.
-
+    def _read_image(self, image_name):
+        """ Read back a generated image from the files or the shards of the image writer
             Args:
-               tetrys_content_list(list) : List of the all the tetrys objects
+                image_name(string) : Image file name
+            Returns:
+                numpy              : Image, None if there is no such image
         """
-        ip_dataset_schema = create_schema()
+        if self.image_writer is None:
+            return Image_Files().read(image_name)
+        return self.image_writer.read(image_name)
 
-        # Create rdd from the tetrys_content_list
-        tetrys_data_rdd = self.sc.parallelize([tetrys_content_list])
-
-        # Write tetrys objects into table
-        tetrys_table_path = self.config["write_dataset_url"]
-        spark_key_column = self.config["key_column"]
-        spark_order_by_column = self.config["order_by_column"]
+    #####################################################################
 
-        # print(" tetrys path ", tetrys_table_path, spark_key_column, spark_order_by_column)
+    def _dump_tetrys_tables(self, tetrys_content_list):
+        """ Dump the tetrys objects, the images and the lane images for all the iterations into
+            configured tetrys table locations, the three tables are written concurrently.
 
-        write_tetrys(
-            self.spark,
-            row_generators=tetrys_data_rdd,
-            output_url=tetrys_table_path,
-            key_column=spark_key_column,
-            order_by_column=spark_order_by_column,
-            column_group_match_regex={"column_group1": ["av*"]},
-            schema=ip_dataset_schema,
-            chunk_size=2 ** 20,
+            Args:
+               tetrys_content_list(list) : List of the all the tetrys objects
+        """
+        write_tables_concurrently(
+            self._write_tetrys_table,
+            [
+                (TETRYS_DATASET_TABLE, tetrys_content_list, self.config["write_dataset_url"]),
+                (
+                    TETRYS_IMAGE_TABLE,
+                    image_rows(sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, self._read_image),
+                    self.config["write_image_dataset_url"],
+                ),
+                (
+                    TETRYS_LANE_TABLE,
+                    lane_rows(sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, self._read_image),
+                    self.config["write_lane_image_dataset_url"],
+                ),
+            ],
         )
 
     #####################################################################
 
-    def _dump_images_into_images_tetrys_table(self):
-        """ Dump the images for all the iterations into
-            configured tetrys table location.
+    def _write_tetrys_table(self, table, rows, output_url):
+        """ Write the rows into a tetrys table. The rows are split into sg.TETRYS_NUM_PARTITIONS
+            seq_no ranges, each its own partition of the rdd, so the executors write them in parallel.
+            Args:
+                table(str)         : TETRYS_DATASET_TABLE, TETRYS_IMAGE_TABLE or TETRYS_LANE_TABLE
+                rows(list)         : Rows of the table
+                output_url(str)    : Location of the table
         """
-        ip_image_schema = create_image_schema()
-
-        # Create images list
-        tetrys_image_list = []
-        for exp in range(sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, 1):
-            for frame in range(sg.DATASET_SPAN_FRAMES):
-                tetrys_images = {}
-
-                exp_no = str(exp)
-                cur_exp_no = exp_no.zfill(5)
-                tetrys_images["seq_no"] = exp
-
-                frame_no = str(frame)
-                cur_frame_no = frame_no.zfill(6)
-
-                tetrys_images["frame_no"] = frame
-                ref_image_name = (
-                    sg.IMAGE_BASE_DIR
-                    + "/"
-                    + "stop_"
-                    + str(cur_exp_no)
-                    + sg.REFERENCE_IMAGE_KEYWORD
-                    + str(cur_frame_no)
-                    + ".jpg"
-                )
-                trf_image_name = (
-                    sg.IMAGE_BASE_DIR
-                    + "/"
-                    + "stop_"
-                    + str(cur_exp_no)
-                    + sg.TRAFFIC_IMAGE_KEYWORD
-                    + str(cur_frame_no)
-                    + ".jpg"
-                )
-
-                tetrys_images["ref_image"] = cv2.imread(ref_image_name)
-                tetrys_images["traffic_image"] = cv2.imread(trf_image_name)
-
-                tetrys_image_list.append(tetrys_images)
-
-        # Create rdd from the tetrys_content_list
-        tetrys_images_data_rdd = self.sc.parallelize([tetrys_image_list])
-
-        # Write tetrys objects into table
-        tetrys_image_table_path = self.config["write_image_dataset_url"]
-        spark_key_column = self.config["key_column"]
-        spark_order_by_column = self.config["order_by_column"]
+        create_table_schema, column_group_match_regex = TETRYS_TABLE_SCHEMAS[table]
+
+        # Create rdd with a row generator per partition
+        partitions = partition_rows(rows, sg.TETRYS_NUM_PARTITIONS)
+        tetrys_data_rdd = self.sc.parallelize(partitions, len(partitions))
 
         write_tetrys(
             self.spark,
-            row_generators=tetrys_images_data_rdd,
-            output_url=tetrys_image_table_path,
-            key_column=spark_key_column,
-            order_by_column=spark_order_by_column,
-            column_group_match_regex={"column_group2": [".*"]},
-            schema=ip_image_schema,
+            row_generators=tetrys_data_rdd,
+            output_url=output_url,
+            key_column=self.config["key_column"],
+            order_by_column=self.config["order_by_column"],
+            column_group_match_regex=column_group_match_regex,
+            schema=create_table_schema(),
             chunk_size=2 ** 20,
         )
 
     #####################################################################
 
-    def _dump_lanes_into_lanes_tetrys_table(self):
-        """ Dump the lane images for all the iterations into
-            configured tetrys table location.
+    def write_tetrys_rows(self, table, rows, exp_start, exp_stop):
+        """ Write a row group of the experiments into the configured table location, under
+            seq_<first>_<last> so each group is its own partition.
+            Args:
+                table(str)         : TETRYS_DATASET_TABLE, TETRYS_IMAGE_TABLE or TETRYS_LANE_TABLE
+                rows(list)         : Rows of the experiments exp_start..exp_stop - 1
+                exp_start(int)     : First experiment number
+                exp_stop(int)      : One above the last experiment number
         """
-        ip_lane_schema = create_lane_schema()
+        output_url = self.config[TETRYS_TABLE_URL_KEYS[table]] + "/seq_{:05d}_{:05d}".format(exp_start, exp_stop - 1)
+        self._write_tetrys_table(table, rows, output_url)
 
-        # Create images list
-        tetrys_lane_list = []
-        frame = 0
 
-        for exp in range(sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, 1):
-            tetrys_lanes = {}
+#####################################################################
 
-            exp_no = str(exp)
-            cur_exp_no = exp_no.zfill(5)
-            tetrys_lanes["seq_no"] = exp
+# Schema and column groups of each table
+TETRYS_TABLE_SCHEMAS = {
+    TETRYS_DATASET_TABLE: (create_schema, {"column_group1": ["av*"]}),
+    TETRYS_IMAGE_TABLE: (create_image_schema, {"column_group2": [".*"]}),
+    TETRYS_LANE_TABLE: (create_lane_schema, {"column_group3": [".*"]}),
+}
+# Dataset config key of the location of each table
+TETRYS_TABLE_URL_KEYS = {
+    TETRYS_DATASET_TABLE: "write_dataset_url",
+    TETRYS_IMAGE_TABLE: "write_image_dataset_url",
+    TETRYS_LANE_TABLE: "write_lane_image_dataset_url",
+}
 
-            frame_no = str(frame)
-            cur_frame_no = frame_no.zfill(6)
+#####################################################################
 
-            tetrys_lanes["frame_no"] = frame
-            lane_image_name = (
-                sg.IMAGE_BASE_DIR + "/" + "stop_" + str(cur_exp_no) + "_LANES_" + str(cur_frame_no) + ".jpg"
-            )
 
-            tetrys_lanes["lane_image"] = cv2.imread(lane_image_name)
-
-            tetrys_lane_list.append(tetrys_lanes)
-
-        # Create rdd from the tetrys_content_list
-        tetrys_lanes_data_rdd = self.sc.parallelize([tetrys_lane_list])
+def create_tetrys_streamer(image_writer):
+    """ Create the streamer writing the tetrys rows per sg.TETRYS_FLUSH_EXPERIMENTS experiments
+        Args:
+            image_writer(object)   : Image_Writer the images are read back from
+        Returns:
+            TetrysStreamer         : Streamer into sg.TETRYS_LOCAL_DIR if set, else into the configured tables
+    """
+    if sg.TETRYS_LOCAL_DIR is not None:
+        sink = LocalTetrysSink(sg.TETRYS_LOCAL_DIR, sg.TETRYS_NUM_PARTITIONS)
+    else:
+        sink = DatasetGenerator(None, OptionChoice.TETRYS_OPTION, image_writer)
+        sink._set_spark_session_and_config()
 
-        # Write tetrys objects into table
-        tetrys_lane_table_path = self.config["write_lane_image_dataset_url"]
-        spark_key_column = self.config["key_column"]
-        spark_order_by_column = self.config["order_by_column"]
+    return TetrysStreamer(sink, image_writer.read, sg.TETRYS_FLUSH_EXPERIMENTS)
 
-        write_tetrys(
-            self.spark,
-            row_generators=tetrys_lanes_data_rdd,
-            output_url=tetrys_lane_table_path,
-            key_column=spark_key_column,
-            order_by_column=spark_order_by_column,
-            column_group_match_regex={"column_group3": [".*"]},
-            schema=ip_lane_schema,
-            chunk_size=2 ** 20,
-        )
 
-    #####################################################################
+#####################################################################
@@ -1,15 +1,16 @@
 ####################################################
 # Uber, Inc. (c) 2019
 ####################################################
-import cv2
-import numpy as np
-import pygame
 import stop_and_go_globals as sg
 from stop_and_go_actors import Car, Path, Stop_Area, Stop_Line
 from stop_and_go_cord_transform import CoordinateTransform
 from stop_and_go_data import JsonFileManager
 from stop_and_go_data_generation import DatasetGenerator
 from stop_and_go_data_type import CarTurn
+from stop_and_go_feasibility import stop_lines_within_bounds
+from stop_and_go_image_writer import Image_Files
+from stop_and_go_rotate_image import RotateImage
+from stop_and_go_sampler import Sim_Param_Sampler, random_integers
 from stop_and_go_sim import Config_manager, Sim
 
 ####################################################
@@ -33,8 +34,25 @@ class Drawer(object):
         frame_state,
         dataset_storage_choice,
         save_sim_flow_data,
+        image_writer=None,
+        metadata_writer=None,
     ):
-
+        """ Initializes the drawer of the experiment with
+            Args:
+                exp_no(int)                    : Current experiment number
+                car_list(list)                 : car_list has 4 car's objects
+                path_list(list)                : path_list has 4 path's objects
+                stop_line_list(list)           : stop_line_list has 4 stop line's objects
+                Sprite_mid(object)             : Sprite_mid contains the intersection information
+                camera(object)                 : Camera information wrt reference car
+                frame_state(object)            : Frame_state contains the frame information
+                dataset_storage_choice(int)    : Store the dataset into json or tetrys table
+                save_sim_flow_data(dictionary) : Map to store the simulation data for each car with key as time
+                image_writer(object)           : Image_Writer the images are queued to. The images are
+                                                 written synchronously if None
+                metadata_writer(object)        : Metadata writer or TetrysStreamer the frames are written to,
+                                                 a JsonFileManager per experiment if None
+        """
         self.exp_no = exp_no
         self.car_list = car_list
         self.path_list = path_list
@@ -43,14 +61,17 @@ class Drawer(object):
         self.camera = camera
         self.frame_state = frame_state
         self.save_sim_flow_data = save_sim_flow_data
-        self.dataset_generator = DatasetGenerator(save_sim_flow_data, dataset_storage_choice)
+        self.image_writer = image_writer
+        self.dataset_generator = DatasetGenerator(
+            save_sim_flow_data, dataset_storage_choice, image_writer, metadata_writer
+        )
 
     ######################################################################
 
     def draw_sdv(self, window, sub_seq_no, frame, no_car=False):
         """ Draw utility to draw sdv and draw camera view subimage of the sdv.
             Args:
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 sub_seq_no(int)       : Current Image number of the given iteration number
                 frame(int)            : Current frame number
                 no_car(bool)          : Flag to indicate if it is car's lane
@@ -66,7 +87,7 @@ class Drawer(object):
     def draw_sdv_on_frame(self, window, frame):
         """ Get the boundary points of the cars from save_sim_flow_data to draw.
             Args:
-                window(pygame window): Current Frame
+                window(canvas)       : Current Frame
                 frame(int)           : Current frame number
         """
         # Draw only sdv
@@ -76,14 +97,14 @@ class Drawer(object):
 
         boundary_points = self.save_sim_flow_data.sim_data_dict_list[sg.REFERENCE_CAR_SEQ - 1][cur_time][1].boundary
 
-        pygame.draw.polygon(window, color, boundary_points, 0)
+        window.polygon(color, boundary_points)
 
     ######################################################################
 
     def draw_traffic(self, window, sub_seq_no, frame, no_car=False):
         """ Draw utility to draw the traffic other than the reference car (SDV).
             Args:
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 sub_seq_no(int)       : Current Image number of the given iteration number
                 frame(int)            : Current frame number
                 no_car(bool)          : Flag to indicate if it is car's lane
@@ -100,7 +121,7 @@ class Drawer(object):
     def draw_traffic_on_frame(self, window, frame):
         """ Get the boundary points for the traffic car to draw it.
             Args:
-                window(pygame window): Current Frame
+                window(canvas)       : Current Frame
                 frame(int)           : Current frame number
         """
         # Draw cars other than sdv
@@ -114,14 +135,14 @@ class Drawer(object):
 
                 boundary_points = self.save_sim_flow_data.sim_data_dict_list[num_car][cur_time][1].boundary
 
-                pygame.draw.polygon(window, color, boundary_points, 0)
+                window.polygon(color, boundary_points)
 
     #################################################################################
 
     def draw_cars_on_frame(self, window, frame):
         """ Get the boundary points for all the cars ( sdv + traffic ) to draw it.
             Args:
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 frame(int)            : Current frame number
         """
         # Draw cars
@@ -133,14 +154,14 @@ class Drawer(object):
 
             boundary_points = self.save_sim_flow_data.sim_data_dict_list[num_car][cur_time][1].boundary
 
-            pygame.draw.polygon(window, color, boundary_points, 0)
+            window.polygon(color, boundary_points)
 
     #####################################################################
 
     def draw_path_on_frame(self, window, is_green=False):
         """ Draw all the paths.
             Args :
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 is_green(bool)        : Flag to indicate the color of the path is green
         """
         for path_seq in range(len(self.path_list)):
@@ -151,7 +172,7 @@ class Drawer(object):
     def draw_stop_lines(self, window):
         """ Draw all the stop lines.
             Args :
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
         """
         for index in range(len(self.stop_line_list)):
             self.stop_line_list[index].draw(window)
@@ -161,7 +182,7 @@ class Drawer(object):
     def draw_window(self, window, sub_seq_no, frame, no_car=False):
         """ Draw camera view subimage for path, cars and the intersection area.
             Args:
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 sub_seq_no(int)       : Current Image number of the given iteration number
                 frame(int)            : Current frame number
                 no_car(bool)          : Flag to indicate if there is car
@@ -184,13 +205,15 @@ class Drawer(object):
     def draw_all_traffic(self, window, sub_seq_no, dataset_storage_choice, tetrys_content_list):
         """ if DISPLAY_TRAFFIC is true draw the window else create images for sdv and traffic.
             Args:
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 sub_seq_no(int)       : Current Image number of the given iteration number
             Returns:
                 bool                  : Flag to reset the experiment number
         """
         reset_frames_exp = True
 
+        self.set_camera_view(window)
+
         for frame in range(self.frame_state.start_frame, self.frame_state.end_frame):
             if sg.DISPLAY_TRAFFIC:
                 self.draw_window(window, sub_seq_no, frame)
@@ -212,7 +235,7 @@ class Drawer(object):
                     return reset_frames_exp
 
             window.fill((0, 0, 0))
-            pygame.display.flip()
+            window.flip()
             sub_seq_no += 1
 
             # At the end Draw the local map
@@ -222,6 +245,27 @@ class Drawer(object):
 
     ######################################################################
 
+    def set_camera_view(self, window):
+        """ Move a window drawing only the camera view to the camera of the experiment. The camera
+            is set once at the reference time, so the view is the same for all the frames.
+            Args:
+                window(canvas)        : Current Frame
+        """
+        if not window.renders_camera_view:
+            return
+
+        frame_division = 10.0
+        camera_pos_x, camera_pos_y, heading_ang_rad = self.camera.get_camera_cur_pos(
+            round(float(self.frame_state.start_frame * sg.TIME_INCREMENT_STEP), 1),
+            (self.frame_state.ref_frame / frame_division),
+            self.save_sim_flow_data,
+        )
+        rotate_img_trns = RotateImage(self.car_list, self.path_list, self.save_sim_flow_data, heading_ang_rad)
+
+        window.set_view(camera_pos_x, camera_pos_y, rotate_img_trns.get_rotation_degree())
+
+    ######################################################################
+
     def check_valid_stop_lines(self, cur_time):
         """ Check the stop lines coordinates.
             Args:
@@ -229,33 +273,19 @@ class Drawer(object):
             Returns:
                 bool           : Returns reset_frames_exp as True to reset this experiment
         """
-        for i in range(sg.NUMBER_OF_PATHS):
-            center_x_p = (
-                self.save_sim_flow_data.sim_data_dict_list[sg.REFERENCE_CAR_SEQ - 1][cur_time][2]
-                .stop_line_states[i]
-                .center_x_p
-            )
-            center_y_p = (
-                self.save_sim_flow_data.sim_data_dict_list[sg.REFERENCE_CAR_SEQ - 1][cur_time][2]
-                .stop_line_states[i]
-                .center_y_p
-            )
-            if (
-                (center_x_p > sg.STOP_LINE_GENERATE_MAX)
-                or (center_y_p > sg.STOP_LINE_GENERATE_MAX)
-                or (center_x_p < sg.STOP_LINE_GENERATE_MIN)
-                or (center_y_p < sg.STOP_LINE_GENERATE_MIN)
-            ):
-                return False
-
-        return True
+        sub_state = self.save_sim_flow_data.sim_data_dict_list[sg.REFERENCE_CAR_SEQ - 1][cur_time][2]
+        stop_line_states = sub_state.stop_line_states
+
+        return stop_lines_within_bounds(
+            [(stop_line_states[i].center_x_p, stop_line_states[i].center_y_p) for i in range(sg.NUMBER_OF_PATHS)]
+        )
 
     #####################################################################
 
     def draw_camera_view_subimages(self, window, sub_seq_no, frame, no_car, image_name):
         """ Draw the camera view subimages for the SDV ( Reference car ) and tarffic.
             Args:
-                window(pygame window) : Current Frame
+                window(canvas)        : Current Frame
                 sub_seq_no(int)       : Current Image number of the given iteration number
                 frame(int)            : Current frame number
                 no_car(bool)          : Flag to indicate to start drawing the lanes on frame
@@ -284,23 +314,38 @@ class Drawer(object):
         sub_image_name = sg.IMAGE_BASE_DIR + "/" + "stop_" + exp2 + "_sub_" + str2 + ".jpg"
 
         # Binary image name
-        sub_mask_img_name = sg.IMAGE_BASE_DIR + "/" + "stop_" + exp2 + image_name + str2 + ".jpg"
+        sub_mask_img_name = sg.IMAGE_BASE_DIR + "/" + "stop_" + exp2 + image_name + str2 + sg.MASK_IMAGE_EXTENSION
 
         if not ref_car_end:
             if (sub_seq_no >= self.frame_state.start_frame) and (sub_seq_no <= self.frame_state.end_frame):
                 if not no_car:
                     if sg.DISPLAY_TRAFFIC:
-                        cv2.imwrite(sub_image_name, sub_window_image)
-                        cv2.imwrite(sub_mask_img_name, sub_mask_img)
+                        self.write_image(sub_image_name, sub_window_image)
+                        self.write_image(sub_mask_img_name, sub_mask_img)
                     else:
                         # Create camera view masked image
-                        cv2.imwrite(sub_mask_img_name, sub_mask_img)
+                        self.write_image(sub_mask_img_name, sub_mask_img)
 
         if no_car:
             # Creating the local map image
-            local_map_img_name = sg.IMAGE_BASE_DIR + "/" + "stop_" + exp2 + "_LANES_000000" + ".jpg"
-            sub_window_image[:, :, 0] = 0
-            cv2.imwrite(local_map_img_name, sub_window_image)
+            local_map_img_name = sg.IMAGE_BASE_DIR + "/" + "stop_" + exp2 + sg.LANES_IMAGE_KEYWORD + "000000" + ".jpg"
+            # The unrotated sub image may be a view of the canvas
+            local_map_img = sub_window_image.copy()
+            local_map_img[:, :, 0] = 0
+            self.write_image(local_map_img_name, local_map_img)
+
+    #####################################################################
+
+    def write_image(self, image_name, image):
+        """ Write the image through the image writer if there is one.
+            Args:
+                image_name(string) : Image file name
+                image(numpy)       : Image to write
+        """
+        if self.image_writer is None:
+            Image_Files().write(image_name, image)
+        else:
+            self.image_writer.write(image_name, image)
 
 
 #####################################################################
@@ -411,7 +456,7 @@ class Generator(object):
                 seq(int)              : Sequence number of the car instance
                 path_list(list)       : List of paths contain path objects
                 sim(object)           : Sim class object contains the simulation info for car instance
-                window(pygame window) : Current frame
+                window(canvas)        : Current frame
             Returns:
                 object                : Returns the generated car instance
         """
@@ -460,10 +505,14 @@ class Generator(object):
 
     ####################################################################
 
-    def generate_objects(self, window):
+    def generate_objects(self, window, sims=None, rng=None):
         """ Generate the all the frame's objects to draw it on the frame.
             Args:
-                window(pygame window) : Current frame
+                window(canvas)        : Current frame
+                sims(list)            : Pre-generated Sim objects of the experiment ( from Sim_Batch ).
+                                        The Sim objects are generated here if it is None
+                rng(object)           : np.random.Generator of the experiment. The global np.random
+                                        state is used if None
             Returns:
                  list                 : car_list contains the car objects
                  list                 : path_list contains the path objects
@@ -473,21 +522,23 @@ class Generator(object):
         min_num_car = 3  # This is equivalent of generating 3
         max_num_car = 5  # This is equivalent of generating 5
 
-        config_manager = Config_manager()
         # Generate the num_cars by random
-        num_cars = np.random.randint(min_num_car, max_num_car, 1)[0]
+        num_cars = random_integers(min_num_car, max_num_car, 1, rng)[0]
 
         num_cars = 4
 
         if sg.TESTING:
             num_cars = sg.NUM_CARS_FOR_TESTING
 
-        # Get the time stopped value at stop sign
-        time_stopped = np.random.normal(sg.MEAN_STOPPED_TIME, sg.STD_STOPPED_TIME, 1)[0]
-        while time_stopped <= 0:
-            time_stopped = np.random.normal(sg.MEAN_STOPPED_TIME, sg.STD_STOPPED_TIME, 1)[0]
+        if sims is None:
+            config_manager = Config_manager()
+            # Get the time stopped value at stop sign
+            time_stopped = Sim_Param_Sampler(config_manager, rng).sample_time_stopped(1)[0]
+
+            sims = [Sim(config_manager, seq, time_stopped, rng=rng) for seq in range(1, num_cars + 1)]
+        else:
+            num_cars = len(sims)
 
-        print(" time stopped = ", time_stopped)
         # Create the car_list
         x1 = sg.WINDOW_WIDTH_PIXELS / 2
         y1 = sg.WINDOW_LENGTH_PIXELS / 2
@@ -500,7 +551,7 @@ class Generator(object):
         Stop_line_list = self.generate_stop_lines(Path_list)
 
         for seq in range(1, num_cars + 1):
-            sim = Sim(config_manager, seq, time_stopped)
+            sim = sims[seq - 1]
 
             # Car1 moving along x-direction
             car = self.generate_car_instances(seq, Path_list, sim, window)
@@ -0,0 +1,276 @@
+#####################################################################
+# Uber, Inc. (c) 2020
+# Description : Feasibility checks of an experiment. Experiments that
+#               can't produce a valid dataset are rejected before the
+#               simulation is stepped and before any image is written
+#####################################################################
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_data_type import CarState, CarTurn
+from stop_and_go_rotate_image import RotateImage
+from stop_and_go_world import World_State
+
+#####################################################################
+
+END_MARGIN_S = 2  # Simulated time the cars keep after the last frame, a car may reach the end in it
+FRAME_DIVISION = 1.0 / sg.TIME_INCREMENT_STEP  # Frames per second of simulated time
+
+#####################################################################
+
+
+def validate_last_time_key(last_frame_time, car_list):
+    """ Check if all the cars have enough simulated time as last frame's time.
+        If all the cars have enough time to reach the end of simulation return true
+        else return false.
+        Args:
+            last_frame_time(float): Last timestamp of the frame
+            car_list(list)        : Car_list has 4 car's objects
+        Returns:
+            bool                  : Returns true if all the cars have valid number of frames
+    """
+    return bool(valid_last_time_keys(np.array([last_frame_time]), car_list)[0])
+
+
+#####################################################################
+
+
+def get_stop_line_centers(stop_line_list):
+    """ Centers of the stop lines in the main frame ( see Save_Sim_Flow_Data.populate_road_states )
+        Args:
+            stop_line_list(list)  : Contains the 4 stop line objects
+        Returns:
+            numpy                 : (x, y) center of each stop line
+    """
+    return np.array(
+        [
+            ((stop_line.start[0] + stop_line.stop[0]) / 2, (stop_line.start[1] + stop_line.stop[1]) / 2)
+            for stop_line in stop_line_list
+        ]
+    )
+
+
+#####################################################################
+
+
+def predict_valid_stop_lines(ref_car, stop_line_list, sprite_mid, frame_state, margin_px=1.0):
+    """ Predict Drawer.check_valid_stop_lines before the simulation is stepped
+        Args:
+            ref_car(object)          : Reference car at the start of the simulation
+            stop_line_list(list)     : Contains the 4 stop line objects
+            sprite_mid(object)       : Middle intersection object
+            frame_state(object)      : Frame_state contains the frame information
+            margin_px(float)         : Tolerance of the prediction
+        Returns:
+            bool                     : False if the stop lines are out of the camera for sure
+    """
+    if sg.DISPLAY_TRAFFIC:
+        return True
+
+    ref_time = round(float(frame_state.ref_frame * sg.TIME_INCREMENT_STEP), 1)
+
+    return bool(stop_lines_in_view(ref_car, stop_line_list, sprite_mid, np.array([ref_time]), margin_px)[0])
+
+
+#####################################################################
+
+
+def stop_lines_in_view(ref_car, stop_line_list, sprite_mid, ref_times, margin_px=1.0):
+    """ The camera is centered on the reference car at the reference time. The reference car
+        follows its motion profile until it reaches the middle intersection and only waits there,
+        so its distance along the path at the reference time is bounded by the profile. The stop
+        lines are out of view only if no distance within the bounds puts them within the camera.
+        Args:
+            ref_car(object)          : Reference car at the start of the simulation
+            stop_line_list(list)     : Contains the 4 stop line objects
+            sprite_mid(object)       : Middle intersection object
+            ref_times(numpy)         : Reference times in seconds
+            margin_px(float)         : Tolerance of the prediction
+        Returns:
+            numpy                    : False for the reference times with the stop lines out of view for sure
+    """
+    max_dist = np.asarray(ref_car.sim.motion_profile.position(ref_times), dtype=np.float64)
+
+    # Distance at which the reference car starts overlapping the middle intersection
+    direction = np.array(ref_car.get_approach().direction, dtype=np.float64)
+    dist = np.arange(np.ceil(max_dist.max()) + 1)
+    overlap = World_State.overlap_mask_at(
+        ref_car.pose.x + direction[0] * dist,
+        ref_car.pose.y + direction[1] * dist,
+        ref_car.physical_properties.width,
+        ref_car.physical_properties.length,
+        sprite_mid,
+    )
+    entry_dist = dist[overlap.argmax()] if overlap.any() else np.inf
+    min_dist = np.minimum(max_dist, entry_dist)
+
+    # Camera centered at c puts the stop line s at s + sub image size / 2 - c
+    sub_image_center = np.array([sg.SUB_IMAGE_WIDTH / 2, sg.SUB_IMAGE_LENGTH / 2])
+    stop_line_centers = get_stop_line_centers(stop_line_list)
+    low = stop_line_centers.max(axis=0) + sub_image_center - sg.STOP_LINE_GENERATE_MAX - margin_px
+    high = stop_line_centers.min(axis=0) + sub_image_center - sg.STOP_LINE_GENERATE_MIN + margin_px
+
+    center = np.array(ref_car.get_car_center())
+    first = center + direction * min_dist[:, np.newaxis]
+    last = center + direction * max_dist[:, np.newaxis]
+    in_view = np.all((np.maximum(first, last) >= low) & (np.minimum(first, last) <= high), axis=1)
+
+    # A turning car's heading at the reference time isn't known before the simulation
+    if ref_car.sim.turn != CarTurn.NO.value:
+        in_view |= max_dist >= entry_dist - margin_px
+
+    return in_view
+
+
+#####################################################################
+
+
+def check_recorded_stop_lines(save_sim_flow_data, car_list, stop_line_list, frame_state):
+    """ Check the stop lines against the camera bounds from the recorded state of the reference
+        car at the reference time, before any frame is drawn. It gives the result of
+        Drawer.check_valid_stop_lines without transforming the recorded data.
+        Args:
+            save_sim_flow_data(object) : Save_Sim_Flow_Data with the recorded frames
+            car_list(list)             : Contains the car objects
+            stop_line_list(list)       : Contains the 4 stop line objects
+            frame_state(object)        : Frame_state contains the frame information
+        Returns:
+            bool                       : True if the stop lines are within the camera bounds
+    """
+    if sg.DISPLAY_TRAFFIC:
+        return True
+
+    ref_time = round(float(frame_state.ref_frame * sg.TIME_INCREMENT_STEP), 1)
+    ref_state = save_sim_flow_data.sim_data_dict_list[sg.REFERENCE_CAR_SEQ - 1][ref_time][1]
+    ref_turn = car_list[sg.REFERENCE_CAR_SEQ - 1].sim.turn
+
+    # Same translation as CoordinateTransform.get_translation_metrics
+    translation_from_main_to_sub = (
+        sg.SUB_IMAGE_WIDTH / 2 - ref_state.center_main_x_p,
+        sg.SUB_IMAGE_LENGTH / 2 - ref_state.center_main_y_p,
+    )
+    rotate_img_trns = RotateImage(car_list, None, save_sim_flow_data, ref_state.heading_rad)
+    theta_rad = -ref_state.heading_rad if ref_turn == CarTurn.RIGHT.value else ref_state.heading_rad
+
+    sub_centers = []
+    for center_x_p, center_y_p in get_stop_line_centers(stop_line_list).tolist():
+        center_x_p += translation_from_main_to_sub[0]
+        center_y_p += translation_from_main_to_sub[1]
+        if ref_turn != CarTurn.NO.value:
+            center_x_p, center_y_p = rotate_img_trns.get_point_new_location(center_x_p, center_y_p, theta_rad)
+        sub_centers.append((center_x_p, center_y_p))
+
+    return stop_lines_within_bounds(sub_centers)
+
+
+#####################################################################
+
+
+def stop_lines_within_bounds(stop_line_centers):
+    """ Check the stop lines against the camera bounds STOP_LINE_GENERATE_MIN..STOP_LINE_GENERATE_MAX
+        Args:
+            stop_line_centers(list)    : Center (x, y) of each stop line in the sub image
+        Returns:
+            bool                       : True if the stop lines are within the camera bounds
+    """
+    for center_x_p, center_y_p in stop_line_centers:
+        if (
+            (center_x_p > sg.STOP_LINE_GENERATE_MAX)
+            or (center_y_p > sg.STOP_LINE_GENERATE_MAX)
+            or (center_x_p < sg.STOP_LINE_GENERATE_MIN)
+            or (center_y_p < sg.STOP_LINE_GENERATE_MIN)
+        ):
+            return False
+
+    return True
+
+
+#####################################################################
+
+
+def valid_last_time_keys(last_frame_times, car_list):
+    """ Check for each of the last frame times if all the cars have enough simulated time.
+        The reference car must also be cruising or past its simulation at the end.
+        Args:
+            last_frame_times(numpy) : Last timestamps of the frame
+            car_list(list)          : Car_list has 4 car's objects
+        Returns:
+            numpy                   : True for the last frame times all the cars have valid frames for
+    """
+    valid = np.ones(len(last_frame_times), dtype=bool)
+
+    # Check the reference car has some phase into cruise after
+    for car in car_list:
+        # Car may reach end or go outside the boundary in the last seconds
+        last_sim_tick = car.sim.num_ticks - 1 - car.sim.time_to_tick(END_MARGIN_S)
+        if last_sim_tick < 0:
+            return np.zeros(len(last_frame_times), dtype=bool)
+
+        if (car.sim_state.seq == sg.CAR_SEQ_1) and (
+            (car.sim.tick_state[last_sim_tick] != CarState.CRUISE_A.value)
+            and (car.sim.tick_state[last_sim_tick] != CarState.PAST_SIM.value)
+        ):
+
+            if sg.DEBUG == sg.DEBUG_LEVEL_1:
+                print(
+                    " Car # ",
+                    car.sim_state.seq,
+                    " has motion state ",
+                    car.sim.tick_state[last_sim_tick],
+                )
+
+            return np.zeros(len(last_frame_times), dtype=bool)
+
+        # Same rounding as Sim.time_to_tick
+        valid &= last_sim_tick >= np.round(last_frame_times / car.sim.sim_time_increment_s)
+
+    return valid
+
+
+#####################################################################
+
+
+def feasible_start_frames(car_list, stop_line_list, sprite_mid, frame_state):
+    """ Feasibility of each of the candidate start frames of the frame state, given the
+        experiment. It is the is_experiment_feasible check for all the start frames at once.
+        Args:
+            car_list(list)        : Contains the car objects at the start of the simulation
+            stop_line_list(list)  : Contains the 4 stop line objects
+            sprite_mid(object)    : Middle intersection object
+            frame_state(object)   : Frame_state contains the frame information
+        Returns:
+            numpy                 : Feasible flag of each of the frame_state.candidate_start_frames()
+    """
+    start_frames = frame_state.candidate_start_frames()
+
+    feasible = valid_last_time_keys((start_frames + frame_state.initial_frame_span) / FRAME_DIVISION, car_list)
+    if sg.DISPLAY_TRAFFIC or not feasible.any():
+        return feasible
+
+    ref_times = np.round((start_frames + frame_state.initial_ref_frame) * sg.TIME_INCREMENT_STEP, 1)
+    feasible[feasible] = stop_lines_in_view(
+        car_list[sg.REFERENCE_CAR_SEQ - 1], stop_line_list, sprite_mid, ref_times[feasible]
+    )
+
+    return feasible
+
+
+#####################################################################
+
+
+def is_experiment_feasible(car_list, stop_line_list, sprite_mid, frame_state):
+    """ Check before the simulation is stepped that the experiment can produce a valid dataset
+        Args:
+            car_list(list)        : Contains the car objects at the start of the simulation
+            stop_line_list(list)  : Contains the 4 stop line objects
+            sprite_mid(object)    : Middle intersection object
+            frame_state(object)   : Frame_state contains the frame information
+        Returns:
+            bool                  : False if the experiment is rejected
+    """
+    if not validate_last_time_key(frame_state.end_frame / FRAME_DIVISION, car_list):
+        return False
+
+    return predict_valid_stop_lines(car_list[sg.REFERENCE_CAR_SEQ - 1], stop_line_list, sprite_mid, frame_state)
+
+
+#####################################################################
@@ -16,6 +16,10 @@ TESTING = False
 IMAGE_BASE_DIR = "Images"
 REFERENCE_IMAGE_KEYWORD = "_ref_"
 TRAFFIC_IMAGE_KEYWORD = "_traffic_"
+LANES_IMAGE_KEYWORD = "_LANES_"
+MASK_IMAGE_EXTENSION_JPEG = ".jpg"
+MASK_IMAGE_EXTENSION_RLE = ".rle"  # Lossless run length encoding of the binary masks, see encode_mask_rle
+MASK_IMAGE_EXTENSION = MASK_IMAGE_EXTENSION_JPEG  # Format of the reference car and traffic masks
 
 # Main window frame dimensions
 WINDOW_WIDTH_PIXELS = 512
@@ -27,6 +31,18 @@ CAR_LENGTH_PIXELS = 8
 
 TOTAL_DATA_POINTS = 10  # Number of data points to be generated
 START_EXPERIMENT_NUMBER = 0  # To start the experiment number
+# Seed of the run. Each experiment number draws from its own stream of SeedSequence(BASE_SEED).spawn(),
+# so any experiment is regenerated the same on its own. The global np.random state is used if None
+BASE_SEED = None
+SIM_BATCH_SIZE = 16  # Number of experiments whose simulation data is generated in one batch
+NUM_WORKERS = 1  # Number of worker processes the experiments are split across, 1 runs them in this process
+IMAGE_WRITER_THREADS = 2  # Number of threads encoding and writing the images, 0 writes them synchronously
+IMAGE_WRITER_QUEUE_SIZE = 64  # Maximum number of images waiting to be written
+IMAGE_OUTPUT_FILES = "files"  # Write each image into its own file
+IMAGE_OUTPUT_TAR_SHARDS = "tar"  # Pack the images into tar shards named by the range of experiment numbers they hold
+IMAGE_OUTPUT_MEMMAP = "memmap"  # Copy the images unencoded into memory mapped .npy arrays of all the frames
+IMAGE_OUTPUT = IMAGE_OUTPUT_FILES
+IMAGE_SHARD_MAX_BYTES = 256 * 2 ** 20  # A tar shard is closed once it holds this many bytes
 
 # Car's sequence number
 CAR_SEQ_1 = 1
@@ -84,9 +100,11 @@ DATASET_TOTAL_FRAMES = 960  # Maximum total number of frames
 DATASET_MOVING_WINDOW = 0  # Moving the window after each simulation
 DATASET_START_FRAMES = 700  # Start of the frame number
 DATASET_START_FRAME_DEV = 250  # Start of the frame number deviation
+DATASET_ADAPTIVE_START_FRAMES = False  # Sample the start frame among the ones feasible for the experiment
 
 CAR_BOUNDARY_OFFSET = 2  # Offset for car outside the boundary
 TURN_ERROR_OFFSET = 0.1  # Offset for the turn error
+TURN_ARC_TABLE_SIZE = 257  # Number of precomputed poses over the quarter circle of a turn
 TIME_INCREMENT_STEP = 0.1  # Incremenet time after 0.1 sec
 
 ENABLE_VEHICLE_COLLISION_CHECK = True  # Check the collision between cars
@@ -111,7 +129,22 @@ DATSET_CONFIG_FILE = "stop_and_go_dataset_config.yml"
 DISPLAY_TRAFFIC = False  # To display the traffic
 
 OUPUT_JSON_FILENAME = "Metadata.json.dat"  # Write the output to the json file
+JSON_FORMAT_PRETTY = "pretty"  # Indented json objects appended one after the other, the file is reopened per frame
+JSON_FORMAT_LINES = "jsonl"  # One compact json object per line, written per experiment through an open file
+JSON_FORMAT_COLUMNS = "npz"  # Typed columns of all the frames in <OUPUT_JSON_FILENAME>.npz, see NpzColumnsFileManager
+OUTPUT_JSON_FORMAT = JSON_FORMAT_PRETTY  # Format of the metadata
+# Number of experiments whose tetrys rows are streamed to the tables together, 0 writes all the rows at the end of the run
+# The rendered masks of a streamed group are kept in memory until the group is written
+TETRYS_FLUSH_EXPERIMENTS = 0
+TETRYS_LOCAL_DIR = None  # Directory the streamed tetrys rows are written to as .npz row groups instead of the tables
+TETRYS_NUM_PARTITIONS = 1  # Number of seq_no ranges the rows of a tetrys table are split into and written in parallel
 # Camera view subimages
 GENERATE_SUBIMAGE = True  # To generate the subimage
 
+# Rendering backend of the frames
+RENDER_BACKEND_PYGAME = "pygame"  # Draw onto the pygame display surface
+RENDER_BACKEND_NUMPY = "numpy"  # Draw into a uint8 array with OpenCV, pygame and SDL aren't needed
+RENDER_BACKEND_VIEWPORT = "viewport"  # Draw only the camera view, straight at camera resolution, with OpenCV
+RENDER_BACKEND = RENDER_BACKEND_PYGAME
+
 #####################################################################
@@ -0,0 +1,573 @@
+#####################################################################
+# Uber, Inc. (c) 2020
+# Description : Image writer. The images are encoded and written by a
+#               pool of threads fed through a bounded queue, so the
+#               encoding overlaps with the simulation and the drawing.
+#               The images go into files, tar shards or memory mapped
+#               frame arrays
+#####################################################################
+import io
+import os
+import queue
+import re
+import tarfile
+import threading
+import time
+
+import cv2
+import numpy as np
+import stop_and_go_globals as sg
+
+#####################################################################
+
+
+def encode_mask_rle(mask):
+    """ Run length encode a binary mask. As in the uncompressed RLE of COCO the pixels are
+        scanned column by column and the runs alternate starting with a run of zeros. The format
+        stores a binary mask only, the grey levels left by the rotation of a sub image are lost.
+        Args:
+            mask(numpy)   : 2D uint8 mask, the non zero pixels are set
+        Returns:
+            bytes         : Height, width and the run lengths as little endian uint32
+        Raises:
+            ValueError    : If the mask isn't 2D
+    """
+    if mask.ndim != 2:
+        raise ValueError("Only 2D masks are run length encoded")
+    # A run ends where a pixel changes between zero and set, not at every change of grey level
+    pixels = cv2.transpose(mask).ravel() > 0
+    changes = np.flatnonzero(pixels[1:] != pixels[:-1]) + 1
+    counts = np.diff(np.concatenate(([0], changes, [pixels.size])))
+    if pixels[0]:
+        counts = np.concatenate(([0], counts))
+
+    return np.concatenate((mask.shape, counts)).astype("<u4").tobytes()
+
+
+#####################################################################
+
+
+def decode_mask_rle(data):
+    """ Decode a run length encoded mask
+        Args:
+            data(bytes)   : Mask encoded by encode_mask_rle
+        Returns:
+            numpy         : 2D uint8 mask, the set pixels are sg.WHITE_PIXEL
+    """
+    header = np.frombuffer(data, "<u4")
+    height, width = header[:2]
+    bounds = np.cumsum(header[2:])
+    pixels = np.zeros(height * width, np.uint8)
+    for start, stop in zip(bounds[0::2], bounds[1::2]):
+        pixels[start:stop] = sg.WHITE_PIXEL
+
+    return cv2.transpose(pixels.reshape(width, height))
+
+
+#####################################################################
+
+
+def encode_image(filename, image):
+    """ Encode the image in the format of the file extension
+        Args:
+            filename(str)  : Name of the image file
+            image(numpy)   : Image to encode
+        Returns:
+            bytes          : Encoded image
+        Raises:
+            IOError        : If the image isn't encoded
+    """
+    extension = os.path.splitext(filename)[1]
+    if extension == sg.MASK_IMAGE_EXTENSION_RLE:
+        return encode_mask_rle(image)
+    encoded, data = cv2.imencode(extension, image)
+    if not encoded:
+        raise IOError("Failed to encode the image " + filename)
+
+    return data.tobytes()
+
+
+#####################################################################
+
+
+def decode_image(filename, data):
+    """ Decode the image as cv2.imread would, in BGR
+        Args:
+            filename(str)  : Name of the image file
+            data(bytes)    : Encoded image
+        Returns:
+            numpy          : Decoded image
+    """
+    if os.path.splitext(filename)[1] == sg.MASK_IMAGE_EXTENSION_RLE:
+        return cv2.cvtColor(decode_mask_rle(data), cv2.COLOR_GRAY2BGR)
+
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+#####################################################################
+
+
+class Image_Files(object):
+    """ Output writing each image into its own file """
+
+    def write(self, filename, image):
+        """ Encode the image into the file
+            Args:
+                filename(str)  : Name of the image file, its extension selects the encoding
+                image(numpy)   : Image to write
+            Raises:
+                IOError        : If the image isn't written
+        """
+        with open(filename, "wb") as image_file:
+            image_file.write(encode_image(filename, image))
+
+    def end_experiment(self, exp_no, complete):
+        """ The files are complete as soon as they are written """
+        pass
+
+    def read(self, filename):
+        """ Read the image back, None if there is no such image """
+        if not os.path.exists(filename):
+            return None
+        with open(filename, "rb") as image_file:
+            return decode_image(filename, image_file.read())
+
+    def close(self):
+        """ Nothing is held open """
+        pass
+
+
+#####################################################################
+
+
+class Image_Shards(object):
+    """ Output packing the encoded images into tar shards of bounded size. The member name of
+        an image is its file name, so the images are looked up by the names they have on disk
+        with Image_Files. The images of an experiment are held until the experiment is complete
+        and then appended in name order: an experiment is never split across shards, the images
+        of a rejected attempt are dropped, an image written again replaces the earlier one, and
+        the shards don't depend on the order the encoder threads finish in. The open shard is
+        stop_<first exp_no>.tar.part, it is renamed stop_<first exp_no>_<last exp_no>.tar once it
+        holds max_bytes or the output is closed.
+    """
+
+    def __init__(self, shard_dir=sg.IMAGE_BASE_DIR, max_bytes=sg.IMAGE_SHARD_MAX_BYTES):
+        """ Initializes the output with
+            Args:
+                shard_dir(str)   : Directory of the shards
+                max_bytes(int)   : Size a shard is closed at, it holds whole experiments so it may exceed it
+        """
+        self.shard_dir = shard_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.pending = {}  # Encoded images of the current experiment by member name
+        self.index = {}  # Member name -> ( shard number, offset of the data, size )
+        self.shard_paths = []  # Path of each shard
+        self.tar = None
+        self.first_exp_no = None
+        self.last_exp_no = None
+
+    #####################################################################
+
+    def write(self, filename, image):
+        """ Encode the image and hold it until its experiment is complete
+            Args:
+                filename(str)  : Name of the image file, its extension selects the encoding
+                image(numpy)   : Image to write
+            Raises:
+                IOError        : If the image isn't encoded
+        """
+        data = encode_image(filename, image)
+        with self.lock:
+            self.pending[os.path.basename(filename)] = data
+
+    #####################################################################
+
+    def end_experiment(self, exp_no, complete):
+        """ Append the images of the experiment to the open shard
+            Args:
+                exp_no(int)      : Experiment number
+                complete(bool)   : False if the experiment is rejected, its images are dropped
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not complete or not pending:
+            return
+
+        if self.tar is None:
+            self.shard_paths.append(os.path.join(self.shard_dir, "stop_{:05d}.tar.part".format(exp_no)))
+            self.tar = tarfile.open(self.shard_paths[-1], "w", format=tarfile.USTAR_FORMAT)
+            self.first_exp_no = exp_no
+
+        shard_no = len(self.shard_paths) - 1
+        for name in sorted(pending):
+            member = tarfile.TarInfo(name)
+            member.size = len(pending[name])
+            self.tar.addfile(member, io.BytesIO(pending[name]))
+            # The data is padded to a whole number of blocks at the end of the archive
+            padded_size = (member.size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE * tarfile.BLOCKSIZE
+            offset_data = self.tar.offset - padded_size
+            with self.lock:
+                self.index[name] = (shard_no, offset_data, member.size)
+        self.last_exp_no = exp_no
+        # The open shard is read back before it is closed
+        self.tar.fileobj.flush()
+
+        if self.tar.offset >= self.max_bytes:
+            self.close_shard()
+
+    #####################################################################
+
+    def close_shard(self):
+        """ Close the open shard and name it after its range of experiment numbers """
+        self.tar.close()
+        self.tar = None
+        shard_path = os.path.join(self.shard_dir, "stop_{:05d}_{:05d}.tar".format(self.first_exp_no, self.last_exp_no))
+        os.replace(self.shard_paths[-1], shard_path)
+        with self.lock:
+            self.shard_paths[-1] = shard_path
+
+    #####################################################################
+
+    def read(self, filename):
+        """ Read the image back from the current experiment or the shards
+            Args:
+                filename(str)  : Name of the image file
+            Returns:
+                numpy          : Decoded image, None if there is no such image
+        """
+        name = os.path.basename(filename)
+        with self.lock:
+            data = self.pending.get(name)
+            location = self.index.get(name)
+            shard_path = self.shard_paths[location[0]] if location is not None else None
+
+        if data is None:
+            if location is None:
+                return None
+            with open(shard_path, "rb") as shard_file:
+                shard_file.seek(location[1])
+                data = shard_file.read(location[2])
+
+        return decode_image(name, data)
+
+    #####################################################################
+
+    def close(self):
+        """ Close the open shard, the images of an unfinished experiment are dropped """
+        self.pending = {}
+        if self.tar is not None:
+            self.close_shard()
+
+
+#####################################################################
+
+
+class Image_Tensor(object):
+    """ Output copying each image unencoded into its slot of memory mapped arrays preallocated for
+        all the frames of the experiment range. The mask images of the reference car and of the
+        traffic go into [experiments, frames, height, width] arrays and the lane image into a
+        [experiments, height, width, 3] array. The arrays are .npy files named after the range of
+        experiment numbers, stop_<first>_<last>_ref.npy, _traffic.npy and _lanes.npy, which
+        np.load(mmap_mode="r") maps for random access without a copy. The slot of an image is
+        taken from its file name, a slot never written stays black.
+    """
+
+    def __init__(
+        self,
+        tensor_dir,
+        exp_start,
+        exp_stop,
+        num_frames=sg.DATASET_SPAN_FRAMES,
+        height=sg.SUB_IMAGE_LENGTH,
+        width=sg.SUB_IMAGE_WIDTH,
+    ):
+        """ Initializes the output with
+            Args:
+                tensor_dir(str)   : Directory of the arrays
+                exp_start(int)    : First experiment number
+                exp_stop(int)     : One above the last experiment number
+                num_frames(int)   : Number of frames of an experiment
+                height(int)       : Height of the camera view images
+                width(int)        : Width of the camera view images
+        """
+        num_experiments = exp_stop - exp_start
+        prefix = os.path.join(tensor_dir, "stop_{:05d}_{:05d}".format(exp_start, exp_stop - 1))
+        self.exp_start = exp_start
+        # The files are sparse until the frames are written
+        self.layers = {
+            sg.REFERENCE_IMAGE_KEYWORD: np.lib.format.open_memmap(
+                prefix + "_ref.npy", "w+", np.uint8, (num_experiments, num_frames, height, width)
+            ),
+            sg.TRAFFIC_IMAGE_KEYWORD: np.lib.format.open_memmap(
+                prefix + "_traffic.npy", "w+", np.uint8, (num_experiments, num_frames, height, width)
+            ),
+            sg.LANES_IMAGE_KEYWORD: np.lib.format.open_memmap(
+                prefix + "_lanes.npy", "w+", np.uint8, (num_experiments, height, width, 3)
+            ),
+        }
+        self.name_pattern = re.compile(
+            r"stop_(\d+)(" + "|".join(re.escape(keyword) for keyword in self.layers) + r")(\d+)\."
+        )
+
+    #####################################################################
+
+    def slot(self, filename):
+        """ Find the slot of the image
+            Args:
+                filename(str)  : Name of the image file
+            Returns:
+                tuple          : Array and index of the slot
+            Raises:
+                ValueError     : If the name has no slot
+        """
+        match = self.name_pattern.match(os.path.basename(filename))
+        if match is None:
+            raise ValueError("No frame array holds the image " + filename)
+        exp_index = int(match.group(1)) - self.exp_start
+        layer = self.layers[match.group(2)]
+        if not 0 <= exp_index < layer.shape[0]:
+            raise ValueError("The experiment of the image is out of the range of the arrays " + filename)
+        if match.group(2) == sg.LANES_IMAGE_KEYWORD:
+            return layer, exp_index
+        return layer, (exp_index, int(match.group(3)))
+
+    #####################################################################
+
+    def write(self, filename, image):
+        """ Copy the image into its slot
+            Args:
+                filename(str)  : Name of the image file
+                image(numpy)   : Image to write
+            Raises:
+                ValueError     : If the name has no slot
+                IndexError     : If the frame is out of the range of the arrays
+        """
+        layer, index = self.slot(filename)
+        layer[index] = image
+
+    #####################################################################
+
+    def end_experiment(self, exp_no, complete):
+        """ Clear the slots of a rejected experiment, the frames of the next attempt may not cover them
+            Args:
+                exp_no(int)      : Experiment number
+                complete(bool)   : False if the experiment is rejected
+        """
+        if not complete:
+            for layer in self.layers.values():
+                layer[exp_no - self.exp_start] = 0
+
+    #####################################################################
+
+    def read(self, filename):
+        """ Read back the image as cv2.imread would, in BGR
+            Args:
+                filename(str)  : Name of the image file
+            Returns:
+                numpy          : Copy of the image
+        """
+        layer, index = self.slot(filename)
+        image = np.array(layer[index])
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+    #####################################################################
+
+    def close(self):
+        """ Flush the arrays to their files """
+        for layer in self.layers.values():
+            layer.flush()
+
+
+#####################################################################
+
+
+def create_image_output():
+    """ Create the image output selected by sg.IMAGE_OUTPUT
+        Returns:
+            object         : Image_Files, Image_Shards or Image_Tensor
+        Raises:
+            ValueError     : If sg.IMAGE_OUTPUT is unknown
+    """
+    if sg.IMAGE_OUTPUT == sg.IMAGE_OUTPUT_FILES:
+        return Image_Files()
+    if sg.IMAGE_OUTPUT == sg.IMAGE_OUTPUT_TAR_SHARDS:
+        return Image_Shards(sg.IMAGE_BASE_DIR, sg.IMAGE_SHARD_MAX_BYTES)
+    if sg.IMAGE_OUTPUT == sg.IMAGE_OUTPUT_MEMMAP:
+        return Image_Tensor(sg.IMAGE_BASE_DIR, sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS)
+    raise ValueError("Unknown image output " + str(sg.IMAGE_OUTPUT))
+
+
+#####################################################################
+
+
+class Image_Writer(object):
+    """ Write the images with a pool of encoder threads. OpenCV releases the GIL while it
+        encodes, so the threads run alongside the simulation. The queue is bounded: write blocks
+        while it is full, which bounds the images held in memory. flush is the barrier after
+        which all the images written so far are in the output. The images whose names hold one
+        of keep_keywords are also kept as rendered until read hands them over, so the export
+        takes them from memory instead of decoding them back from the output.
+    """
+
+    def __init__(
+        self,
+        num_threads=sg.IMAGE_WRITER_THREADS,
+        queue_size=sg.IMAGE_WRITER_QUEUE_SIZE,
+        output=None,
+        keep_keywords=(),
+    ):
+        """ Initializes the writer with
+            Args:
+                num_threads(int)      : Number of encoder threads, the images are written by the caller if 0
+                queue_size(int)       : Maximum number of images waiting to be written
+                output(object)        : Image_Files, Image_Shards or Image_Tensor the images go into,
+                                        Image_Files if None
+                keep_keywords(tuple)  : Keywords of the images kept until they are read
+        """
+        self.output = output if output is not None else Image_Files()
+        self.keep_keywords = keep_keywords
+        self.kept = {}  # Rendered images by file name until they are read
+        self.queue = queue.Queue(maxsize=max(queue_size, 1))
+        self.lock = threading.Lock()
+        self.errors = []  # Errors of the images written since the last flush
+        self.images_written = 0
+        self.blocked_s = 0.0  # Time the caller waited for room in the queue
+        self.threads = [
+            threading.Thread(target=self.run, name="image_writer_{}".format(index), daemon=True)
+            for index in range(num_threads)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    #####################################################################
+
+    def write(self, filename, image):
+        """ Queue the image to be written
+            Args:
+                filename(str)  : Name of the image file, its extension selects the encoding
+                image(numpy)   : Image to write
+        """
+        keep = any(keyword in os.path.basename(filename) for keyword in self.keep_keywords)
+        # The image may be a view of a canvas the caller keeps drawing into
+        if image.base is not None and (self.threads or keep):
+            image = image.copy()
+        if keep:
+            with self.lock:
+                self.kept[filename] = image
+
+        if not self.threads:
+            self.encode(filename, image)
+            return
+
+        start_time = time.time()
+        self.queue.put((filename, image))
+        self.blocked_s += time.time() - start_time
+
+    #####################################################################
+
+    def encode(self, filename, image):
+        """ Encode and write the image, the error is kept for flush
+            Args:
+                filename(str)  : Name of the image file
+                image(numpy)   : Image to write
+        """
+        try:
+            self.output.write(filename, image)
+        except Exception as error:
+            with self.lock:
+                self.errors.append(error)
+        else:
+            with self.lock:
+                self.images_written += 1
+
+    #####################################################################
+
+    def run(self):
+        """ Encoder thread, writes the queued images until it gets None """
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self.encode(*item)
+            finally:
+                self.queue.task_done()
+
+    #####################################################################
+
+    def flush(self):
+        """ Wait for all the queued images to be written
+            Raises:
+                IOError  : The first error of the images written since the last flush
+        """
+        self.queue.join()
+
+        with self.lock:
+            errors, self.errors = self.errors, []
+        if errors:
+            raise errors[0]
+
+    #####################################################################
+
+    def end_experiment(self, exp_no, complete=True):
+        """ Flush the images of the experiment into the output
+            Args:
+                exp_no(int)      : Experiment number
+                complete(bool)   : False if the experiment is rejected, its kept images are dropped
+        """
+        self.flush()
+        self.output.end_experiment(exp_no, complete)
+        if not complete:
+            prefix = "stop_" + str(exp_no).zfill(5) + "_"
+            with self.lock:
+                for filename in [name for name in self.kept if os.path.basename(name).startswith(prefix)]:
+                    del self.kept[filename]
+
+    #####################################################################
+
+    def read(self, filename):
+        """ Read back an image written so far, in BGR as cv2.imread would. A kept image is handed
+            over as rendered, without a copy or a decode, and is then read from the output.
+            Args:
+                filename(str)  : Name of the image file
+            Returns:
+                numpy          : Image, None if there is no such image
+        """
+        with self.lock:
+            image = self.kept.pop(filename, None)
+        if image is not None:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image
+
+        self.flush()
+        return self.output.read(filename)
+
+    #####################################################################
+
+    def close(self):
+        """ Flush the queued images, stop the encoder threads and close the output """
+        self.kept = {}
+        try:
+            self.flush()
+        finally:
+            for _ in self.threads:
+                self.queue.put(None)
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+            self.output.close()
+
+    #####################################################################
+
+    def print_stats(self):
+        """ Print the writer statistics """
+        print(
+            " Image writer : images written = ",
+            self.images_written,
+            " blocked on a full queue = %.2f s" % self.blocked_s,
+        )
+
+
+#####################################################################
@@ -36,7 +36,13 @@ class Intersection_Rule(object):
 
     ######################################################################################
 
-    def update_cars_through_intersection(self, car_list, Sprite_mid):
+    def is_clear(self):
+        """ Check that no car is waiting in the priority queue """
+        return not self._priority_car_seq_queue
+
+    ######################################################################################
+
+    def update_cars_through_intersection(self, car_list, Sprite_mid, world_state=None):
         """ Check if the car has reached the intersection. if it is at the intersection
             make it stop for at least time_stopped_s. Keep incrementing its time index.
             Check the intersection area is cleaned. Assign the priority to the longest
@@ -45,7 +51,10 @@ class Intersection_Rule(object):
             Args:
                 car_list(list)    : Contains list of cars instances
                 Sprite_mid(object): Contains mid intersection object
+                world_state(object): World_State the cars are bound to, checks the overlap of all the cars at once
         """
+        if world_state is not None:
+            world_state.update_overlap(Sprite_mid)
 
         # collision detection with each car
         for car in car_list:
@@ -53,14 +62,16 @@ class Intersection_Rule(object):
             if car.sim_state.end:
                 car.time_index += car.sim.sim_time_increment_s
                 continue
-            car.sim_state.overlap = _check_car_intersection_overlap(car, Sprite_mid)
-            round_time_index = round(car.time_index, 1)
+            if world_state is None:
+                car.sim_state.overlap = _check_car_intersection_overlap(car, Sprite_mid)
+            tick = car.sim.time_to_tick(car.time_index)
+            valid_tick = car.sim.is_valid_tick(tick)
 
-            if round_time_index in car.sim.sim_motion_state_dict:
-                car.sim_state.cur_state = car.sim.sim_motion_state_dict[round_time_index][1]
+            if valid_tick:
+                car.sim_state.cur_state = int(car.sim.tick_state[tick])
                 if not car.dynamic_state.set_speed:
-                    car.dynamic_state.speed = car.sim.sim_motion_state_dict[round_time_index][4]
-                    car.dynamic_state.accl = car.sim.sim_motion_state_dict[round_time_index][5]
+                    car.dynamic_state.speed = float(car.sim.tick_speed[tick])
+                    car.dynamic_state.accl = float(car.sim.tick_accl[tick])
 
             if sg.DEBUG == sg.DEBUG_LEVEL_1:
                 print(
@@ -68,14 +79,10 @@ class Intersection_Rule(object):
                     car.dynamic_state.speed,
                     car.dynamic_state.accl,
                     car.sim_state.seq,
-                    round_time_index,
+                    tick,
                 )
 
-            if (
-                (car.sim_state.overlap)
-                and (round_time_index in car.sim.sim_motion_state_dict)
-                and (car.sim.sim_motion_state_dict[round_time_index][1] == CarState.DECEL.value)
-            ):
+            if (car.sim_state.overlap) and valid_tick and (car.sim.tick_state[tick] == CarState.DECEL.value):
                 if sg.DEBUG == sg.DEBUG_LEVEL_1:
                     print(" It is into collision and decel for seq at time ", car.sim_state.seq, car.time_index)
                 car.time_index += car.sim.sim_time_increment_s
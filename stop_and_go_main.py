@@ -2,9 +2,6 @@
 # Uber, Inc. (c) 2019
 # Description: This is the main game loop
 #####################################################################
-import os
-
-import pygame
 import stop_and_go_globals as sg
 ######### optional to find the cv2 module in venv ###################
 import sys
@@ -15,12 +12,14 @@ from stop_and_go_data import Save_Sim_Flow_Data
 from stop_and_go_data_type import OptionChoice
 from stop_and_go_draw import Generator
 from stop_and_go_main_loop import start_game
+from stop_and_go_parallel import run_parallel
+from stop_and_go_profile_cache import Profile_Cache
+from stop_and_go_render import create_canvas
+from stop_and_go_sampler import experiment_rng
+from stop_and_go_sim import Config_manager
+from stop_and_go_sim_batch import Sim_Batch
 from stop_and_go_view import Camera, Frame_State
 
-####################################################################
-pygame.init()
-pygame.display.set_caption("Stop and Go")
-os.environ["SDL_VIDEODRIVER"] = "dummy"
 #####################################################################
 
 
@@ -59,11 +58,34 @@ def main():
 
     if dataset_storage_choice > OptionChoice.TETRYS_OPTION:
         print(" This is an invalid choice ", dataset_storage_choice, " Quitting")
-        pygame.quit()
         exit(0)
 
-    # Initialize the window
-    window = pygame.display.set_mode((sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS))
+    if sg.NUM_WORKERS > 1:
+        run_parallel(run_experiments, dataset_storage_choice, sg.NUM_WORKERS)
+    else:
+        run_experiments(dataset_storage_choice)
+
+    print(" ****************** Quiting **************** ")
+
+
+#####################################################################
+
+
+def run_experiments(dataset_storage_choice):
+    """ Generate the experiments START_EXPERIMENT_NUMBER..TOTAL_DATA_POINTS - 1 in this process
+        Args:
+            dataset_storage_choice(int) : Store the dataset into json or tetrys table
+    """
+    # Initialize the window of the configured rendering backend
+    window = create_canvas(sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS)
+
+    # Random number generator of the first experiment
+    exp_rng = None
+    if sg.BASE_SEED is not None:
+        exp_rng = experiment_rng(sg.BASE_SEED, sg.START_EXPERIMENT_NUMBER)
+
+    # In adaptive mode the start frame is drawn once the experiment is generated ( see start_game )
+    frame_rng = None if sg.DATASET_ADAPTIVE_START_FRAMES else exp_rng
 
     # Initialize the Frame State
     frame_state = Frame_State(
@@ -73,12 +95,19 @@ def main():
         sg.DATASET_TOTAL_FRAMES,
         sg.DATASET_START_FRAMES,
         sg.DATASET_START_FRAME_DEV,
+        frame_rng,
     )
 
     # Get the generate object
     generator = Generator()
     # Generate the instances of the frame objects
-    Car_list, Path_list, Stop_line_list, Sprite_mid = generator.generate_objects(window)
+    # A seeded experiment is sampled in the same order as the ones generated by start_game
+    sims = None
+    if exp_rng is not None:
+        config_manager = Config_manager()
+        profile_cache = Profile_Cache.from_config(config_manager)
+        sims = Sim_Batch(config_manager, 1, profile_cache=profile_cache, rng=exp_rng).next_experiment()
+    Car_list, Path_list, Stop_line_list, Sprite_mid = generator.generate_objects(window, sims, exp_rng)
 
     # Initialize the camera view
     camera = Camera(Car_list)
@@ -100,10 +129,9 @@ def main():
         dataset_storage_choice,
         save_sim_flow_data,
         tetrys_content_list,
+        exp_rng,
     )
 
-    print(" ****************** Quiting **************** ")
-
 
 #####################################################################
 if __name__ == "__main__":
@@ -5,13 +5,21 @@
 import os
 import time
 
-import pygame
 import stop_and_go_globals as sg
-from stop_and_go_data import Save_Sim_Flow_Data
-from stop_and_go_data_type import CarState
+from stop_and_go_data import Save_Sim_Flow_Data, create_metadata_writer
+from stop_and_go_data_generation import create_tetrys_streamer
+from stop_and_go_data_type import OptionChoice
 from stop_and_go_draw import Drawer, Generator
+from stop_and_go_feasibility import check_recorded_stop_lines, feasible_start_frames, is_experiment_feasible
+from stop_and_go_image_writer import Image_Writer, create_image_output
 from stop_and_go_intersection_rules import Intersection_Rule
+from stop_and_go_profile_cache import Profile_Cache
+from stop_and_go_scheduler import Event_Scheduler
+from stop_and_go_sampler import experiment_rng
+from stop_and_go_sim import Config_manager
+from stop_and_go_sim_batch import Sim_Batch
 from stop_and_go_view import Camera
+from stop_and_go_world import World_State
 
 ####################################################################
 
@@ -27,43 +35,19 @@ def check_image_dir():
 ####################################################################
 
 
-def validate_last_time_key(last_frame_time, car_list):
-    """ Check if all the cars have enough simulated time as last frame's time.
-        If all the cars have enough time to reach the end of simulation return true
-        else return false.
+def fast_forward(scheduler, car_list, path_list, sprite_mid, frame_state):
+    """ Advance the simulation to the tick before the recording window. The frames before
+        frame_state.start_frame are never recorded, so there is no event or surface work.
         Args:
-            last_frame_time(float): Last timestamp of the frame
-            car_list(list)        : Car_list has 4 car's objects
+            scheduler(object)     : Event_Scheduler of the experiment
+            car_list(list)        : car_list has 4 car's objects
+            path_list(list)       : path_list has 4 path's objects
+            sprite_mid(object)    : sprite_mid contains the intersection information
+            frame_state(object)   : Frame_state contains the frame information
         Returns:
-            bool                  : Returns true if all the cars have valid number of frames
+            int                   : Number of ticks advanced
     """
-    valid_frame_state = True
-
-    # Check the reference car has some phase into cruise after
-    for car in car_list:
-        # Car may reach end or go outside the boundary in the last second
-        last_sim_time_key = round(round(sorted(car.sim.sim_motion_state_dict.keys())[-1], 1) - 2, 1)
-        if (car.sim_state.seq == sg.CAR_SEQ_1) and (
-            (car.sim.sim_motion_state_dict[last_sim_time_key][1] != CarState.CRUISE_A.value)
-            and (car.sim.sim_motion_state_dict[last_sim_time_key][1] != CarState.PAST_SIM.value)
-        ):
-
-            if sg.DEBUG == sg.DEBUG_LEVEL_1:
-                print(
-                    " Car # ",
-                    car.sim_state.seq,
-                    " has motion state ",
-                    car.sim.sim_motion_state_dict[last_sim_time_key][1],
-                )
-
-            valid_frame_state = False
-            return valid_frame_state
-
-        if last_sim_time_key < round(last_frame_time, 1):
-            valid_frame_state = False
-            return valid_frame_state
-
-    return valid_frame_state
+    return scheduler.advance(car_list, path_list, sprite_mid, frame_state.start_frame - 1)
 
 
 ###########################################################################################
@@ -80,6 +64,7 @@ def start_game(
     dataset_storage_choice,
     save_sim_flow_data,
     tetrys_content_list,
+    exp_rng=None,
 ):
     """ Start the simulation. Check the car's through the intersection. If all the cars
         have reached the end , reset the car's parametrs and restart the simulation.
@@ -89,49 +74,78 @@ def start_game(
             path_list(list)                : path_list has 4 path's objects
             stop_line_list(list)           : stop_line_list  has 4 stop line's objects
             sprite_mid(object)             : sprite_mid contains the intersection information
-            window(pygame window)          : Current Frame
+            window(canvas)                 : Current Frame
             camera(object)                 : Camera information wrt reference car
             frame_state(object)            : Frame_state contains the frame information
             spark(SparkSession)            : Spark session to insert entries
             dataset_storage_choice(int)    : Store the dataset into json or tetrys table
             save_sim_flow_data(dictionary) : Map to store the simulation data for each car with key as time
             tetrys_content_list(list)      : Store each iteration row data for tetrys
+            exp_rng(object)                : np.random.Generator of the first experiment if sg.BASE_SEED is set
     """
     gameLoop = True
     exp_status = False
     reset_frames_exp = True
-    frame_division = 10.0
     exp_no = sg.START_EXPERIMENT_NUMBER
-    sub_seq_no = sg.DATASET_START_FRAMES
     intersection_rule = Intersection_Rule()
+    sim_batch = None
+    config_manager = Config_manager()
+    profile_cache = Profile_Cache.from_config(config_manager)
+    world_state = World_State(car_list)
+    scheduler = Event_Scheduler(intersection_rule, world_state)
+    if sg.DATASET_ADAPTIVE_START_FRAMES:
+        frame_state.reset_frames_within(
+            feasible_start_frames(car_list, stop_line_list, sprite_mid, frame_state), exp_rng
+        )
+    sub_seq_no = frame_state.start_frame
+    feasible = is_experiment_feasible(car_list, stop_line_list, sprite_mid, frame_state)
+    if feasible:
+        fast_forward(scheduler, car_list, path_list, sprite_mid, frame_state)
 
     # Create/check for the existence of directory to put the images in
     check_image_dir()
+    # The streamed tetrys export takes the rendered masks and lane images of a group of experiments
+    # from memory. The export at the end of the run reads them back from the image output, keeping
+    # them in memory for the whole run would take about 33 MB per experiment
+    stream_tetrys = dataset_storage_choice == OptionChoice.TETRYS_OPTION and sg.TETRYS_FLUSH_EXPERIMENTS > 0
+    keep_keywords = ()
+    if stream_tetrys:
+        keep_keywords = (sg.REFERENCE_IMAGE_KEYWORD, sg.TRAFFIC_IMAGE_KEYWORD, sg.LANES_IMAGE_KEYWORD)
+    image_writer = Image_Writer(
+        sg.IMAGE_WRITER_THREADS, sg.IMAGE_WRITER_QUEUE_SIZE, create_image_output(), keep_keywords
+    )
+    if stream_tetrys:
+        metadata_writer = create_tetrys_streamer(image_writer)
+    else:
+        metadata_writer = create_metadata_writer(sg.OUPUT_JSON_FILENAME)
 
     # Main loop
     start_time = time.time()
     while gameLoop:
         if exp_no == sg.TOTAL_DATA_POINTS:
             print("--- %s seconds ---" % (time.time() - start_time))
-            pygame.quit()
+            if profile_cache is not None:
+                profile_cache.print_stats()
+            # The last tetrys rows are streamed with images read back from the image writer
+            metadata_writer.close()
+            image_writer.close()
+            image_writer.print_stats()
+            window.close()
+            return
+
+        if window.quit_requested():
+            print("unexpected quit --- %s seconds ---" % (time.time() - start_time))
+            metadata_writer.close()
+            image_writer.close()
+            window.close()
             exit(0)
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                print("unexpected quit --- %s seconds ---" % (time.time() - start_time))
-                pygame.quit()
-                exit(0)
-
         # Reset the screen to blank white each time
         window.fill(sg.BLACK)
 
-        # Update the car's positiona nd timer at the intersection
-        intersection_rule.update_cars_through_intersection(car_list, sprite_mid)
-
-        # Update the car's movement and check if it is out of frame or not
-        for car in car_list:
-            car.update_car_position(path_list, sprite_mid)
-            car.check_outside_boundary()
+        # Update the car's position and timer at the intersection and check if it is out of frame or not
+        if feasible:
+            scheduler.advance(car_list, path_list, sprite_mid, 1)
 
         # If each car reaches the end
         end_status = all(car.sim_state.end for car in car_list)
@@ -148,34 +162,57 @@ def start_game(
             # Increment the experiment no
             sg.SET_CAMERA_ONCE = False
 
-            # Reset the camera view frame
-            frame_state.reset_frames()
             if reset_frames_exp:
                 exp_no += 1
+                # The next experiment number draws from its own stream
+                if sg.BASE_SEED is not None:
+                    exp_rng = experiment_rng(sg.BASE_SEED, exp_no)
+
+            # Reset the camera view frame. In adaptive mode it is sampled from the next experiment
+            if not sg.DATASET_ADAPTIVE_START_FRAMES:
+                frame_state.reset_frames(exp_rng)
 
             # Reset the intersection_manager
             intersection_rule.reset()
 
             exp_status = False
             reset_frames_exp = True
+            # Generate the simulation data of the next experiments in one batch. The experiments of a
+            # seeded run are generated one by one from the stream of their experiment number
+            if exp_rng is not None:
+                sim_batch = Sim_Batch(config_manager, 1, profile_cache=profile_cache, rng=exp_rng)
+            elif (sim_batch is None) or sim_batch.is_exhausted():
+                sim_batch = Sim_Batch(config_manager, sg.SIM_BATCH_SIZE, profile_cache=profile_cache)
+
+            # RESET FOR RESTARTING THE GAME AGAIN
+            window.update()
+            car_list, camera, save_sim_flow_data = reset_all(window, exp_no, sim_batch.next_experiment(), exp_rng)
+            if sg.DATASET_ADAPTIVE_START_FRAMES:
+                frame_state.reset_frames_within(
+                    feasible_start_frames(car_list, stop_line_list, sprite_mid, frame_state), exp_rng
+                )
             # Reset the frame number
             sub_seq_no = frame_state.start_frame
-            # RESET FOR RESTARTING THE GAME AGAIN
-            pygame.display.update()
-            car_list, camera, save_sim_flow_data = reset_all(window, exp_no)
-
-        # validate frames for the valid frame bounds, if any car has invalid frames return
-        valid_frames = validate_last_time_key(frame_state.end_frame / frame_division, car_list)
+            world_state = World_State(car_list)
+            scheduler = Event_Scheduler(intersection_rule, world_state)
+            # Reject the experiments without valid frames or stop lines before stepping them
+            feasible = is_experiment_feasible(car_list, stop_line_list, sprite_mid, frame_state)
+            if feasible:
+                fast_forward(scheduler, car_list, path_list, sprite_mid, frame_state)
 
         # if there is no valid frames, just repeat the iteration with reset frame
-        if valid_frames:
+        if feasible:
             # First Save the data and then draw it. This is for one simulation without window move
             draw_status = save_sim_flow_data.populate_sim_data_car_seq(car_list, stop_line_list, frame_state)
 
             if sg.DEBUG == sg.DEBUG_LEVEL_1:
                 print(" no_data_required status = ", draw_status)
 
-            if draw_status:
+            # The stop lines are out of the camera view, reject the experiment before drawing any frame
+            if draw_status and not check_recorded_stop_lines(save_sim_flow_data, car_list, stop_line_list, frame_state):
+                reset_frames_exp = False
+                exp_status = True
+            elif draw_status:
                 if sg.DEBUG == sg.DEBUG_LEVEL_1:
                     print(" **************** IMAGE CREATION STARTS *************")
 
@@ -190,16 +227,21 @@ def start_game(
                     frame_state,
                     dataset_storage_choice,
                     save_sim_flow_data,
+                    image_writer,
+                    metadata_writer,
                 )
 
                 reset_frames_exp = draw.draw_all_traffic(
                     window, sub_seq_no, dataset_storage_choice, tetrys_content_list
                 )
-
                 # Regenarate the frames. In case of complete traffic there is no transformation in 128, so skip it.
                 if sg.DISPLAY_TRAFFIC:
                     reset_frames_exp = True
 
+                # The images and frames of the experiment are in the output, those of a rejected attempt are dropped
+                image_writer.end_experiment(exp_no, reset_frames_exp)
+                metadata_writer.end_experiment(exp_no, reset_frames_exp)
+
                 exp_status = True
         else:
             # No need to reset the frames
@@ -211,12 +253,14 @@ def start_game(
 #####################################################################
 
 
-def reset_all(window, exp_no):
+def reset_all(window, exp_no, sims=None, rng=None):
     """ Reset the simulation and all the objects's parameters
         that is  part of the simulation.
         Args:
-            window(pygame window) : current frame
+            window(canvas)        : current frame
             exp_no(int)           : Current experiment number
+            sims(list)            : Pre-generated Sim objects of the experiment
+            rng(object)           : np.random.Generator of the experiment, the global np.random state if None
     """
     if sg.DEBUG == sg.DEBUG_LEVEL_1:
         print(" RESET EVERYTHING ")
@@ -224,7 +268,7 @@ def reset_all(window, exp_no):
     print("**************START ITERATION No *******************", exp_no)
     # Get the generate object
     generator = Generator()
-    Car_list, Path_list, Stop_line_list, Sprite_mid = generator.generate_objects(window)
+    Car_list, Path_list, Stop_line_list, Sprite_mid = generator.generate_objects(window, sims, rng)
     print("**************END ITERATION No *******************", exp_no)
 
     # Initialize the camera view
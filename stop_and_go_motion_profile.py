@@ -0,0 +1,162 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : Analytic motion profile of the car. The car's motion
+#               is stored as the boundaries and the kinematic
+#               coefficients of the simulation phases
+#####################################################################
+import numpy as np
+from stop_and_go_data_type import CarState
+
+#####################################################################
+
+
+class Motion_Profile(object):
+    """ Piecewise constant acceleration motion of the car through the phases
+        CRUISE, DECEL, STOP, ACCEL, CRUISE_A and PAST_SIM. Each phase keeps its
+        start time, start position, start speed and acceleration, so the state
+        at any time is evaluated in closed form.
+        Position is in pixels ( like Sim.tick_total_dist ), speed in m/s and
+        acceleration in m/s^2.
+    """
+
+    def __init__(
+        self,
+        dist_before_stop_m,
+        dist_after_stop_m,
+        speed_before_stop_mps,
+        decel_before_stop_mpss,
+        time_stopped_s,
+        accl_after_stop_mpss,
+        speed_after_stop_mps,
+        resolution,
+    ):
+        """ Initializes the profile from the simulation parameters
+            Args:
+                dist_before_stop_m(float)      : Distance to the stop line
+                dist_after_stop_m(float)       : Distance after the stop line
+                speed_before_stop_mps(float)   : Cruise speed before the stop line
+                decel_before_stop_mpss(float)  : Deceleration before the stop line ( negative )
+                time_stopped_s(float)          : Time stopped at the stop line
+                accl_after_stop_mpss(float)    : Acceleration after the stop line
+                speed_after_stop_mps(float)    : Cruise speed after the acceleration
+                resolution(float)              : Pixels per meter
+        """
+        self.resolution = resolution
+
+        decel_time = -speed_before_stop_mps / decel_before_stop_mpss
+        decel_dist = 0.5 * speed_before_stop_mps * decel_time
+        cruise_time = (dist_before_stop_m - decel_dist) / speed_before_stop_mps
+        accl_time = speed_after_stop_mps / accl_after_stop_mpss
+        accl_dist = 0.5 * speed_after_stop_mps * accl_time
+        cruise_after_time = (dist_after_stop_m - accl_dist) / speed_after_stop_mps
+
+        durations = np.array([cruise_time, decel_time, time_stopped_s, accl_time, cruise_after_time])
+
+        self.phase_state = np.array(
+            [
+                CarState.CRUISE.value,
+                CarState.DECEL.value,
+                CarState.STOP.value,
+                CarState.ACCEL.value,
+                CarState.CRUISE_A.value,
+                CarState.PAST_SIM.value,
+            ],
+            dtype=np.int8,
+        )
+        self.phase_start_time = np.concatenate(([0.0], np.cumsum(durations)))
+        self.phase_start_speed = np.array(
+            [speed_before_stop_mps, speed_before_stop_mps, 0.0, 0.0, speed_after_stop_mps, speed_after_stop_mps]
+        )
+        self.phase_accl = np.array([0.0, decel_before_stop_mpss, 0.0, accl_after_stop_mpss, 0.0, 0.0])
+        self.phase_start_pos = np.array(
+            [
+                0.0,
+                dist_before_stop_m - decel_dist,
+                dist_before_stop_m,
+                dist_before_stop_m,
+                dist_before_stop_m + accl_dist,
+                dist_before_stop_m + dist_after_stop_m,
+            ]
+        )
+
+        # Time when the car has travelled the whole path
+        self.end_time_s = self.phase_start_time[-1]
+
+    #####################################################################
+
+    @classmethod
+    def from_sim(cls, sim):
+        """ Build the profile from the parameters of a Sim object
+            Args:
+                sim(object)   : Sim object with the sampled parameters
+            Returns:
+                object        : Motion_Profile of the car
+        """
+        return cls(
+            sim.dist_before_stop_m,
+            sim.dist_after_stop_m,
+            sim.speed_before_stop_mps,
+            sim.decel_before_stop_mpss,
+            sim.time_stopped_s,
+            sim.accl_after_stop_mpss,
+            sim.speed_after_stop_mps,
+            sim.resolution,
+        )
+
+    #####################################################################
+
+    def phase_index(self, time_s):
+        """ Index of the phase at the time. Times before 0 belong to the first phase
+            Args:
+                time_s(float or numpy)  : Simulation time in seconds
+            Returns:
+                int or numpy            : Phase index
+        """
+        index = np.searchsorted(self.phase_start_time, time_s, side="right") - 1
+
+        return np.maximum(index, 0)
+
+    #####################################################################
+
+    def query(self, time_s):
+        """ State of the car at the time
+            Args:
+                time_s(float or numpy)  : Simulation time in seconds
+            Returns:
+                tuple                   : ( CarState value, position, speed, acceleration )
+        """
+        time_s = np.asarray(time_s, dtype=np.float64)
+        index = self.phase_index(time_s)
+        tau = np.maximum(time_s - self.phase_start_time[index], 0.0)
+        accl = self.phase_accl[index]
+        speed = self.phase_start_speed[index] + accl * tau
+        position = self.phase_start_pos[index] + self.phase_start_speed[index] * tau + 0.5 * accl * tau * tau
+
+        return self.phase_state[index][()], (position * self.resolution)[()], speed[()], accl[()]
+
+    #####################################################################
+
+    def state(self, time_s):
+        """ CarState value of the car at the time """
+        return self.query(time_s)[0]
+
+    #####################################################################
+
+    def position(self, time_s):
+        """ Distance (pixels) travelled by the car at the time """
+        return self.query(time_s)[1]
+
+    #####################################################################
+
+    def speed(self, time_s):
+        """ Speed (m/s) of the car at the time """
+        return self.query(time_s)[2]
+
+    #####################################################################
+
+    def accel(self, time_s):
+        """ Acceleration (m/s^2) of the car at the time """
+        return self.query(time_s)[3]
+
+
+#####################################################################
@@ -0,0 +1,196 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : Parallel runner. The experiment range is split into
+#               shards generated by a pool of worker processes, each
+#               with its own headless window and metadata writer
+#####################################################################
+import multiprocessing
+import os
+import shutil
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_data import append_columns, metadata_filename
+from stop_and_go_data_type import OptionChoice
+
+#####################################################################
+
+SHARDS_PER_WORKER = 4  # Shards handed out to each worker, smaller shards even out the rejections
+
+# Contiguous range of experiment numbers [exp_start, exp_stop) and the metadata file of the shard
+Shard = namedtuple("Shard", ["index", "exp_start", "exp_stop", "json_filename"])
+
+# Throughput of a generated shard
+Shard_Stats = namedtuple("Shard_Stats", ["index", "worker_pid", "num_experiments", "elapsed_s"])
+
+#####################################################################
+
+
+def split_experiment_range(exp_start, exp_stop, num_shards, json_filename=sg.OUPUT_JSON_FILENAME):
+    """ Split the experiment numbers [exp_start, exp_stop) into contiguous shards of near equal size
+        Args:
+            exp_start(int)       : First experiment number
+            exp_stop(int)        : One above the last experiment number
+            num_shards(int)      : Maximum number of shards
+            json_filename(str)   : Metadata file the shard files are named after
+        Returns:
+            list                 : Shard of each range, ordered by experiment number
+    """
+    num_experiments = max(exp_stop - exp_start, 0)
+    num_shards = max(min(num_shards, num_experiments), 1)
+    bounds = exp_start + (np.arange(num_shards + 1) * num_experiments) // num_shards
+
+    return [
+        Shard(index, int(bounds[index]), int(bounds[index + 1]), "{}.shard{:04d}".format(json_filename, index))
+        for index in range(num_shards)
+        if bounds[index + 1] > bounds[index]
+    ]
+
+
+#####################################################################
+
+
+def run_shard(run_experiments, dataset_storage_choice, base_seed, shard):
+    """ Generate the experiments of the shard in the worker process
+        Args:
+            run_experiments(function)   : Generates sg.START_EXPERIMENT_NUMBER..sg.TOTAL_DATA_POINTS - 1
+            dataset_storage_choice(int) : Store the dataset into json or tetrys table
+            base_seed(int)              : Seed of the run
+            shard(Shard)                : Experiments of the shard
+        Returns:
+            Shard_Stats                 : Throughput of the shard
+    """
+    # A pygame window of the worker is headless
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    # The workers already use all the cores
+    cv2.setNumThreads(1)
+    sg.SET_CAMERA_ONCE = False
+    sg.BASE_SEED = base_seed
+    sg.START_EXPERIMENT_NUMBER = shard.exp_start
+    sg.TOTAL_DATA_POINTS = shard.exp_stop
+    sg.OUPUT_JSON_FILENAME = shard.json_filename
+
+    start_time = time.time()
+    run_experiments(dataset_storage_choice)
+
+    return Shard_Stats(shard.index, os.getpid(), shard.exp_stop - shard.exp_start, time.time() - start_time)
+
+
+#####################################################################
+
+
+def merge_metadata(shards, json_filename):
+    """ Append the metadata of the shards to the metadata file in experiment number order
+        and remove the shard files
+        Args:
+            shards(list)         : Shards ordered by experiment number
+            json_filename(str)   : Metadata file
+    """
+    if sg.OUTPUT_JSON_FORMAT == sg.JSON_FORMAT_COLUMNS:
+        shard_filenames = [
+            metadata_filename(shard.json_filename)
+            for shard in shards
+            if os.path.exists(metadata_filename(shard.json_filename))
+        ]
+        columns_list = []
+        for shard_filename in shard_filenames:
+            with np.load(shard_filename) as npz_file:
+                columns_list.append({name: npz_file[name] for name in npz_file.files})
+        append_columns(metadata_filename(json_filename), columns_list)
+        for shard_filename in shard_filenames:
+            os.remove(shard_filename)
+        return
+
+    with open(json_filename, "a+") as json_file:
+        for shard in shards:
+            if not os.path.exists(shard.json_filename):
+                continue
+            with open(shard.json_filename, "r") as shard_file:
+                shutil.copyfileobj(shard_file, json_file)
+            os.remove(shard.json_filename)
+
+
+#####################################################################
+
+
+def print_throughput(shard_stats, elapsed_s):
+    """ Print the throughput of each worker and of the run
+        Args:
+            shard_stats(list)   : Shard_Stats of the generated shards
+            elapsed_s(float)    : Wall time of the run
+    """
+    workers = {}
+    for stats in shard_stats:
+        num_experiments, busy_s = workers.get(stats.worker_pid, (0, 0.0))
+        workers[stats.worker_pid] = (num_experiments + stats.num_experiments, busy_s + stats.elapsed_s)
+
+    for worker_no, (worker_pid, (num_experiments, busy_s)) in enumerate(sorted(workers.items())):
+        print(
+            " Worker # ",
+            worker_no,
+            " pid ",
+            worker_pid,
+            " experiments ",
+            num_experiments,
+            " in %.2f s ( %.3f experiments/s )" % (busy_s, num_experiments / max(busy_s, 1e-9)),
+        )
+
+    num_experiments = sum(stats.num_experiments for stats in shard_stats)
+    print(
+        " Total experiments ",
+        num_experiments,
+        " in %.2f s ( %.3f experiments/s )" % (elapsed_s, num_experiments / max(elapsed_s, 1e-9)),
+    )
+
+
+#####################################################################
+
+
+def run_parallel(run_experiments, dataset_storage_choice, num_workers):
+    """ Generate the experiments START_EXPERIMENT_NUMBER..TOTAL_DATA_POINTS - 1 across a pool of
+        worker processes. Each experiment number draws from its own random stream ( see BASE_SEED ),
+        so the output doesn't depend on the worker which generated it. Images are named after the
+        experiment number and the metadata is merged in experiment number order.
+        Args:
+            run_experiments(function)   : Generates sg.START_EXPERIMENT_NUMBER..sg.TOTAL_DATA_POINTS - 1
+            dataset_storage_choice(int) : Store the dataset into json or tetrys table
+            num_workers(int)            : Number of worker processes
+        Raises:
+            ValueError                  : If the dataset is stored into the tetrys table
+    """
+    if dataset_storage_choice != OptionChoice.JSON_OPTION:
+        raise ValueError("The parallel runner stores the dataset into json only, set NUM_WORKERS = 1 for tetrys")
+
+    base_seed = sg.BASE_SEED
+    if base_seed is None:
+        base_seed = np.random.SeedSequence().entropy
+        print(" BASE_SEED isn't set, the run uses BASE_SEED = ", base_seed)
+
+    shards = split_experiment_range(
+        sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, num_workers * SHARDS_PER_WORKER, sg.OUPUT_JSON_FILENAME
+    )
+
+    # The workers write the images into the same directory and the metadata into their shard file
+    if not os.path.isdir(sg.IMAGE_BASE_DIR):
+        os.mkdir(sg.IMAGE_BASE_DIR)
+    for shard in shards:
+        if os.path.exists(metadata_filename(shard.json_filename)):
+            os.remove(metadata_filename(shard.json_filename))
+
+    start_time = time.time()
+    # Workers are spawned so that each one initializes its own pygame display
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [
+            executor.submit(run_shard, run_experiments, dataset_storage_choice, base_seed, shard) for shard in shards
+        ]
+        shard_stats = [future.result() for future in futures]
+
+    merge_metadata(shards, sg.OUPUT_JSON_FILENAME)
+    print_throughput(shard_stats, time.time() - start_time)
+
+
+#####################################################################
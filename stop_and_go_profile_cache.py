@@ -0,0 +1,149 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : LRU cache of the generated motion profiles. The sampled
+#               parameters are quantized so that cars with near identical
+#               parameters share one profile
+#####################################################################
+from collections import OrderedDict
+
+#####################################################################
+
+
+class Profile_Cache(object):
+    """ Bounded LRU cache of the motion profiles keyed by the quantized parameters.
+        The turn doesn't change the motion along the path, so it isn't part of the key.
+    """
+
+    def __init__(self, max_size, speed_resolution_mps, accl_resolution_mpss, time_resolution_s):
+        """ Initializes the cache with
+            Args:
+                max_size(int)                 : Maximum number of profiles kept in the cache
+                speed_resolution_mps(float)   : Quantization step of the speeds
+                accl_resolution_mpss(float)   : Quantization step of the accel and decel
+                time_resolution_s(float)      : Quantization step of the time stopped
+        """
+        self.max_size = max_size
+        self.speed_resolution_mps = speed_resolution_mps
+        self.accl_resolution_mpss = accl_resolution_mpss
+        self.time_resolution_s = time_resolution_s
+        self.profiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #####################################################################
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """ Create the cache from the profile_cache section of the config
+            Args:
+                config_manager(object)   : Config_manager object
+            Returns:
+                object                   : Profile_Cache, or None if the cache is disabled
+        """
+        cache_params = config_manager.config_params.get("profile_cache", {})
+        if not cache_params.get("enabled", False):
+            return None
+
+        return cls(
+            int(cache_params["max_size"]),
+            float(cache_params["speed_resolution_mps"]),
+            float(cache_params["accl_resolution_mpss"]),
+            float(cache_params["time_resolution_s"]),
+        )
+
+    #####################################################################
+
+    @staticmethod
+    def quantize(value, resolution):
+        """ Index of the nearest multiple of the resolution """
+        return int(round(value / resolution))
+
+    #####################################################################
+
+    def quantize_sim(self, sim):
+        """ Quantize the parameters of the Sim object in place and return its cache key
+            Args:
+                sim(object)   : Sim object with the sampled parameters
+            Returns:
+                tuple         : Cache key of the Sim object
+        """
+        key = (
+            sim.seq_no,
+            sim.dist_before_stop_m,
+            sim.dist_after_stop_m,
+            self.quantize(sim.speed_before_stop_mps, self.speed_resolution_mps),
+            self.quantize(sim.speed_after_stop_mps, self.speed_resolution_mps),
+            self.quantize(sim.decel_before_stop_mpss, self.accl_resolution_mpss),
+            self.quantize(sim.accl_after_stop_mpss, self.accl_resolution_mpss),
+            self.quantize(sim.time_stopped_s, self.time_resolution_s),
+        )
+
+        sim.speed_before_stop_mps = key[3] * self.speed_resolution_mps
+        sim.speed_after_stop_mps = key[4] * self.speed_resolution_mps
+        sim.decel_before_stop_mpss = key[5] * self.accl_resolution_mpss
+        sim.accl_after_stop_mpss = key[6] * self.accl_resolution_mpss
+        sim.time_stopped_s = key[7] * self.time_resolution_s
+
+        return key
+
+    #####################################################################
+
+    def get(self, key):
+        """ Look up the profile and mark it as the most recently used
+            Args:
+                key(tuple)     : Cache key from quantize_sim
+            Returns:
+                object         : Cached profile, or None on a miss
+        """
+        profile = self.profiles.get(key)
+        if profile is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.profiles.move_to_end(key)
+
+        return profile
+
+    #####################################################################
+
+    def put(self, key, profile):
+        """ Store the profile, evicting the least recently used one if the cache is full
+            Args:
+                key(tuple)       : Cache key from quantize_sim
+                profile(object)  : Profile to store
+        """
+        self.profiles[key] = profile
+        self.profiles.move_to_end(key)
+        if len(self.profiles) > self.max_size:
+            self.profiles.popitem(last=False)
+            self.evictions += 1
+
+    #####################################################################
+
+    def hit_rate(self):
+        """ Fraction of the look ups served from the cache """
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+    #####################################################################
+
+    def print_stats(self):
+        """ Print the cache statistics """
+        print(
+            " Profile cache : size = ",
+            len(self.profiles),
+            " hits = ",
+            self.hits,
+            " misses = ",
+            self.misses,
+            " evictions = ",
+            self.evictions,
+            " hit rate = ",
+            round(self.hit_rate(), 4),
+        )
+
+
+#####################################################################
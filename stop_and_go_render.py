@@ -0,0 +1,444 @@
+#####################################################################
+# Uber, Inc. (c) 2020
+# Description : Rendering backends. The frame objects are drawn onto a
+#               canvas, either a pygame display surface or a uint8
+#               ndarray rasterized with OpenCV ( pygame isn't needed )
+#####################################################################
+import cv2
+import numpy as np
+import stop_and_go_globals as sg
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+#####################################################################
+
+
+class Numpy_Canvas(object):
+    """ Frame held in a preallocated BGR uint8 array ( the layout of the images written with cv2 ).
+        Polygons, lines and rectangles are rasterized in place with OpenCV.
+    """
+
+    renders_camera_view = False  # The whole frame is drawn, the camera view is cropped from it
+
+    def __init__(self, width, length):
+        """ Initializes the canvas with
+            Args:
+                width(int)   : Width of the frame in pixels
+                length(int)  : Length of the frame in pixels
+        """
+        self.image = np.zeros((length, width, 3), dtype=np.uint8)
+
+    ####################################################################
+
+    @staticmethod
+    def to_bgr(color):
+        """ Convert the RGB color of the globals to the BGR order of the canvas
+            Args:
+                color(tuple)  : RGB color
+            Returns:
+                tuple         : BGR color
+        """
+        return (int(color[2]), int(color[1]), int(color[0]))
+
+    ####################################################################
+
+    def fill(self, color):
+        """ Fill the whole frame with the color
+            Args:
+                color(tuple)  : RGB color
+        """
+        self.image[:] = self.to_bgr(color)
+
+    ####################################################################
+
+    def polygon(self, color, points):
+        """ Draw a filled polygon
+            Args:
+                color(tuple)   : RGB color
+                points(list)   : (x, y) vertices in pixels
+        """
+        # Same truncation of the vertices as pygame
+        vertices = np.floor(np.asarray(points, dtype=np.float64)).astype(np.int32)
+        cv2.fillPoly(self.image, [vertices], self.to_bgr(color))
+
+    ####################################################################
+
+    def line(self, color, start, stop, width):
+        """ Draw a line
+            Args:
+                color(tuple)   : RGB color
+                start(tuple)   : (x, y) start of the line in pixels
+                stop(tuple)    : (x, y) end of the line in pixels
+                width(int)     : Width of the line in pixels
+        """
+        start_x, start_y, stop_x, stop_y = (int(np.floor(value)) for value in (*start, *stop))
+        # Like pygame, a wide line is made of 1 pixel lines shifted across its main direction
+        # ( OpenCV's thick lines have round caps )
+        across = (0, 1) if abs(stop_x - start_x) >= abs(stop_y - start_y) else (1, 0)
+        first = -((int(width) - 1) // 2)
+        for shift in range(first, first + max(int(width), 1)):
+            cv2.line(
+                self.image,
+                (start_x + across[0] * shift, start_y + across[1] * shift),
+                (stop_x + across[0] * shift, stop_y + across[1] * shift),
+                self.to_bgr(color),
+                1,
+            )
+
+    ####################################################################
+
+    def rect(self, color, rect):
+        """ Draw a filled rectangle
+            Args:
+                color(tuple)   : RGB color
+                rect(tuple)    : (x, y, width, length) of the rectangle in pixels
+        """
+        x, y, width, length = (int(value) for value in rect)
+        self.image[max(y, 0) : max(y + length, 0), max(x, 0) : max(x + width, 0)] = self.to_bgr(color)
+
+    ####################################################################
+
+    def to_array(self):
+        """ Frame as a BGR array ( see SubImage.convert_surface_3darray ). It is the canvas itself,
+            so it is only valid until the next draw
+            Returns:
+                numpy         : (length, width, 3) BGR image
+        """
+        return self.image
+
+    ####################################################################
+
+    def flip(self):
+        """ There is no display to update """
+
+    ####################################################################
+
+    def update(self):
+        """ There is no display to update """
+
+    ####################################################################
+
+    def quit_requested(self):
+        """ There is no display to close
+            Returns:
+                bool          : Always False
+        """
+        return False
+
+    ####################################################################
+
+    def close(self):
+        """ Nothing to release """
+
+
+#####################################################################
+
+
+class Pygame_Canvas(object):
+    """ Frame held in the pygame display surface """
+
+    renders_camera_view = False  # The whole frame is drawn, the camera view is cropped from it
+
+    def __init__(self, width, length):
+        """ Initializes pygame and the display with
+            Args:
+                width(int)   : Width of the frame in pixels
+                length(int)  : Length of the frame in pixels
+        """
+        pygame.init()
+        pygame.display.set_caption("Stop and Go")
+        self.surface = pygame.display.set_mode((width, length))
+
+    ####################################################################
+
+    def fill(self, color):
+        """ Fill the whole frame with the color
+            Args:
+                color(tuple)  : RGB color
+        """
+        self.surface.fill(color)
+
+    ####################################################################
+
+    def polygon(self, color, points):
+        """ Draw a filled polygon
+            Args:
+                color(tuple)   : RGB color
+                points(list)   : (x, y) vertices in pixels
+        """
+        pygame.draw.polygon(self.surface, color, points, 0)
+
+    ####################################################################
+
+    def line(self, color, start, stop, width):
+        """ Draw a line
+            Args:
+                color(tuple)   : RGB color
+                start(tuple)   : (x, y) start of the line in pixels
+                stop(tuple)    : (x, y) end of the line in pixels
+                width(int)     : Width of the line in pixels
+        """
+        pygame.draw.line(self.surface, color, start, stop, width)
+
+    ####################################################################
+
+    def rect(self, color, rect):
+        """ Draw a filled rectangle
+            Args:
+                color(tuple)   : RGB color
+                rect(tuple)    : (x, y, width, length) of the rectangle in pixels
+        """
+        pygame.draw.rect(self.surface, color, rect)
+
+    ####################################################################
+
+    def to_array(self):
+        """ Copy the surface into a BGR array
+            Returns:
+                numpy         : (length, width, 3) BGR image
+        """
+        window_arr = pygame.surfarray.array3d(self.surface)
+        # Swap height width
+        window_arr = window_arr.swapaxes(0, 1)
+
+        # Convert to BGR
+        return window_arr[:, :, ::-1]
+
+    ####################################################################
+
+    def flip(self):
+        """ Update the full display """
+        pygame.display.flip()
+
+    ####################################################################
+
+    def update(self):
+        """ Update the display """
+        pygame.display.update()
+
+    ####################################################################
+
+    def quit_requested(self):
+        """ Check the pygame events for the window being closed
+            Returns:
+                bool          : True if the window is closed
+        """
+        return any(event.type == pygame.QUIT for event in pygame.event.get())
+
+    ####################################################################
+
+    def close(self):
+        """ Quit pygame """
+        pygame.quit()
+
+
+#####################################################################
+
+
+class Viewport_Canvas(Numpy_Canvas):
+    """ Camera view of the frame at camera resolution. Each primitive is moved into the camera view
+        ( the translation of SubImage.create_subimage and the rotation of RotateImage.get_rotated_image ),
+        culled if it is out of the view and rasterized straight into the camera view image. The frame
+        is never drawn in full, so there is nothing to crop or resample.
+    """
+
+    renders_camera_view = True
+    sub_pixel_bits = 4  # Fixed point precision of the moved vertices
+    margin = 16  # Pixels drawn around the view, OpenCV rasterizes the polygons differently along the clipped edges
+
+    def __init__(self, width, length, view_width=sg.SUB_IMAGE_WIDTH, view_length=sg.SUB_IMAGE_LENGTH):
+        """ Initializes the canvas with
+            Args:
+                width(int)        : Width of the frame in pixels
+                length(int)       : Length of the frame in pixels
+                view_width(int)   : Width of the camera view in pixels
+                view_length(int)  : Length of the camera view in pixels
+        """
+        super().__init__(view_width + 2 * self.margin, view_length + 2 * self.margin)
+        self.width = width
+        self.length = length
+        self.view_width = view_width
+        self.view_length = view_length
+        self.mapping = None
+        self.rotated = False
+        self.outside_frame = None
+        self.set_view(width / 2, length / 2)
+
+    ####################################################################
+
+    def set_view(self, camera_pos_x, camera_pos_y, rotation_degree=None):
+        """ Set the camera view the primitives are drawn into
+            Args:
+                camera_pos_x(float)     : x position of the camera in the frame
+                camera_pos_y(float)     : y position of the camera in the frame
+                rotation_degree(float)  : Rotation of the view ( see RotateImage.get_rotation_degree ),
+                                          no rotation if None
+        """
+        # Same integer pixel offset as the crop of the frame
+        offset_x = int(camera_pos_x - self.view_width / 2)
+        offset_y = int(camera_pos_y - self.view_length / 2)
+        mapping = np.array([[1.0, 0.0, -offset_x], [0.0, 1.0, -offset_y], [0.0, 0.0, 1.0]])
+        self.rotated = rotation_degree is not None
+        if self.rotated:
+            rotation = cv2.getRotationMatrix2D((self.view_width / 2, self.view_length / 2), rotation_degree, 1)
+            mapping = np.vstack([rotation, [0.0, 0.0, 1.0]]) @ mapping
+        self.mapping = mapping[:2] + [[0.0, 0.0, self.margin], [0.0, 0.0, self.margin]]
+
+        # The view is black outside the frame, like the crop of the frame. After a rotation it is also black
+        # outside the rotated crop
+        visible_start = (max(offset_x, 0), max(offset_y, 0))
+        visible_end = (
+            min(offset_x + self.view_width, self.width) - 1,
+            min(offset_y + self.view_length, self.length) - 1,
+        )
+        inside = np.zeros(self.image.shape[:2], dtype=np.uint8)
+        if visible_end[0] >= visible_start[0] and visible_end[1] >= visible_start[1]:
+            self.fill_pixels(
+                inside,
+                1,
+                [
+                    (visible_start[0], visible_start[1]),
+                    (visible_end[0], visible_start[1]),
+                    (visible_end[0], visible_end[1]),
+                    (visible_start[0], visible_end[1]),
+                ],
+            )
+        self.outside_frame = None if inside.all() else inside == 0
+
+    ####################################################################
+
+    def move_points(self, points):
+        """ Move the frame points into the camera view
+            Args:
+                points(numpy)  : (x, y) points in the frame
+            Returns:
+                numpy          : (x, y) points in the camera view
+        """
+        return points @ self.mapping[:, :2].T + self.mapping[:, 2]
+
+    ####################################################################
+
+    def fill_pixels(self, image, color, points):
+        """ Fill the pixels the polygon covers in the frame into the camera view image. Without
+            a rotation the polygon is only shifted by whole pixels and rasterized as in the frame,
+            a rotated polygon is rasterized with sub pixel vertices.
+            Args:
+                image(numpy)   : Camera view image
+                color(tuple)   : Color in the layout of the image
+                points(list)   : (x, y) integer vertices of the polygon in the frame
+        """
+        vertices = self.move_points(np.asarray(points, dtype=np.float64))
+
+        # Cull the polygons out of the camera view
+        if (
+            (vertices[:, 0].max() < -1)
+            or (vertices[:, 1].max() < -1)
+            or (vertices[:, 0].min() > self.image.shape[1])
+            or (vertices[:, 1].min() > self.image.shape[0])
+        ):
+            return
+
+        if not self.rotated:
+            cv2.fillPoly(image, [np.round(vertices).astype(np.int32)], color)
+            return
+
+        fixed_point = np.round(vertices * (1 << self.sub_pixel_bits)).astype(np.int32)
+        cv2.fillPoly(image, [fixed_point], color, shift=self.sub_pixel_bits)
+
+    ####################################################################
+
+    def polygon(self, color, points):
+        """ Draw a filled polygon
+            Args:
+                color(tuple)   : RGB color
+                points(list)   : (x, y) vertices in pixels of the frame
+        """
+        # Same truncation of the vertices as pygame
+        self.fill_pixels(self.image, self.to_bgr(color), np.floor(np.asarray(points, dtype=np.float64)))
+
+    ####################################################################
+
+    def line(self, color, start, stop, width):
+        """ Draw a line as the band of pixels Numpy_Canvas.line covers
+            Args:
+                color(tuple)   : RGB color
+                start(tuple)   : (x, y) start of the line in pixels of the frame
+                stop(tuple)    : (x, y) end of the line in pixels of the frame
+                width(int)     : Width of the line in pixels
+        """
+        start_x, start_y, stop_x, stop_y = (int(np.floor(value)) for value in (*start, *stop))
+        across = (0, 1) if abs(stop_x - start_x) >= abs(stop_y - start_y) else (1, 0)
+        first = -((int(width) - 1) // 2)
+        last = first + max(int(width), 1) - 1
+        self.fill_pixels(
+            self.image,
+            self.to_bgr(color),
+            [
+                (start_x + across[0] * first, start_y + across[1] * first),
+                (stop_x + across[0] * first, stop_y + across[1] * first),
+                (stop_x + across[0] * last, stop_y + across[1] * last),
+                (start_x + across[0] * last, start_y + across[1] * last),
+            ],
+        )
+
+    ####################################################################
+
+    def rect(self, color, rect):
+        """ Draw a filled rectangle
+            Args:
+                color(tuple)   : RGB color
+                rect(tuple)    : (x, y, width, length) of the rectangle in pixels of the frame
+        """
+        x, y, width, length = (int(value) for value in rect)
+        if width <= 0 or length <= 0:
+            return
+        self.fill_pixels(
+            self.image,
+            self.to_bgr(color),
+            [(x, y), (x + width - 1, y), (x + width - 1, y + length - 1), (x, y + length - 1)],
+        )
+
+    ####################################################################
+
+    def to_array(self):
+        """ Camera view as a BGR array. It is the canvas itself, so it is only valid until the next draw
+            Returns:
+                numpy         : (view_length, view_width, 3) BGR image
+        """
+        if self.outside_frame is not None:
+            self.image[self.outside_frame] = 0
+        return self.image[self.margin : self.margin + self.view_length, self.margin : self.margin + self.view_width]
+
+
+#####################################################################
+
+
+def create_canvas(width=sg.WINDOW_WIDTH_PIXELS, length=sg.WINDOW_LENGTH_PIXELS):
+    """ Create the canvas of the configured RENDER_BACKEND
+        Args:
+            width(int)   : Width of the frame in pixels
+            length(int)  : Length of the frame in pixels
+        Returns:
+            object       : Numpy_Canvas, Viewport_Canvas or Pygame_Canvas
+        Raises:
+            ImportError  : If the pygame backend is configured without pygame installed
+            ValueError   : If the backend is unknown
+    """
+    if sg.RENDER_BACKEND == sg.RENDER_BACKEND_NUMPY:
+        return Numpy_Canvas(width, length)
+
+    if sg.RENDER_BACKEND == sg.RENDER_BACKEND_VIEWPORT:
+        return Viewport_Canvas(width, length)
+
+    if sg.RENDER_BACKEND == sg.RENDER_BACKEND_PYGAME:
+        if pygame is None:
+            raise ImportError("pygame isn't installed, set RENDER_BACKEND = RENDER_BACKEND_NUMPY")
+        return Pygame_Canvas(width, length)
+
+    raise ValueError("Unknown RENDER_BACKEND {}".format(sg.RENDER_BACKEND))
+
+
+#####################################################################
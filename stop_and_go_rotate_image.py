@@ -40,15 +40,9 @@ class RotateImage(object):
                 numpy                   : Returns the rotated window image
                 numpy                   : Returns the rotated masked image
         """
-        # Rotation of images
-        pi_angle = 180
-
-        heading_ang_degree = self.heading_ang_rad * pi_angle / math.pi
-
-        if self.car_list[sg.REFERENCE_CAR_SEQ - 1].sim.turn != CarTurn.NO.value:
-            if self.car_list[sg.REFERENCE_CAR_SEQ - 1].sim.turn == CarTurn.LEFT.value:
-                heading_ang_degree = -heading_ang_degree
+        heading_ang_degree = self.get_rotation_degree()
 
+        if heading_ang_degree is not None:
             # Get the rotated subimage
             rotated_subimage = self.get_rotated_image(sub_window_image, heading_ang_degree)
             # Get the rotated sub mask image
@@ -65,6 +59,25 @@ class RotateImage(object):
 
     ##############################################################
 
+    def get_rotation_degree(self):
+        """ Get the angle the camera view images are rotated with
+            Returns:
+                float  : Angle in degree, None if the reference car doesn't turn
+        """
+        # Rotation of images
+        pi_angle = 180
+
+        if self.car_list[sg.REFERENCE_CAR_SEQ - 1].sim.turn == CarTurn.NO.value:
+            return None
+
+        heading_ang_degree = self.heading_ang_rad * pi_angle / math.pi
+        if self.car_list[sg.REFERENCE_CAR_SEQ - 1].sim.turn == CarTurn.LEFT.value:
+            heading_ang_degree = -heading_ang_degree
+
+        return heading_ang_degree
+
+    ##############################################################
+
     def save_rotated_positions(self, cur_time, trans_from_main_to_sub):
         """ Save the rotated positions of the cars and paths
             Args:
@@ -0,0 +1,233 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : Samplers for the simulation parameters. Values are drawn
+#               from the Gaussian distributions truncated to the bounds
+#               configured in stop_and_go_config.yml
+#####################################################################
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_data_type import CarTurn
+
+#####################################################################
+
+# Parameters sampled for each car
+SIM_PARAM_NAMES = (
+    "accl_after_stop_mpss",
+    "decel_before_stop_mpss",
+    "speed_before_stop_mps",
+    "speed_after_stop_mps",
+    "turn",
+)
+
+MAX_OVERSAMPLE = 1024  # Maximum number of candidates drawn at once for each value
+
+#####################################################################
+
+
+def experiment_rng(base_seed, exp_no):
+    """ Random number generator of the experiment. It is the generator of the exp_no-th child of
+        SeedSequence(base_seed).spawn(), so each experiment has its own stream whatever the order
+        in which the experiments are generated.
+        Args:
+            base_seed(int)  : Seed of the run
+            exp_no(int)     : Experiment number
+        Returns:
+            object          : np.random.Generator of the experiment
+    """
+    return np.random.default_rng(np.random.SeedSequence(base_seed, spawn_key=(exp_no,)))
+
+
+#####################################################################
+
+
+def random_state(rng=None):
+    """ Source of the random draws, the global np.random state if rng is None
+        Args:
+            rng(object)     : np.random.Generator or None
+        Returns:
+            object          : Object with the normal and uniform draws
+    """
+    return np.random if rng is None else rng
+
+
+#####################################################################
+
+
+def random_integers(low, high, size=None, rng=None):
+    """ Uniform integers in [low, high)
+        Args:
+            low(int)            : Lowest integer
+            high(int)           : One above the highest integer
+            size(int or tuple)  : Output shape
+            rng(object)         : np.random.Generator, the global np.random state is used if None
+        Returns:
+            int or numpy        : Sampled integers
+    """
+    if rng is None:
+        return np.random.randint(low, high, size)
+
+    return rng.integers(low, high, size)
+
+
+#####################################################################
+
+
+def truncated_normal(mean, dev, low=-np.inf, high=np.inf, size=None, max_retries=20, rng=None):
+    """ Sample from the Gaussian distribution truncated to the open interval (low, high).
+        Candidates are drawn for all the values at once and the number of candidates
+        drawn for the values not accepted yet is doubled on every retry.
+        Args:
+            mean(float or numpy)  : Mean of the distribution
+            dev(float or numpy)   : Standard deviation of the distribution
+            low(float or numpy)   : Lower bound ( exclusive )
+            high(float or numpy)  : Upper bound ( exclusive )
+            size(int or tuple)    : Output shape, defaults to the broadcast shape of the arguments
+            max_retries(int)      : Maximum number of draws before giving up
+            rng(object)           : np.random.Generator, the global np.random state is used if None
+        Returns:
+            numpy                 : Sampled values
+        Raises:
+            ValueError            : If the bounds are empty or no value is accepted within max_retries
+    """
+    if size is None:
+        size = np.broadcast(mean, dev, low, high).shape
+
+    mean, dev, low, high = (np.broadcast_to(arg, size).ravel() for arg in (mean, dev, low, high))
+    if np.any(low >= high):
+        raise ValueError("Empty sampling interval ({}, {})".format(low[low >= high][0], high[low >= high][0]))
+
+    random = random_state(rng)
+    values = np.empty(mean.shape)
+    pending = np.arange(mean.size)
+    oversample = 1
+
+    for _ in range(max_retries):
+        if pending.size == 0:
+            break
+
+        draws = random.normal(mean[pending], dev[pending], (oversample, pending.size))
+        accepted = (draws > low[pending]) & (draws < high[pending])
+        found = accepted.any(axis=0)
+        first = accepted.argmax(axis=0)
+
+        values[pending[found]] = draws[first[found], np.flatnonzero(found)]
+        pending = pending[~found]
+        oversample = min(2 * oversample, MAX_OVERSAMPLE)
+
+    if pending.size:
+        raise ValueError(
+            "No value accepted in ({}, {}) for mean {} and dev {} after {} retries".format(
+                low[pending[0]], high[pending[0]], mean[pending[0]], dev[pending[0]], max_retries
+            )
+        )
+
+    return values.reshape(size)
+
+
+#####################################################################
+
+
+class Sim_Param_Sampler(object):
+    """ Samples the simulation parameters of the cars with the distributions of the
+        car sections and the bounds of the sampler section of the config
+    """
+
+    def __init__(self, config_manager, rng=None):
+        """ Initializes the sampler with
+            Args:
+                config_manager(object)   : Config_manager object
+                rng(object)              : np.random.Generator of the experiment. The global
+                                           np.random state is used if None
+        """
+        self.config_manager = config_manager
+        self.rng = rng
+
+        bounds = config_manager.config_params["sampler"]
+        self.max_retries = int(bounds["max_retries"])
+        self.accl_after_stop_min = float(bounds["accl_after_stop_min_mpss"])
+        self.accl_after_stop_max = float(bounds["accl_after_stop_max_mpss"])
+        self.decl_before_stop_min = float(bounds["decl_before_stop_min_mpss"])
+        self.decl_before_stop_max = float(bounds["decl_before_stop_max_mpss"])
+        self.speed_min = float(bounds["speed_min_mps"])
+        self.time_stopped_min = float(bounds["time_stopped_min_s"])
+
+    #####################################################################
+
+    def sample_car_params(self, seq_no, size):
+        """ Sample the simulation parameters of the car for size experiments.
+            Decel and speed before the stop are drawn again where the car can't
+            come to the stop within dist_before_stop_m.
+            Args:
+                seq_no(int)           : Sequence number of the car
+                size(int)             : Number of samples
+            Returns:
+                dictionary            : Maps each name of SIM_PARAM_NAMES to the sampled values
+        """
+        car_params = self.config_manager.config_params["car" + str(seq_no)]
+        dist_before_stop = float(car_params["dist_before_stop_m"])
+
+        accl = self.sample(car_params, "accl_after_stop", self.accl_after_stop_min, self.accl_after_stop_max, size)
+        speed_after = self.sample(car_params, "speed_after_stop", self.speed_min, np.inf, size, "mps")
+
+        decel = np.empty(size)
+        speed_before = np.empty(size)
+        too_fast = np.ones(size, dtype=bool)
+        for _ in range(self.max_retries):
+            num_too_fast = int(too_fast.sum())
+            if num_too_fast == 0:
+                break
+
+            decel[too_fast] = self.sample(
+                car_params, "decl_before_stop", self.decl_before_stop_min, self.decl_before_stop_max, num_too_fast
+            )
+            speed_before[too_fast] = self.sample(
+                car_params, "speed_before_stop", self.speed_min, np.inf, num_too_fast, "mps"
+            )
+            too_fast = -(speed_before * speed_before) / (2 * decel) > dist_before_stop
+
+        if np.any(too_fast):
+            raise ValueError(
+                "Car{} can't come to the stop within {} m after {} retries".format(
+                    seq_no, dist_before_stop, self.max_retries
+                )
+            )
+
+        # Turn is uniform over ( 0 = No Turn, 1 = Left Turn, 2 = Right Turn )
+        turn = random_integers(CarTurn.NO.value, CarTurn.RIGHT.value + 1, size, self.rng)
+
+        return dict(zip(SIM_PARAM_NAMES, (accl, decel, speed_before, speed_after, turn)))
+
+    #####################################################################
+
+    def sample(self, car_params, name, low, high, size, unit="mpss"):
+        """ Sample the car parameter from its truncated Gaussian distribution
+            Args:
+                car_params(dictionary) : Config section of the car
+                name(str)              : Name of the parameter in the config ( without _mean / _dev )
+                low(float)             : Lower bound
+                high(float)            : Upper bound
+                size(int)              : Number of samples
+                unit(str)              : Unit suffix of the config keys
+            Returns:
+                numpy                  : Sampled values
+        """
+        mean = float(car_params[name + "_mean_" + unit])
+        dev = float(car_params[name + "_dev_" + unit])
+
+        return truncated_normal(mean, dev, low, high, size, self.max_retries, self.rng)
+
+    #####################################################################
+
+    def sample_time_stopped(self, size):
+        """ Sample the time stopped at the stop sign
+            Args:
+                size(int)       : Number of samples
+            Returns:
+                numpy           : Sampled stop times in seconds
+        """
+        return truncated_normal(
+            sg.MEAN_STOPPED_TIME, sg.STD_STOPPED_TIME, self.time_stopped_min, np.inf, size, self.max_retries, self.rng
+        )
+
+
+#####################################################################
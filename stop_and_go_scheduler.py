@@ -0,0 +1,94 @@
+#####################################################################
+# Uber, Inc. (c) 2020
+# Description : Event driven scheduler. The ticks in which no car
+#               interacts with the intersection are advanced in bulk up
+#               to the next arrival at the middle intersection
+#####################################################################
+
+#####################################################################
+
+
+class Event_Scheduler(object):
+    """ Advance the simulation from event to event. While every car is on its own path
+        ( no car at the middle intersection, turning, stopped or waiting in the priority
+        queue ) the cars follow their simulations and the world jumps to the next arrival
+        at the middle intersection. Around the arrivals the intersection rules resolve the
+        priority queue and the right of way tick by tick.
+    """
+
+    def __init__(self, intersection_rule, world_state):
+        """ Initializes the scheduler with
+            Args:
+                intersection_rule(object) : Intersection_Rule of the experiment
+                world_state(object)       : World_State the cars are bound to
+        """
+        self.intersection_rule = intersection_rule
+        self.world_state = world_state
+        self.event_ticks = 0  # Ticks stepped through the intersection rules
+        self.free_ticks = 0  # Ticks advanced in bulk
+
+    #####################################################################
+
+    def is_free_flight(self, car_list):
+        """ Check that no car interacts with the intersection rules
+            Args:
+                car_list(list)  : Car objects bound to the world
+            Returns:
+                bool            : True if every car follows its own simulation
+        """
+        if not self.intersection_rule.is_clear():
+            return False
+
+        for car in car_list:
+            if car.sim_state.end:
+                continue
+            if car.sim_state.stop_car or car.Turn_Status.turning or car.dynamic_state.set_speed or car.stop_timer != 0:
+                return False
+
+        return True
+
+    #####################################################################
+
+    def step(self, car_list, path_list, sprite_mid):
+        """ Advance all the cars by one tick through the intersection rules
+            Args:
+                car_list(list)      : Car objects bound to the world
+                path_list(list)     : List of path objects
+                sprite_mid(object)  : Intersection object
+        """
+        self.intersection_rule.update_cars_through_intersection(car_list, sprite_mid, self.world_state)
+        self.world_state.step(car_list, path_list, sprite_mid)
+        self.event_ticks += 1
+
+    #####################################################################
+
+    def advance(self, car_list, path_list, sprite_mid, num_ticks):
+        """ Advance the simulation by up to num_ticks ticks. It stops early after the tick
+            in which all the cars reach the end.
+            Args:
+                car_list(list)      : Car objects bound to the world
+                path_list(list)     : List of path objects
+                sprite_mid(object)  : Intersection object
+                num_ticks(int)      : Number of ticks to advance
+            Returns:
+                int                 : Number of ticks advanced
+        """
+        advanced = 0
+        while advanced < num_ticks:
+            free_ticks = 0
+            if self.is_free_flight(car_list):
+                free_ticks = self.world_state.advance_free_flight(car_list, sprite_mid, num_ticks - advanced)
+                self.free_ticks += free_ticks
+
+            if free_ticks == 0:
+                self.step(car_list, path_list, sprite_mid)
+                free_ticks = 1
+
+            advanced += free_ticks
+            if all(car.sim_state.end for car in car_list):
+                break
+
+        return advanced
+
+
+#####################################################################
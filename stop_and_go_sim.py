@@ -8,6 +8,8 @@ import numpy as np
 import stop_and_go_globals as sg
 import yaml
 from stop_and_go_data_type import CarState, CarTurn
+from stop_and_go_motion_profile import Motion_Profile
+from stop_and_go_sampler import Sim_Param_Sampler
 
 #####################################################################
 
@@ -24,12 +26,18 @@ class Sim(object):
         Phase-5 : Cruise After ( Car cruises with constant velocity after )
     """
 
-    def __init__(self, config_manager, seq_no, time_stopped):
+    def __init__(self, config_manager, seq_no, time_stopped, sim_params=None, profile_cache=None, rng=None):
         """ Initializes the Sim class with
             Args:
                 config_manager(object)   : Config_manager object
                 seq_no(int)              : Set the sequence number of the car object
                 time_stopped             : Stop time for the car at the intersection
+                sim_params(dictionary)   : Pre-sampled simulation parameters ( see stop_and_go_sampler ).
+                                           Parameters are sampled from the config if it is None
+                profile_cache(object)    : Profile_Cache shared by the Sim objects, the parameters are
+                                           quantized and the profile is reused on a hit. Disabled if None
+                rng(object)              : np.random.Generator the parameters are sampled with. The global
+                                           np.random state is used if None
         """
         self.dist_before_stop_m = 0.0
         self.dist_cruise_before_m = 0.0
@@ -40,18 +48,28 @@ class Sim(object):
         self.speed_after_stop_mps = 0.0
         self.time_stopped_s = time_stopped
         self.sim_time_increment_s = float(config_manager.config_params["car"]["sim_time_increment_s"])
-        self.sim_motion_state_dict = {}
         self.current_dict_time_s = 0.0
         self.current_dict_dist = 0.0
         self.resolution = float(config_manager.config_params["car"]["resolution_pixel_meter"])
         self.seq_no = seq_no
-        self.v = []
-        self.t = []
         self.config_manager = config_manager
         self.turn = CarTurn.NO.value
         self.turn_no = {}
         self.cruise_after_time = 0.0
-        self.last_key = 0
+        self.sim_params = sim_params
+        self.profile_cache = profile_cache
+        self.rng = rng
+
+        # Motion state columns indexed by the integer tick ( tick = time / sim_time_increment_s )
+        self.tick_state = np.empty(0, dtype=np.int8)  # CarState value at each tick
+        self.tick_delta_dist = np.empty(0)  # Distance (pixels) travelled during the tick
+        self.tick_total_dist = np.empty(0)  # Cumulative distance (pixels) at the tick
+        self.tick_speed = np.empty(0)  # Speed (m/s) at the tick
+        self.tick_accl = np.empty(0)  # Acceleration (m/s^2) at the tick
+        self.num_ticks = 0  # Number of generated ticks
+        self._phase_columns = []  # Columns of each phase collected while the phases are being generated
+        self._num_phase_ticks = 0  # Number of ticks generated so far
+        self.motion_profile = None  # Analytic profile of the car's motion ( Motion_Profile )
 
         self.populate_turn_no()
         self.generate_simulation_data()
@@ -69,44 +87,192 @@ class Sim(object):
         """ Generate the simulation data based on different phases in sim """
         print("Generating the simulation Data for AV# ", self.seq_no)
 
-        # Make sure total_dist_after_const_speed is less than the dist_before_stop
-        total_dist_after_const_speed = self.dist_before_stop_m + 1
-
-        while total_dist_after_const_speed > self.dist_before_stop_m:
-            # First Generate the Simulation parameters
+        if self.sim_params is not None:
+            # Parameters are already sampled by the batch generator
+            self.load_sim_param(self.sim_params)
+        else:
             self.generate_sim_param()
 
-            total_dist_after_const_speed = -(self.speed_before_stop_mps * self.speed_before_stop_mps) / (
-                2 * self.decel_before_stop_mpss
-            )
+        cache_key = None
+        if self.profile_cache is not None:
+            cache_key = self.profile_cache.quantize_sim(self)
+            profile = self.profile_cache.get(cache_key)
+            if profile is not None:
+                self.load_profile(profile)
+                return
 
-            self.dist_cruise_before_m = self.dist_before_stop_m - total_dist_after_const_speed
+        self.dist_cruise_before_m = self.dist_before_stop_m - self.decel_dist()
+        self.motion_profile = Motion_Profile.from_sim(self)
 
+        self.current_dict_dist = 0.0
+        self._phase_columns = []
+        self._num_phase_ticks = 0
         self.update_cruise_before()
         self.update_decel_before_stop()
         self.update_stopped_time()
         self.update_accel_after_stop()
         self.update_cruise_after()
         self.update_past_sim()
+        self.build_tick_columns()
+
+        if cache_key is not None:
+            self.profile_cache.put(cache_key, self.get_profile())
+
+    ##############################################################################
+
+    def get_profile(self):
+        """ Generated profile of the car to share through the Profile_Cache
+            Returns:
+                dictionary     : Motion state columns and the values derived while generating the phases
+        """
+        return {
+            "columns": (self.tick_state, self.tick_delta_dist, self.tick_total_dist, self.tick_speed, self.tick_accl),
+            "motion_profile": self.motion_profile,
+            "dist_cruise_before_m": self.dist_cruise_before_m,
+            "cruise_after_time": self.cruise_after_time,
+            "current_dict_time_s": self.current_dict_time_s,
+            "current_dict_dist": self.current_dict_dist,
+        }
+
+    ##############################################################################
+
+    def load_profile(self, profile):
+        """ Use the profile generated by another Sim object with the same quantized parameters.
+            The columns are shared and must not be modified in place.
+            Args:
+                profile(dictionary) : Profile from get_profile
+        """
+        columns = profile["columns"]
+        self.tick_state, self.tick_delta_dist, self.tick_total_dist, self.tick_speed, self.tick_accl = columns
+        self.num_ticks = len(self.tick_state)
+        self.motion_profile = profile["motion_profile"]
+        self.dist_cruise_before_m = profile["dist_cruise_before_m"]
+        self.cruise_after_time = profile["cruise_after_time"]
+        self.current_dict_time_s = profile["current_dict_time_s"]
+        self.current_dict_dist = profile["current_dict_dist"]
+
+    ##############################################################################
+
+    def decel_dist(self):
+        """ Distance (meters) needed to come to the stop from speed_before_stop_mps """
+        return -(self.speed_before_stop_mps * self.speed_before_stop_mps) / (2 * self.decel_before_stop_mpss)
+
+    ##############################################################################
+
+    def load_sim_param(self, sim_params):
+        """ Set the pre-sampled simulation parameters and read the distances from the config
+            Args:
+                sim_params(dictionary) : Maps each name of SIM_PARAM_NAMES ( stop_and_go_sampler ) to its value
+        """
+        car = "car" + str(self.seq_no)
+        self.dist_before_stop_m = float(self.config_manager.config_params[car]["dist_before_stop_m"])
+        self.dist_after_stop_m = float(self.config_manager.config_params[car]["dist_after_stop_m"])
+        self.accl_after_stop_mpss = float(sim_params["accl_after_stop_mpss"])
+        self.decel_before_stop_mpss = float(sim_params["decel_before_stop_mpss"])
+        self.speed_before_stop_mps = float(sim_params["speed_before_stop_mps"])
+        self.speed_after_stop_mps = float(sim_params["speed_after_stop_mps"])
+        self.turn = int(sim_params["turn"])
+
+    ##############################################################################
+
+    def build_tick_columns(self):
+        """ Concatenate the generated phases into the contiguous motion state columns """
+        if self._phase_columns:
+            columns = [np.concatenate(column) for column in zip(*self._phase_columns)]
+        else:
+            columns = [np.empty(0, dtype=np.int8)] + [np.empty(0) for _ in range(4)]
+
+        self.tick_state, self.tick_delta_dist, self.tick_total_dist, self.tick_speed, self.tick_accl = columns
+        self.num_ticks = len(self.tick_state)
+        self._phase_columns = []
+        self._num_phase_ticks = 0
+
+    ##############################################################################
+
+    def _append_phase(self, state, delta_dist, total_dist, speed, accl):
+        """ Append the motion state columns of one phase. Distances are in meters
+            and get converted to pixels here.
+            Args:
+                state(int)               : CarState value of the phase
+                delta_dist(numpy)        : Distance travelled during each tick of the phase
+                total_dist(numpy)        : Cumulative distance at each tick of the phase
+                speed(numpy or float)    : Speed at each tick of the phase
+                accl(float)              : Acceleration during the phase
+        """
+        num_ticks = len(total_dist)
+        if num_ticks == 0:
+            return
+
+        self._phase_columns.append(
+            (
+                np.full(num_ticks, state, dtype=np.int8),
+                np.round(delta_dist * self.resolution, 4),
+                np.round(total_dist * self.resolution, 4),
+                np.broadcast_to(np.round(speed, 4), (num_ticks,)).astype(np.float64),
+                np.full(num_ticks, round(accl, 4), dtype=np.float64),
+            )
+        )
+        self._num_phase_ticks += num_ticks
+
+    ##############################################################################
+
+    def _accumulate_dist(self, delta_dist):
+        """ Cumulative distance after each tick, continuing from current_dict_dist
+            Args:
+                delta_dist(numpy)  : Distance travelled during each tick
+            Returns:
+                numpy              : Cumulative distance at each tick
+        """
+        total_dist = np.cumsum(np.concatenate(([self.current_dict_dist], delta_dist)))[1:]
+        if len(total_dist):
+            self.current_dict_dist = total_dist[-1]
+
+        return total_dist
+
+    ##############################################################################
+
+    def _next_phase_times(self, last_time_key):
+        """ Tick times of the next phase, from the tick after last_time_key up to current_dict_time_s """
+        return np.arange(last_time_key + self.sim_time_increment_s, self.current_dict_time_s, self.sim_time_increment_s)
+
+    ##############################################################################
+
+    def time_to_tick(self, time_s):
+        """ Convert the simulation time into the integer tick
+            Args:
+                time_s(float)  : Simulation time in seconds
+            Returns:
+                int            : Tick index into the motion state columns
+        """
+        return int(round(time_s / self.sim_time_increment_s))
+
+    ##############################################################################
+
+    def is_valid_tick(self, tick):
+        """ Check if the tick has the motion state generated for it
+            Args:
+                tick(int)      : Tick index into the motion state columns
+            Returns:
+                bool           : Returns true if the tick is inside the generated columns
+        """
+        return 0 <= tick < self.num_ticks
+
+    ##############################################################################
+
+    def _last_tick_time(self):
+        """ Time of the last generated tick while the phases are being populated """
+        return round((self._num_phase_ticks - 1) * self.sim_time_increment_s, 2)
 
     ##############################################################################
 
     def plot_av_position_time(self):
         """ Plot the position time graph to have an idea of phases """
         # x-axis Value
-        x = sorted(self.sim_motion_state_dict.keys())
+        max_tick = min(self.num_ticks, self.time_to_tick(20) + 1)
+        x1 = np.arange(max_tick) * self.sim_time_increment_s
 
         # Corresponding Y-axis value
-        y = []
-        x1 = []
-        prev_y = 0.0
-        for x_index in x:
-            if x_index > 20:
-                break
-            x1.append(x_index)
-            cur_y = self.sim_motion_state_dict[x_index][2] + prev_y
-            prev_y += self.sim_motion_state_dict[x_index][2]
-            y.append(cur_y)
+        y = np.cumsum(self.tick_delta_dist[:max_tick])
 
         print(" Print data points ")
         print(" y = ", y)
@@ -133,210 +299,106 @@ class Sim(object):
     ##########################################################################
 
     def update_cruise_before(self):
-        """ Populate the map for the cruise before phase """
+        """ Populate the columns for the cruise before phase """
         cruise_time = self.dist_cruise_before_m / self.speed_before_stop_mps
         self.current_dict_time_s = 0
         self.current_dict_time_s += cruise_time
-        prev_dist = 0.0
-
-        for time_step in np.arange(0.0, self.current_dict_time_s, self.sim_time_increment_s):
-            round_time_step = round(time_step, 1)
-            cur_dist = self.speed_before_stop_mps * time_step
-
-            self.current_dict_dist += cur_dist - prev_dist
 
-            # Update the dctionary for the motion state
-            self.sim_motion_state_dict[round_time_step] = [
-                round_time_step,
-                CarState.CRUISE.value,
-                round((cur_dist - prev_dist) * self.resolution, 4),
-                round(self.current_dict_dist * self.resolution, 4),
-                round(self.speed_before_stop_mps, 4),
-                0,
-            ]
+        time_steps = np.arange(0.0, self.current_dict_time_s, self.sim_time_increment_s)
+        delta_dist = np.diff(self.speed_before_stop_mps * time_steps, prepend=0.0)
+        total_dist = self._accumulate_dist(delta_dist)
 
-            # Update prev_dist
-            prev_dist = cur_dist
-
-            # For velocity plot
-            self.v.append(self.speed_before_stop_mps)
-            self.t.append(round_time_step)
-            self.last_time_key = time_step
+        self._append_phase(CarState.CRUISE.value, delta_dist, total_dist, self.speed_before_stop_mps, 0)
 
     ##########################################################################
 
     def update_decel_before_stop(self):
-        """ Populate the map for the deceleration before the stop line phase """
+        """ Populate the columns for the deceleration before the stop line phase """
         # Total deceleration time
         decel_time = -(self.speed_before_stop_mps / self.decel_before_stop_mpss)
 
-        last_time_key = round(sorted(self.sim_motion_state_dict.keys())[-1], 2)
+        last_time_key = self._last_tick_time()
 
         # Update the total decel time
         self.current_dict_time_s += decel_time
 
-        prev_dist = 0.0
+        time_steps = self._next_phase_times(last_time_key) - last_time_key
+        cur_dist = self.speed_before_stop_mps * time_steps + 0.5 * self.decel_before_stop_mpss * time_steps * time_steps
+        delta_dist = np.diff(cur_dist, prepend=0.0)
+        total_dist = self._accumulate_dist(delta_dist)
+        speed = np.maximum(self.speed_before_stop_mps + self.decel_before_stop_mpss * time_steps, 0)
 
-        for time_step_after_cruise in np.arange(
-            last_time_key + self.sim_time_increment_s, self.current_dict_time_s, self.sim_time_increment_s
-        ):
-
-            time_step = time_step_after_cruise - last_time_key
-            cur_dist = (
-                self.speed_before_stop_mps * time_step + 0.5 * self.decel_before_stop_mpss * time_step * time_step
-            )
-            self.current_dict_dist += cur_dist - prev_dist
-
-            # For velocity time plot
-            v1 = self.speed_before_stop_mps + self.decel_before_stop_mpss * time_step
-            if v1 < 0:
-                v1 = 0
-            self.v.append(v1)
-            self.t.append(round(time_step_after_cruise, 2))
-
-            # Update the dctionary for the motion state
-            round_time_step = round(time_step_after_cruise, 2)
-            self.sim_motion_state_dict[round_time_step] = [
-                round_time_step,
-                CarState.DECEL.value,
-                round((cur_dist - prev_dist) * self.resolution, 4),
-                round(self.current_dict_dist * self.resolution, 4),
-                round(v1, 4),
-                round(self.decel_before_stop_mpss, 4),
-            ]
-
-            prev_dist = cur_dist
-            self.last_time_key = time_step_after_cruise
+        self._append_phase(CarState.DECEL.value, delta_dist, total_dist, speed, self.decel_before_stop_mpss)
 
     ##########################################################################
 
     def update_stopped_time(self):
-        """ Populate the map for the stopped time phase """
-        last_time_key = round(sorted(self.sim_motion_state_dict.keys())[-1], 2)
+        """ Populate the columns for the stopped time phase """
+        last_time_key = self._last_tick_time()
         self.current_dict_time_s += self.time_stopped_s
-        total_dist = self.sim_motion_state_dict[last_time_key][3]
-
-        for time_step in np.arange(
-            last_time_key + self.sim_time_increment_s, self.current_dict_time_s, self.sim_time_increment_s
-        ):
-            self.v.append(0)
-            self.t.append(round(time_step, 2))
-
-            # Update the dctionary for the motion state
-            round_time_step = round(time_step, 2)
-            self.sim_motion_state_dict[round_time_step] = [
-                round_time_step,
-                CarState.STOP.value,
-                0.0,
-                total_dist,
-                0.0,
-                0.0,
-            ]
-            self.last_time_key = time_step
+
+        num_ticks = len(self._next_phase_times(last_time_key))
+        total_dist = np.full(num_ticks, self.current_dict_dist)
+
+        self._append_phase(CarState.STOP.value, np.zeros(num_ticks), total_dist, 0.0, 0.0)
 
     ##########################################################################
 
     def update_accel_after_stop(self):
-        """ Populate the map for the accleration after the stop line phase """
+        """ Populate the columns for the accleration after the stop line phase """
         accl_time = self.speed_after_stop_mps / self.accl_after_stop_mpss
-        last_time_key = round(sorted(self.sim_motion_state_dict.keys())[-1], 2)
+        last_time_key = self._last_tick_time()
         self.current_dict_time_s += accl_time - self.sim_time_increment_s
-        prev_dist = 0.0
-        for time_step_after_stop in np.arange(
-            last_time_key + self.sim_time_increment_s, self.current_dict_time_s, self.sim_time_increment_s
-        ):
-
-            time_step = time_step_after_stop - last_time_key
-            cur_dist_from_stop = 0.5 * self.accl_after_stop_mpss * time_step * time_step
-            self.current_dict_dist += cur_dist_from_stop - prev_dist
-            prev_dist = cur_dist_from_stop
-
-            vel = self.accl_after_stop_mpss * time_step
-            self.t.append(time_step_after_stop)
-            self.v.append(vel)
-
-            # Update the dctionary for the motion state
-            round_time_step = round(time_step_after_stop, 2)
-            self.sim_motion_state_dict[round_time_step] = [
-                round_time_step,
-                CarState.ACCEL.value,
-                round((cur_dist_from_stop - prev_dist) * self.resolution, 4),
-                round(self.current_dict_dist * self.resolution, 4),
-                round(vel, 4),
-                round(self.accl_after_stop_mpss, 4),
-            ]
-
-            self.last_time_key = time_step_after_stop
+
+        time_steps = self._next_phase_times(last_time_key) - last_time_key
+        delta_dist = np.diff(0.5 * self.accl_after_stop_mpss * time_steps * time_steps, prepend=0.0)
+        total_dist = self._accumulate_dist(delta_dist)
+
+        speed = self.accl_after_stop_mpss * time_steps
+
+        self._append_phase(CarState.ACCEL.value, delta_dist, total_dist, speed, self.accl_after_stop_mpss)
 
     ##########################################################################
 
     def update_cruise_after(self):
-        """ Populate the map for the velocity aftee the accleartion phase """
-        last_time_key = round(sorted(self.sim_motion_state_dict.keys())[-1], 2)
+        """ Populate the columns for the velocity aftee the accleartion phase """
+        last_time_key = self._last_tick_time()
         cruise_after_dist = self.dist_after_stop_m + self.dist_before_stop_m - self.current_dict_dist
         cruise_after_time = cruise_after_dist / self.speed_after_stop_mps
         self.cruise_after_time = cruise_after_time
 
         self.current_dict_time_s += cruise_after_time - self.sim_time_increment_s
 
-        for time_step in np.arange(
-            last_time_key + self.sim_time_increment_s, self.current_dict_time_s, self.sim_time_increment_s
-        ):
+        num_ticks = len(self._next_phase_times(last_time_key))
+        delta_dist = np.full(num_ticks, self.speed_after_stop_mps * self.sim_time_increment_s)
+        total_dist = self._accumulate_dist(delta_dist)
 
-            round_time_step = round(time_step, 2)
-            cur_dist = self.speed_after_stop_mps * self.sim_time_increment_s
-            self.current_dict_dist += cur_dist
+        self._append_phase(CarState.CRUISE_A.value, delta_dist, total_dist, self.speed_after_stop_mps, 0.0)
 
-            self.v.append(self.speed_after_stop_mps)
-            self.t.append(round_time_step)
+    ##################################################################################
 
-            # Update the dctionary for the motion state
-            self.sim_motion_state_dict[round_time_step] = [
-                round_time_step,
-                CarState.CRUISE_A.value,
-                round(cur_dist * self.resolution, 4),
-                round(self.current_dict_dist * self.resolution, 4),
-                round(self.speed_after_stop_mps, 4),
-                0.0,
-            ]
+    def update_past_sim(self):
+        """ Populate the columns for the addiition data points when av goes out of frame """
+        step_dist = self.speed_after_stop_mps * self.sim_time_increment_s
+        max_dist = sg.WINDOW_WIDTH_PIXELS / self.resolution
 
-            self.last_time_key = time_step
+        # Keep cruising until the cumulative distance crosses the window edge
+        max_ticks = max(int(np.ceil((max_dist - self.current_dict_dist) / step_dist)), 0) + 2
+        candidate_dist = np.cumsum(np.concatenate(([self.current_dict_dist], np.full(max_ticks, step_dist))))
+        num_ticks = int(np.argmax(candidate_dist * self.resolution > sg.WINDOW_WIDTH_PIXELS))
 
-    ##################################################################################
+        delta_dist = np.full(num_ticks, step_dist)
+        total_dist = self._accumulate_dist(delta_dist)
 
-    def update_past_sim(self):
-        """ Populate the map for the addiition data points when av goes out of frame """
-        last_time_key = round(sorted(self.sim_motion_state_dict.keys())[-1], 2)
-
-        while self.current_dict_dist * self.resolution <= sg.WINDOW_WIDTH_PIXELS:
-            round_time_step = round(last_time_key + self.sim_time_increment_s, 2)
-            cur_dist = self.speed_after_stop_mps * self.sim_time_increment_s
-            self.current_dict_dist += cur_dist
-            last_time_key += self.sim_time_increment_s
-
-            self.v.append(self.speed_after_stop_mps)
-            self.t.append(round_time_step)
-
-            # Update the dctionary for the motion state
-            self.sim_motion_state_dict[round_time_step] = [
-                round_time_step,
-                CarState.PAST_SIM.value,
-                round(cur_dist * self.resolution, 4),
-                round(self.current_dict_dist * self.resolution, 4),
-                round(self.speed_after_stop_mps, 4),
-                0.0,
-            ]
-
-            self.last_time_key = round_time_step
+        self._append_phase(CarState.PAST_SIM.value, delta_dist, total_dist, self.speed_after_stop_mps, 0.0)
 
     ##################################################################################
-
     def plot_vel_time(self):
         """ Utility function to plot velcoity time graph """
         # fig = plt.figure(figsize=(8, 6))
 
         # Plotting the points
-        # plt.plot(self.t, self.v)
+        # plt.plot(np.arange(self.num_ticks) * self.sim_time_increment_s, self.tick_speed)
 
         # Naming the x-axis
         # plt.xlabel('time ')
@@ -358,89 +420,38 @@ class Sim(object):
             Args:
                 n(float)     : Given time index
             Retunrs:
-                object       : sim object at given time
+                float        : Cumulative distance travelled at given time
         """
-        return self.sim_motion_state_dict[n][3]
+        return self.tick_total_dist[self.time_to_tick(n)]
 
     ##################################################################################
 
     def print_dict(self):
-        """ Utility function to print the dictionary """
-        # x = sorted(self.sim_dict.keys())
-        x = sorted(self.sim_motion_state_dict.keys())
-
-        # Corresponding Y-axis value
-        y = []
-        x1 = []
+        """ Utility function to print the motion state columns """
         prev_y = 0.0
-        for x_index in x:
-            x1.append(x_index)
-            prev_y = self.sim_motion_state_dict[x_index][2] + prev_y
+        for tick in range(self.num_ticks):
+            prev_y = self.tick_delta_dist[tick] + prev_y
             print(
-                " Time = , Current distance = , Total Distance =", x_index, self.sim_motion_state_dict[x_index], prev_y
+                " Time = , Current distance = , Total Distance =",
+                round(tick * self.sim_time_increment_s, 2),
+                [
+                    self.tick_state[tick],
+                    self.tick_delta_dist[tick],
+                    self.tick_total_dist[tick],
+                    self.tick_speed[tick],
+                    self.tick_accl[tick],
+                ],
+                prev_y,
             )
-            y.append(prev_y)
 
     ##################################################################################
 
     def generate_sim_param(self):
-        """ Generate the simulation parameter after reading from the config """
-        min_accl_after_stop = 0.5
-        max_accl_after_stop = 10
-        min_deccl_before_stop1 = -1
-        max_deccl_after_stop2 = -4
-        stop_speed_threshold = 1
-        turn_low = 0
-        turn_high = 3
-        turn_step = 1
-
-        car = "car" + str(self.seq_no)
-        self.dist_before_stop_m = float(self.config_manager.config_params[car]["dist_before_stop_m"])
-        self.dist_after_stop_m = float(self.config_manager.config_params[car]["dist_after_stop_m"])
-        accl_after_stop_mean = float(self.config_manager.config_params[car]["accl_after_stop_mean_mpss"])
-        accl_after_stop_dev = float(self.config_manager.config_params[car]["accl_after_stop_dev_mpss"])
-        decl_before_stop_mean = float(self.config_manager.config_params[car]["decl_before_stop_mean_mpss"])
-        decl_before_stop_dev = float(self.config_manager.config_params[car]["decl_before_stop_dev_mpss"])
-        speed_before_stop_mean = float(self.config_manager.config_params[car]["speed_before_stop_mean_mps"])
-        speed_before_stop_dev = float(self.config_manager.config_params[car]["speed_before_stop_dev_mps"])
-        speed_after_stop_mean = float(self.config_manager.config_params[car]["speed_after_stop_mean_mps"])
-        speed_after_stop_dev = float(self.config_manager.config_params[car]["speed_after_stop_dev_mps"])
-
-        # accl_after_stop using Gaussian Distribution
-        while (self.accl_after_stop_mpss <= min_accl_after_stop) or (self.accl_after_stop_mpss >= max_accl_after_stop):
-            self.accl_after_stop_mpss = np.random.normal(accl_after_stop_mean, accl_after_stop_dev, 1)[0]
-            print(" accl_after_stop = ", self.accl_after_stop_mpss)
-
-        # decl_before_stop using Gaussian Distribution
-        self.decel_before_stop_mpss = 0
-        while (
-            (self.decel_before_stop_mpss >= 0)
-            or (self.decel_before_stop_mpss > min_deccl_before_stop1)
-            or (self.decel_before_stop_mpss < max_deccl_after_stop2)
-        ):
-            self.decel_before_stop_mpss = np.random.normal(decl_before_stop_mean, decl_before_stop_dev, 1)[0]
-            print(" decl_before_stop = ", self.decel_before_stop_mpss)
-
-        # speed_before_stop using Gaussian Distribution
-        self.speed_before_stop_mps = 0
-        while self.speed_before_stop_mps <= stop_speed_threshold:
-            self.speed_before_stop_mps = np.random.normal(speed_before_stop_mean, speed_before_stop_dev, 1)[0]
-            print(" speed_before_stop = ", self.speed_before_stop_mps)
-
-        while self.speed_after_stop_mps <= stop_speed_threshold:
-            self.speed_after_stop_mps = np.random.normal(speed_after_stop_mean, speed_after_stop_dev, 1)[0]
-            print(" speed_after_stop = ", self.speed_after_stop_mps)
-
-        # Generate the random value of turn ( 0 = No Turn, 1 = Left Turn, 2 = Right Turn )
-        turn_num = int(np.random.randint(turn_low, turn_high, turn_step))
-        if turn_num == 0:
-            self.turn = CarTurn.NO.value
-        elif turn_num == 1:
-            self.turn = CarTurn.LEFT.value
-        else:
-            self.turn = CarTurn.RIGHT.value
-
-        print(" turn       = ", self.turn_no[turn_num])
+        """ Generate the simulation parameter from the truncated distributions of the config.
+            The sampled decel and speed always let the car come to the stop before the stop line.
+        """
+        sim_params = Sim_Param_Sampler(self.config_manager, self.rng).sample_car_params(self.seq_no, 1)
+        self.load_sim_param({name: values[0] for name, values in sim_params.items()})
 
 
 ##################################################################################
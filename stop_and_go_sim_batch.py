@@ -0,0 +1,139 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : Batch generation of the simulation data for several
+#               experiments. Parameters of all the cars are sampled
+#               in one call and the motion profiles are stored as
+#               padded arrays (experiment x car x tick)
+#####################################################################
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_sampler import SIM_PARAM_NAMES, Sim_Param_Sampler
+from stop_and_go_sim import Sim
+
+#####################################################################
+
+
+class Sim_Batch(object):
+    """ Generates the Sim objects of num_experiments experiments at once.
+        The motion state columns of every car are stored in the padded arrays
+        tick_state, tick_delta_dist, tick_total_dist, tick_speed and tick_accl
+        of shape (num_experiments, num_cars, max_ticks). tick_mask marks the
+        generated ticks and num_ticks has the number of ticks of every car.
+        The Sim objects share the memory of the padded arrays.
+    """
+
+    def __init__(
+        self, config_manager, num_experiments, num_cars=sg.NUM_CARS_FOR_TESTING, profile_cache=None, rng=None
+    ):
+        """ Initializes the batch and generates the simulation data
+            Args:
+                config_manager(object)  : Config_manager object
+                num_experiments(int)    : Number of experiments in the batch
+                num_cars(int)           : Number of cars in each experiment
+                profile_cache(object)   : Optional Profile_Cache shared by the Sim objects
+                rng(object)             : np.random.Generator the parameters are sampled with. The global
+                                          np.random state is used if None
+        """
+        self.config_manager = config_manager
+        self.profile_cache = profile_cache
+        self.rng = rng
+        self.num_experiments = num_experiments
+        self.num_cars = num_cars
+        self.next_exp = 0
+
+        self.time_stopped = np.empty(0)
+        self.sim_params = {}
+        self.sims = []
+
+        self.tick_state = np.empty((num_experiments, num_cars, 0), dtype=np.int8)
+        self.tick_delta_dist = np.empty((num_experiments, num_cars, 0))
+        self.tick_total_dist = np.empty((num_experiments, num_cars, 0))
+        self.tick_speed = np.empty((num_experiments, num_cars, 0))
+        self.tick_accl = np.empty((num_experiments, num_cars, 0))
+        self.tick_mask = np.empty((num_experiments, num_cars, 0), dtype=bool)
+        self.num_ticks = np.zeros((num_experiments, num_cars), dtype=np.int32)
+
+        self.generate_batch()
+
+    #####################################################################
+
+    def sample_sim_params(self):
+        """ Sample the simulation parameters of all the cars in all the experiments """
+        sampler = Sim_Param_Sampler(self.config_manager, self.rng)
+
+        car_params = [sampler.sample_car_params(seq, self.num_experiments) for seq in range(1, self.num_cars + 1)]
+        self.sim_params = {
+            name: np.stack([params[name] for params in car_params], axis=1) for name in SIM_PARAM_NAMES
+        }
+
+        # Time stopped at the stop sign is shared by all the cars of an experiment
+        self.time_stopped = sampler.sample_time_stopped(self.num_experiments)
+
+    #####################################################################
+
+    def generate_batch(self):
+        """ Sample the parameters, build the profiles and pack them into the padded arrays """
+        self.sample_sim_params()
+
+        self.sims = []
+        for exp in range(self.num_experiments):
+            exp_sims = []
+            for car in range(self.num_cars):
+                params = {name: self.sim_params[name][exp, car] for name in SIM_PARAM_NAMES}
+                exp_sims.append(
+                    Sim(self.config_manager, car + 1, self.time_stopped[exp], params, self.profile_cache)
+                )
+            self.sims.append(exp_sims)
+
+        self.num_ticks = np.array([[sim.num_ticks for sim in exp_sims] for exp_sims in self.sims], dtype=np.int32)
+        max_ticks = int(self.num_ticks.max()) if self.num_ticks.size else 0
+        shape = (self.num_experiments, self.num_cars, max_ticks)
+
+        self.tick_state = np.full(shape, -1, dtype=np.int8)
+        self.tick_delta_dist = np.zeros(shape)
+        self.tick_total_dist = np.zeros(shape)
+        self.tick_speed = np.zeros(shape)
+        self.tick_accl = np.zeros(shape)
+        self.tick_mask = np.arange(max_ticks) < self.num_ticks[:, :, np.newaxis]
+
+        for exp, exp_sims in enumerate(self.sims):
+            for car, sim in enumerate(exp_sims):
+                n = sim.num_ticks
+                self.tick_state[exp, car, :n] = sim.tick_state
+                self.tick_delta_dist[exp, car, :n] = sim.tick_delta_dist
+                self.tick_total_dist[exp, car, :n] = sim.tick_total_dist
+                self.tick_speed[exp, car, :n] = sim.tick_speed
+                self.tick_accl[exp, car, :n] = sim.tick_accl
+
+                # Share the memory of the padded arrays
+                sim.tick_state = self.tick_state[exp, car, :n]
+                sim.tick_delta_dist = self.tick_delta_dist[exp, car, :n]
+                sim.tick_total_dist = self.tick_total_dist[exp, car, :n]
+                sim.tick_speed = self.tick_speed[exp, car, :n]
+                sim.tick_accl = self.tick_accl[exp, car, :n]
+
+        self.next_exp = 0
+
+    #####################################################################
+
+    def is_exhausted(self):
+        """ Check if all the experiments of the batch have been handed out
+            Returns:
+                bool       : Returns true if there is no experiment left
+        """
+        return self.next_exp >= self.num_experiments
+
+    #####################################################################
+
+    def next_experiment(self):
+        """ Hand out the Sim objects of the next experiment of the batch
+            Returns:
+                list       : Sim objects of the cars, ordered by car sequence number
+        """
+        exp_sims = self.sims[self.next_exp]
+        self.next_exp += 1
+
+        return exp_sims
+
+
+#####################################################################
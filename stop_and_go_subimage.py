@@ -4,7 +4,6 @@
 #####################################################################
 import cv2
 import numpy as np
-import pygame
 import stop_and_go_globals as sg
 
 #####################################################################
@@ -73,26 +72,20 @@ class SubImage(object):
     ####################################################################
 
     def convert_surface_3darray(self, window):
-        """ Convert pygame surface to the 3-D array
+        """ Convert the canvas to the 3-D array
             Args:
-                window(pygame surface) : Current pygame frame
+                window(canvas)        : Current frame
             Returns:
                 Returns the window as 3-D array
         """
-        window_arr = pygame.surfarray.array3d(window)
-        # Swap height width
-        window_arr = window_arr.swapaxes(0, 1)
-
-        # Convert to RGB
-        window_arr = window_arr[:, :, ::-1]
-        return window_arr
+        return window.to_array()
 
     #####################################################################
 
     def create_subimage(self, window, ref_mid_x, ref_mid_y):
         """ Create subimage from the main window frame.
             Args:
-                window(pygame window) : Current frame
+                window(canvas)        : Current frame
                 ref_mid_x(float)      : x position of the reference coordinate
                 ref_mid_y(float)      : y position of the reference coordinate
             Returns:
@@ -168,6 +161,25 @@ class SubImage(object):
 
     #####################################################################
 
+    def get_camera_view(self, window, ref_mid_x, ref_mid_y):
+        """ Get the subimage from a window drawn in the camera view ( see Viewport_Canvas ).
+            Args:
+                window(canvas)        : Current frame in the camera view
+                ref_mid_x(float)      : x position of the reference coordinate
+                ref_mid_y(float)      : y position of the reference coordinate
+            Returns:
+                numpy                 : Sub image of size 256X256 pixels
+                bool                  : Reference car has recahed end before creating sub image
+        """
+        if self.image_end_status(ref_mid_x, ref_mid_y):
+            if sg.DEBUG == sg.DEBUG_LEVEL_2:
+                print(" Image end is reached ")
+            return np.zeros(shape=(sg.SUB_IMAGE_WIDTH, sg.SUB_IMAGE_LENGTH, 3), dtype=np.uint8), True
+
+        return window.to_array(), False
+
+    #####################################################################
+
     def create_sub_mask_image(self, mask_image):
         """ Create masked image
             Args:
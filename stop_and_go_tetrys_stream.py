@@ -0,0 +1,280 @@
+#####################################################################
+# Uber, Inc. (c) 2020
+# Description : Streaming tetrys export. The rows are written to the
+#               tables per group of experiments instead of once at the
+#               end of the run, so the memory is bounded and a crash
+#               keeps the groups already written
+#####################################################################
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import stop_and_go_globals as sg
+
+#####################################################################
+
+# Tables of the export
+TETRYS_DATASET_TABLE = "dataset"  # Traffic, sdv & stop sign information of each frame
+TETRYS_IMAGE_TABLE = "images"  # Reference car and traffic masks of each frame
+TETRYS_LANE_TABLE = "lanes"  # Lane image of each experiment
+
+#####################################################################
+
+
+def image_name(exp_no, keyword, frame_no, extension):
+    """ Name of a generated image
+        Args:
+            exp_no(int)        : Experiment number
+            keyword(str)       : Keyword of the image, sg.REFERENCE_IMAGE_KEYWORD for example
+            frame_no(int)      : Frame number within the experiment
+            extension(str)     : Extension of the image file
+        Returns:
+            str                : Image file name
+    """
+    return sg.IMAGE_BASE_DIR + "/" + "stop_" + str(exp_no).zfill(5) + keyword + str(frame_no).zfill(6) + extension
+
+
+#####################################################################
+
+
+def image_rows(exp_start, exp_stop, read_image):
+    """ Rows of the image table of the experiments
+        Args:
+            exp_start(int)       : First experiment number
+            exp_stop(int)        : One above the last experiment number
+            read_image(function) : Reads back an image by its file name
+        Returns:
+            list                 : Row of each frame
+    """
+    rows = []
+    for exp_no in range(exp_start, exp_stop):
+        for frame_no in range(sg.DATASET_SPAN_FRAMES):
+            rows.append(
+                {
+                    "seq_no": exp_no,
+                    "frame_no": frame_no,
+                    "ref_image": read_image(
+                        image_name(exp_no, sg.REFERENCE_IMAGE_KEYWORD, frame_no, sg.MASK_IMAGE_EXTENSION)
+                    ),
+                    "traffic_image": read_image(
+                        image_name(exp_no, sg.TRAFFIC_IMAGE_KEYWORD, frame_no, sg.MASK_IMAGE_EXTENSION)
+                    ),
+                }
+            )
+
+    return rows
+
+
+#####################################################################
+
+
+def lane_rows(exp_start, exp_stop, read_image):
+    """ Rows of the lane table of the experiments
+        Args:
+            exp_start(int)       : First experiment number
+            exp_stop(int)        : One above the last experiment number
+            read_image(function) : Reads back an image by its file name
+        Returns:
+            list                 : Row of each experiment
+    """
+    return [
+        {
+            "seq_no": exp_no,
+            "frame_no": 0,
+            "lane_image": read_image(image_name(exp_no, sg.LANES_IMAGE_KEYWORD, 0, ".jpg")),
+        }
+        for exp_no in range(exp_start, exp_stop)
+    ]
+
+
+#####################################################################
+
+
+def partition_rows(rows, num_partitions):
+    """ Split the rows into partitions of contiguous seq_no ranges, an experiment is never split
+        Args:
+            rows(list)             : Rows of a table
+            num_partitions(int)    : Maximum number of partitions
+        Returns:
+            list                   : Rows of each partition, ordered by seq_no
+    """
+    rows = sorted(rows, key=lambda row: row["seq_no"])
+    seq_nos = np.array([row["seq_no"] for row in rows])
+    experiments = np.unique(seq_nos)
+    if len(experiments) == 0:
+        return []
+
+    groups = np.array_split(experiments, min(max(num_partitions, 1), len(experiments)))
+    bounds = list(np.searchsorted(seq_nos, [group[0] for group in groups])) + [len(rows)]
+
+    return [rows[bounds[index] : bounds[index + 1]] for index in range(len(groups))]
+
+
+#####################################################################
+
+
+def write_tables_concurrently(write_table, tables):
+    """ Write the tables each from its own thread. The writers wait on Spark jobs or zlib,
+        which release the GIL.
+        Args:
+            write_table(function)  : Writes a table given one entry of tables as its arguments
+            tables(list)           : Arguments of each table
+        Raises:
+            Exception              : The first error of the writes
+    """
+    with ThreadPoolExecutor(max_workers=max(len(tables), 1)) as executor:
+        futures = [executor.submit(write_table, *arguments) for arguments in tables]
+        for future in futures:
+            future.result()
+
+
+#####################################################################
+
+
+class LocalTetrysSink(object):
+    """ Local stand-in of the configured tables, so the export runs without a cluster. The rows
+        are split into num_partitions seq_no ranges like the Spark writes, and each partition is
+        written in parallel into a row group <base_dir>/<table>/seq_<first>_<last>.npz holding a
+        column per field stacked over the rows. A missing image is stored black, in the shape of
+        the other images of the row group or of a camera view if they are all missing.
+    """
+
+    def __init__(self, base_dir, num_partitions=sg.TETRYS_NUM_PARTITIONS):
+        """ Initializes the sink with
+            Args:
+                base_dir(str)         : Directory of the tables
+                num_partitions(int)   : Number of partitions of the rows written together
+        """
+        self.base_dir = base_dir
+        self.num_partitions = num_partitions
+
+    def write_tetrys_rows(self, table, rows, exp_start, exp_stop):
+        """ Write the rows of the table as a row group per partition
+            Args:
+                table(str)       : Table of the rows
+                rows(list)       : Rows of the experiments exp_start..exp_stop - 1
+                exp_start(int)   : First experiment number
+                exp_stop(int)    : One above the last experiment number
+        """
+        table_dir = os.path.join(self.base_dir, table)
+        if not os.path.isdir(table_dir):
+            os.makedirs(table_dir)
+
+        partitions = partition_rows(rows, self.num_partitions)
+        write_tables_concurrently(self.write_row_group, [(table_dir, partition) for partition in partitions])
+
+    def write_row_group(self, table_dir, rows):
+        """ Write the rows of a partition
+            Args:
+                table_dir(str)   : Directory of the table
+                rows(list)       : Rows ordered by seq_no
+        """
+        columns = {}
+        for name in rows[0]:
+            values = [row[name] for row in rows]
+            known = next((value for value in values if value is not None), None)
+            if known is None:
+                known = np.zeros((sg.SUB_IMAGE_LENGTH, sg.SUB_IMAGE_WIDTH, 3), np.uint8)
+            values = [np.zeros_like(known) if value is None else value for value in values]
+            columns[name] = np.array(values)
+
+        filename = "seq_{:05d}_{:05d}.npz".format(rows[0]["seq_no"], rows[-1]["seq_no"])
+        with open(os.path.join(table_dir, filename), "wb") as npz_file:
+            np.savez_compressed(npz_file, **columns)
+
+
+#####################################################################
+
+
+def load_local_tetrys_table(table_dir):
+    """ Load the row groups of a table written by LocalTetrysSink
+        Args:
+            table_dir(str)   : Directory of the table
+        Returns:
+            dict             : Column name -> array of all the rows in experiment number order
+    """
+    groups = []
+    for filename in sorted(os.listdir(table_dir)):
+        with np.load(os.path.join(table_dir, filename)) as npz_file:
+            groups.append({name: npz_file[name] for name in npz_file.files})
+    if not groups:
+        return {}
+
+    return {name: np.concatenate([group[name] for group in groups]) for name in groups[0]}
+
+
+#####################################################################
+
+
+class TetrysStreamer(object):
+    """ Stream the tetrys rows to the tables of a sink per group of experiments. The rows of an
+        experiment are held until it is complete, those of a rejected attempt are dropped. Once
+        flush_experiments experiments are complete the group is written: the dataset rows and
+        the image and lane rows read back from the image output. It stands in for the metadata
+        writer of the main loop, write_json takes the rows built by DatasetGenerator.
+    """
+
+    def __init__(self, sink, read_image, flush_experiments):
+        """ Initializes the streamer with
+            Args:
+                sink(object)             : LocalTetrysSink or a DatasetGenerator writing to the configured tables
+                read_image(function)     : Reads back an image by its file name
+                flush_experiments(int)   : Number of experiments of a row group
+        """
+        self.sink = sink
+        self.read_image = read_image
+        self.flush_experiments = max(flush_experiments, 1)
+        self.frames = []  # Rows of the current experiment
+        self.rows = []  # Rows of the complete experiments of the group
+        self.exp_start = None
+        self.exp_stop = None
+
+    def write_json(self, content_list):
+        """ Keep the row of the frame
+            Args:
+                content_list(dict)   : Tetrys row of the frame
+        """
+        self.frames.append(content_list)
+
+    def end_experiment(self, exp_no, complete):
+        """ Add the rows of the experiment to the group and write the group once it is full
+            Args:
+                exp_no(int)          : Experiment number
+                complete(bool)       : False if the experiment is rejected, its rows are dropped
+        """
+        frames, self.frames = self.frames, []
+        if not complete or not frames:
+            return
+
+        if self.exp_start is None:
+            self.exp_start = exp_no
+        self.exp_stop = exp_no + 1
+        self.rows.extend(frames)
+        if self.exp_stop - self.exp_start >= self.flush_experiments:
+            self.flush()
+
+    def flush(self):
+        """ Write the rows of the group """
+        if self.exp_start is None:
+            return
+
+        exp_start, exp_stop = self.exp_start, self.exp_stop
+        write_tables_concurrently(
+            self.sink.write_tetrys_rows,
+            [
+                (TETRYS_DATASET_TABLE, self.rows, exp_start, exp_stop),
+                (TETRYS_IMAGE_TABLE, image_rows(exp_start, exp_stop, self.read_image), exp_start, exp_stop),
+                (TETRYS_LANE_TABLE, lane_rows(exp_start, exp_stop, self.read_image), exp_start, exp_stop),
+            ],
+        )
+        self.rows = []
+        self.exp_start = None
+        self.exp_stop = None
+
+    def close(self):
+        """ Write the last group, the rows of an unfinished experiment are dropped """
+        self.frames = []
+        self.flush()
+
+
+#####################################################################
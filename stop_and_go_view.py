@@ -3,6 +3,7 @@
 ####################################################
 import numpy as np
 import stop_and_go_globals as sg
+from stop_and_go_sampler import random_integers, random_state
 
 #####################################################################
 
@@ -92,7 +93,7 @@ class Camera(object):
 
 
 class Frame_State(object):
-    def __init__(self, frame_span, frame_window, ref_frame, last_frame, start_frame, start_frame_dev):
+    def __init__(self, frame_span, frame_window, ref_frame, last_frame, start_frame, start_frame_dev, rng=None):
         """ Maintain the frame states
             Args:
                 frame_span(int)       : Number of frames per simulation
@@ -100,6 +101,9 @@ class Frame_State(object):
                 ref_frame(int)        : Reference frame number based on reference time of the car
                 last_frame(int)       : Last frame number
                 start_frame(int)      : Start frame number
+                start_frame_dev(int)  : Deviation of the start frame number
+                rng(object)           : np.random.Generator the first start frame is drawn with. The
+                                        global np.random state is used if None
         """
         self.initial_start_frame = start_frame
         self.initial_start_frame_dev = start_frame_dev
@@ -114,19 +118,59 @@ class Frame_State(object):
         self.frame_span = 0
         self.frame_window = 0
         self.last_frame = 0
-        self.reset_frames()
+        self.reset_frames(rng)
 
     ####################################################
-    def reset_frames(self):
-        """ Reset the frame's parameter after the end of the simulation """
+    def reset_frames(self, rng=None):
+        """ Reset the frame's parameter after the end of the simulation
+            Args:
+                rng(object) : np.random.Generator of the experiment. The global np.random state is used if None
+        """
         # if frames are greater than the end_frame , reset to the beginning
-        self.start_frame = int(
-            np.random.uniform(
-                self.initial_start_frame - self.initial_start_frame_dev,
-                self.initial_start_frame + self.initial_start_frame_dev,
-                1,
-            )[0]
+        self.set_start_frame(
+            int(
+                random_state(rng).uniform(
+                    self.initial_start_frame - self.initial_start_frame_dev,
+                    self.initial_start_frame + self.initial_start_frame_dev,
+                    1,
+                )[0]
+            )
         )
+
+    ####################################################
+    def candidate_start_frames(self):
+        """ Start frames that reset_frames can draw
+            Returns:
+                numpy : Candidate start frame numbers in increasing order
+        """
+        low = int(np.floor(self.initial_start_frame - self.initial_start_frame_dev))
+        high = int(np.ceil(self.initial_start_frame + self.initial_start_frame_dev))
+        return np.arange(low, high)
+
+    ####################################################
+    def reset_frames_within(self, feasible_mask, rng=None):
+        """ Reset the frame's parameter with the start frame drawn uniformly among the
+            feasible candidate start frames. It falls back to reset_frames if no
+            candidate is feasible.
+            Args:
+                feasible_mask(numpy) : Feasible flag of each of the candidate_start_frames
+                rng(object)          : np.random.Generator of the experiment. The global np.random state
+                                       is used if None
+        """
+        feasible_start_frames = self.candidate_start_frames()[feasible_mask]
+        if len(feasible_start_frames) == 0:
+            self.reset_frames(rng)
+            return
+
+        self.set_start_frame(int(feasible_start_frames[random_integers(0, len(feasible_start_frames), rng=rng)]))
+
+    ####################################################
+    def set_start_frame(self, start_frame):
+        """ Set the start frame and the frames depending on it
+            Args:
+                start_frame(int) : Start frame number
+        """
+        self.start_frame = start_frame
         self.ref_frame = self.start_frame + self.initial_ref_frame
         self.end_frame = self.start_frame + self.initial_frame_span
         self.frame_span = self.start_frame + self.initial_frame_span
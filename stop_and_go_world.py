@@ -0,0 +1,288 @@
+#####################################################################
+# Uber, Inc. (c) 2019
+# Description : Structure of arrays world state. The cars' pose, motion
+#               and turn status are stored in NumPy columns and all the
+#               cars are advanced with one vectorized step per tick
+#####################################################################
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_approach import get_approach
+from stop_and_go_data_type import CarTurn
+
+#####################################################################
+
+
+class World_Column(object):
+    """ Attribute of an actor ( Pose, SimState, ... ) that is stored in the World_State
+        column once the actor is bound to a world. Unbound actors keep the value as
+        a plain instance attribute.
+    """
+
+    def __init__(self, column):
+        """ Initializes the column attribute with
+            Args:
+                column(str)      : Name of the World_State column
+        """
+        self.column = column
+        self.name = column
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, actor, owner=None):
+        if actor is None:
+            return self
+
+        world_state = actor.__dict__.get("world_state")
+        if world_state is None:
+            return actor.__dict__[self.name]
+
+        # item() returns the Python float / bool, so the recorded values stay JSON serializable
+        return world_state.columns[self.column].item(actor.__dict__["world_index"])
+
+    def __set__(self, actor, value):
+        world_state = actor.__dict__.get("world_state")
+        if world_state is None:
+            actor.__dict__[self.name] = value
+        else:
+            world_state.columns[self.column][actor.__dict__["world_index"]] = value
+
+
+#####################################################################
+
+
+class World_State(object):
+    """ Holds the state of all the cars of the scene in NumPy columns. The cars are bound
+        to the world, so the Car objects read and write the columns and the intersection
+        rules keep working on them, while the per tick motion of all the cars is one
+        vectorized step.
+    """
+
+    def __init__(self, car_list):
+        """ Bind the cars to the world and build the columns from their current state
+            Args:
+                car_list(list)     : Car objects of the scene, ordered by sequence number
+        """
+        num_cars = len(car_list)
+        self.num_cars = num_cars
+        self.car_index = np.arange(num_cars)
+        self.sim_time_increment_s = np.array([car.sim.sim_time_increment_s for car in car_list])
+
+        # Position of the cars, x and y columns are views of it
+        self.position = np.array([(car.pose.x, car.pose.y) for car in car_list], dtype=np.float64).reshape(-1, 2)
+
+        # Columns shared with the Car objects
+        self.columns = {
+            "x": self.position[:, 0],
+            "y": self.position[:, 1],
+            "time_index": np.array([car.time_index for car in car_list], dtype=np.float64),
+            "dp": np.array([car.sim_state.dp for car in car_list], dtype=np.float64),
+            "end": np.array([car.sim_state.end for car in car_list], dtype=bool),
+            "overlap": np.array([car.sim_state.overlap for car in car_list], dtype=bool),
+            "stop_car": np.array([car.sim_state.stop_car for car in car_list], dtype=bool),
+            "speed": np.array([car.dynamic_state.speed for car in car_list], dtype=np.float64),
+            "set_speed": np.array([car.dynamic_state.set_speed for car in car_list], dtype=bool),
+            "turning": np.array([car.Turn_Status.turning for car in car_list], dtype=bool),
+            "turned": np.array([car.Turn_Status.turned for car in car_list], dtype=bool),
+        }
+
+        # Car's extents, refreshed for the cars that turn through the Car objects
+        self.width = np.array([car.physical_properties.width for car in car_list], dtype=np.float64)
+        self.length = np.array([car.physical_properties.length for car in car_list], dtype=np.float64)
+
+        # Direction of the motion before and after the turn
+        approaches = [get_approach(car.sim_state.seq, car.sim.turn) for car in car_list]
+        self.has_turn = np.array([approach.turn != CarTurn.NO.value for approach in approaches], dtype=bool)
+        self.direction = np.array([approach.direction for approach in approaches], dtype=np.float64)
+        self.turned_direction = np.array([approach.turned_direction for approach in approaches], dtype=np.float64)
+
+        # Padded per tick displacement of each car's simulation
+        self.num_ticks = np.array([car.sim.num_ticks for car in car_list], dtype=np.int64)
+        self.last_tick = max(int(self.num_ticks.max()) - 1, 0) if num_cars else 0
+        self.tick_delta_dist = np.zeros((num_cars, self.last_tick + 1))
+        for index, car in enumerate(car_list):
+            self.tick_delta_dist[index, : car.sim.num_ticks] = car.sim.tick_delta_dist
+
+        for index, car in enumerate(car_list):
+            for actor in (car, car.pose, car.sim_state, car.dynamic_state, car.Turn_Status):
+                actor.world_state = self
+                actor.world_index = index
+
+    #####################################################################
+
+    def overlap_mask(self, sprite_mid):
+        """ Check the overlap of all the cars with the middle intersection
+            Args:
+                sprite_mid(object)   : Sprite_mid instance
+            Returns:
+                numpy                : True for the cars overlapping the middle intersection
+        """
+        return self.overlap_mask_at(self.columns["x"], self.columns["y"], self.width, self.length, sprite_mid)
+
+    #####################################################################
+
+    @staticmethod
+    def overlap_mask_at(x, y, width, length, sprite_mid):
+        """ Overlap of the cars at the positions with the middle intersection ( see _check_car_intersection_overlap ) """
+        return (
+            (x + length >= sprite_mid.x)
+            & (x <= sprite_mid.x + sprite_mid.length)
+            & (y + width >= sprite_mid.y)
+            & (y <= sprite_mid.y + sprite_mid.width)
+        )
+
+    #####################################################################
+
+    def update_overlap(self, sprite_mid):
+        """ Check the overlap of all the cars with the middle intersection. Cars that
+            have reached the end keep their last overlap status.
+            Args:
+                sprite_mid(object)   : Sprite_mid instance
+        """
+        np.copyto(self.columns["overlap"], self.overlap_mask(sprite_mid), where=~self.columns["end"])
+
+    #####################################################################
+
+    def step(self, car_list, path_list, sprite_mid):
+        """ Advance all the cars by one tick and check if they are outside of the frame.
+            Straight motion is vectorized, the few turning cars go through their arc tables.
+            Args:
+                car_list(list)     : Car objects bound to this world
+                path_list(list)    : List of path objects
+                sprite_mid(object) : Intersection object
+        """
+        columns = self.columns
+        moving = ~columns["stop_car"]
+
+        # Displacement of this tick from the simulation, or from the speed set by the collision check
+        tick = np.rint(columns["time_index"] / self.sim_time_increment_s).astype(np.int64)
+        valid_tick = moving & (tick >= 0) & (tick < self.num_ticks)
+        sim_dp = self.tick_delta_dist[self.car_index, tick.clip(0, self.last_tick)]
+        dp = np.where(columns["set_speed"], columns["speed"] * sg.TIME_INCREMENT_STEP, sim_dp)
+        np.copyto(columns["dp"], dp, where=valid_tick)
+
+        active = moving & ~columns["end"]
+        turning = active & self.has_turn & columns["turning"]
+        straight = active & ~turning
+
+        # Straight motion along the path, before or after the turn
+        direction = np.where(columns["turned"][:, np.newaxis], self.turned_direction, self.direction)
+        self.position += direction * np.where(straight, columns["dp"], 0.0)[:, np.newaxis]
+
+        # Cars moving on the arc of the turn
+        if turning.any():
+            for index in np.flatnonzero(turning):
+                car = car_list[index]
+                car.set_turning_car_points(path_list, sprite_mid)
+                self.width[index] = car.physical_properties.width
+                self.length[index] = car.physical_properties.length
+
+        # Turn center of the cars stopped at the stop line
+        stopped_turn = self.has_turn & ~moving
+        if stopped_turn.any():
+            for index in np.flatnonzero(stopped_turn):
+                car_list[index].update_car_position(path_list, sprite_mid)
+
+        self.update_outside_boundary()
+
+    #####################################################################
+
+    def update_outside_boundary(self):
+        """ Check the boundary of all the cars against the frame ( see Car.check_outside_boundary ) """
+        self.columns["end"][:] = self.outside_boundary_at(self.columns["x"], self.columns["y"], self.length)
+
+    #####################################################################
+
+    @staticmethod
+    def outside_boundary_at(x, y, length):
+        """ True for the car positions outside of the frame """
+        return (
+            (x + length + sg.CAR_BOUNDARY_OFFSET < 0)
+            | (x >= sg.WINDOW_WIDTH_PIXELS)
+            | (y >= sg.WINDOW_LENGTH_PIXELS)
+            | (y + length < 0)
+        )
+
+    #####################################################################
+
+    def advance_free_flight(self, car_list, sprite_mid, max_ticks):
+        """ Advance all the cars over the ticks before the next car arrives at the middle
+            intersection. The caller checks that no car interacts with the intersection
+            ( see Event_Scheduler.is_free_flight ), so each car follows its own simulation
+            and the ticks are evaluated in bulk with the same floating point accumulation
+            as the per tick update.
+            Args:
+                car_list(list)       : Car objects bound to this world
+                sprite_mid(object)   : Intersection object
+                max_ticks(int)       : Maximum number of ticks to advance
+            Returns:
+                int                  : Number of ticks advanced, 0 if a car arrives at the intersection now
+        """
+        columns = self.columns
+        end = columns["end"]
+        car_index = self.car_index[:, np.newaxis]
+        horizon = np.arange(max_ticks + 1)
+
+        # Time at the start of each tick, accumulated like time_index += sim_time_increment_s
+        times = np.empty((self.num_cars, max_ticks + 1))
+        times[:, 0] = columns["time_index"]
+        times[:, 1:] = self.sim_time_increment_s[:, np.newaxis]
+        np.add.accumulate(times, axis=1, out=times)
+        ticks = np.rint(times / self.sim_time_increment_s[:, np.newaxis]).astype(np.int64)
+        valid_ticks = (ticks >= 0) & (ticks < self.num_ticks[:, np.newaxis])
+
+        # Displacement of each tick, the last one is kept once the car is past its simulation
+        delta = self.tick_delta_dist[car_index, ticks.clip(0, self.last_tick)]
+        delta[:, 0] = columns["dp"]
+        dp_index = np.maximum.accumulate(np.where(valid_ticks, horizon, 0)[:, 1:], axis=1)
+        dp = np.take_along_axis(delta, dp_index, axis=1)
+
+        # Position at the start of each tick, accumulated like pose.x += dx * dp
+        direction = np.where(columns["turned"][:, np.newaxis], self.turned_direction, self.direction)
+        x = np.empty((self.num_cars, max_ticks + 1))
+        y = np.empty((self.num_cars, max_ticks + 1))
+        x[:, 0], y[:, 0] = columns["x"], columns["y"]
+        x[:, 1:] = direction[:, 0:1] * dp
+        y[:, 1:] = direction[:, 1:2] * dp
+        np.add.accumulate(x, axis=1, out=x)
+        np.add.accumulate(y, axis=1, out=y)
+
+        # First tick each car starts at the end ( max_ticks + 1 if it doesn't reach it )
+        outside = self.outside_boundary_at(x, y, self.length[:, np.newaxis])
+        outside[:, 0] = end
+        end_tick = np.where(outside.any(axis=1), outside.argmax(axis=1), max_ticks + 1)
+
+        # First tick a car still on the path overlaps the intersection
+        overlap = self.overlap_mask_at(x, y, self.width[:, np.newaxis], self.length[:, np.newaxis], sprite_mid)
+        overlap &= horizon < end_tick[:, np.newaxis]
+        overlap[:, max_ticks] = True
+        num_ticks = int(overlap.argmax(axis=1).min())
+
+        # Stop after the tick all the cars reach the end, the experiment is reset
+        if np.all(end_tick <= max_ticks):
+            num_ticks = min(num_ticks, int(end_tick.max()))
+        if num_ticks == 0:
+            return 0
+
+        # Last tick in which the intersection rules updated the car's state from its simulation
+        moved_tick = np.minimum(end_tick, num_ticks)
+        state_tick = np.maximum.accumulate(np.where(valid_ticks, horizon, -1), axis=1)
+        state_tick = np.where(moved_tick > 0, state_tick[self.car_index, np.maximum(moved_tick - 1, 0)], -1)
+        for index, car in enumerate(car_list):
+            tick = ticks[index, state_tick[index]]
+            if state_tick[index] >= 0:
+                car.sim_state.cur_state = int(car.sim.tick_state[tick])
+                car.dynamic_state.speed = float(car.sim.tick_speed[tick])
+                car.dynamic_state.accl = float(car.sim.tick_accl[tick])
+
+        columns["time_index"][:] = times[:, num_ticks]
+        columns["dp"][:] = dp[:, num_ticks - 1]
+        columns["x"][:] = x[self.car_index, moved_tick]
+        columns["y"][:] = y[self.car_index, moved_tick]
+        columns["overlap"][end_tick > 0] = False
+        end |= end_tick <= num_ticks
+
+        return num_ticks
+
+
+#####################################################################
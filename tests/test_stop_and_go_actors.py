@@ -2,7 +2,7 @@ import unittest
 import pygame
 from stop_and_go_actors import Stop_Area, Stop_Line, Turn_Status, Pose, DynamicState, PhysicalProperties, SimState, Car, Path
 import stop_and_go_globals as sg
-from stop_and_go_data_type import CarTurn
+from stop_and_go_data_type import CarTurn, HeadingDirection
 
 class TestStopAndGoActors(unittest.TestCase):
 
@@ -95,11 +95,9 @@ class TestStopAndGoActors(unittest.TestCase):
         self.assertEqual(car.stop_time_index, 0)
         self.assertFalse(car.Turn_Status.turning)
         self.assertFalse(car.Turn_Status.turned)
-        self.assertEqual(car.car_turn_path[sg.CAR_SEQ_1], [
-            (sg.PATH_SEQ_0, HeadingDirection.EAST.value),
-            (sg.PATH_SEQ_3, HeadingDirection.NORTH.value),
-            (sg.PATH_SEQ_1, HeadingDirection.SOUTH.value),
-        ])
+        sim.turn = CarTurn.LEFT.value
+        self.assertEqual(car.get_approach().path_seq, sg.PATH_SEQ_3)
+        self.assertEqual(car.get_approach().heading_direction, HeadingDirection.NORTH.value)
 
     def test_path_initialization(self):
         path = Path(10, 20, 30, 40, 1, 50)
@@ -0,0 +1,55 @@
+import math
+import unittest
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_approach import APPROACHES, Arc_Table, get_approach
+from stop_and_go_data_type import CarTurn, HeadingDirection
+
+class TestApproach(unittest.TestCase):
+
+    def test_all_approaches_defined(self):
+        for seq in (sg.CAR_SEQ_1, sg.CAR_SEQ_2, sg.CAR_SEQ_3, sg.CAR_SEQ_4):
+            for turn in CarTurn:
+                approach = get_approach(seq, turn.value)
+                self.assertEqual((approach.seq, approach.turn), (seq, turn.value))
+
+    def test_turned_direction_is_new_path_direction(self):
+        for (seq, turn), approach in APPROACHES.items():
+            if turn == CarTurn.NO.value:
+                continue
+            straight = [a for a in APPROACHES.values() if a.turn == CarTurn.NO.value and a.path_seq == approach.path_seq]
+            self.assertEqual(approach.turned_direction, straight[0].direction)
+            self.assertEqual(approach.heading_direction, straight[0].heading_direction)
+
+    def test_no_turn_headings(self):
+        self.assertEqual(get_approach(sg.CAR_SEQ_1, CarTurn.NO.value).heading_direction, HeadingDirection.EAST.value)
+        self.assertEqual(get_approach(sg.CAR_SEQ_4, CarTurn.NO.value).direction, (0, -1))
+
+class TestArcTable(unittest.TestCase):
+
+    def setUp(self):
+        self.approach = get_approach(sg.CAR_SEQ_2, CarTurn.RIGHT.value)
+        self.table = Arc_Table(self.approach, 10.0, 6, 8)
+
+    def test_rows_at_table_points(self):
+        self.assertEqual(self.table.rows.shape, (sg.TURN_ARC_TABLE_SIZE, 11))
+        np.testing.assert_allclose(self.table.lookup(0.0)[:3], [10.0, 0.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(self.table.lookup(self.table.arc_length)[:3], [0.0, 10.0, math.pi / 2], atol=1e-12)
+
+    def test_interpolation_close_to_exact_pose(self):
+        arc_length = 7.3
+        ang = arc_length / 10.0
+        row = self.table.lookup(arc_length)
+        self.assertAlmostEqual(row[0], 10.0 * math.cos(ang), places=4)
+        self.assertAlmostEqual(row[1], 10.0 * math.sin(ang), places=4)
+        self.assertAlmostEqual(row[2], ang, places=9)
+        # Boundary points keep the car's half diagonal from its center
+        points = row[3:].reshape(4, 2)
+        np.testing.assert_allclose(np.hypot(points[:, 0], points[:, 1]), 5.0, atol=1e-4)
+
+    def test_lookup_clamps_arc_length(self):
+        np.testing.assert_allclose(self.table.lookup(-1.0), self.table.rows[0])
+        np.testing.assert_allclose(self.table.lookup(100.0), self.table.rows[-1], atol=1e-12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,16 @@ class MockCar:
         self.pose = MockPose(pose_x, pose_y)
         self.sim_state = MockSimState(seq, cur_state)
         self.sim = MockSim(turn)
-        self.car_turn_path = {seq: {turn: [None, HeadingDirection.NORTH.value]}}
+        self.approach = MockApproach(HeadingDirection.NORTH.value)
         self.dynamic_state = MockDynamicState(speed)
 
+    def get_approach(self):
+        return self.approach
+
+class MockApproach:
+    def __init__(self, heading_direction):
+        self.heading_direction = heading_direction
+
 class MockPose:
     def __init__(self, x, y):
         self.x = x
@@ -85,7 +85,7 @@ class TestCoordinateTransform(unittest.TestCase):
     @patch('stop_and_go_cord_transform.RotateImage')
     @patch('stop_and_go_cord_transform.SubImage')
     def test_update_from_main_to_sub(self, MockSubImage, MockRotateImage):
-        window = MagicMock()
+        window = MagicMock(renders_camera_view=False)
         frame = 10
         image_name = sg.TRAFFIC_IMAGE_KEYWORD
         subimg_instance = MockSubImage.return_value
@@ -1,6 +1,11 @@
+import json
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
-from stop_and_go_data import Save_Sim_Flow_Data, Vehicle_State, Road_State
+import numpy as np
+from stop_and_go_data import JsonLinesFileManager, NpzColumnsFileManager, Save_Sim_Flow_Data, Vehicle_State, Road_State
 
 # test_stop_and_go_data.py
 
@@ -96,5 +101,91 @@ class TestSaveSimFlowData(unittest.TestCase):
         self.assertIsInstance(self.save_sim_flow_data.sim_data_dict_list[0][0.0][1], Vehicle_State)
         self.assertIsInstance(self.save_sim_flow_data.sim_data_dict_list[0][0.0][2], Road_State)
 
+
+class TestJsonLinesFileManager(unittest.TestCase):
+
+    def setUp(self):
+        self.json_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.json_dir, "Metadata.json.dat")
+
+    def tearDown(self):
+        shutil.rmtree(self.json_dir)
+
+    def test_frames_written_per_experiment(self):
+        json_manager = JsonLinesFileManager(self.filename)
+        json_manager.write_json({"seq_no": 0, "frame_no": 0, "traffic": [{"loc_x_p": 1.5}]})
+        json_manager.write_json({"seq_no": 0, "frame_no": 1, "traffic": []})
+        with open(self.filename) as json_file:
+            self.assertEqual(json_file.read(), "")
+        json_manager.end_experiment(0, True)
+        with open(self.filename) as json_file:
+            lines = json_file.read().splitlines()
+        self.assertEqual(lines[0], '{"frame_no":0,"seq_no":0,"traffic":[{"loc_x_p":1.5}]}')
+        self.assertEqual([json.loads(line)["frame_no"] for line in lines], [0, 1])
+        json_manager.close()
+
+    def test_rejected_and_unfinished_experiments_dropped(self):
+        json_manager = JsonLinesFileManager(self.filename)
+        json_manager.write_json({"seq_no": 0, "frame_no": 0})
+        json_manager.end_experiment(0, False)
+        json_manager.write_json({"seq_no": 0, "frame_no": 5})
+        json_manager.end_experiment(0, True)
+        json_manager.write_json({"seq_no": 1, "frame_no": 0})
+        json_manager.close()
+        with open(self.filename) as json_file:
+            self.assertEqual([json.loads(line) for line in json_file], [{"seq_no": 0, "frame_no": 5}])
+
+
+class TestNpzColumnsFileManager(unittest.TestCase):
+
+    def setUp(self):
+        self.json_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.json_dir, "Metadata.json.dat.npz")
+
+    def tearDown(self):
+        shutil.rmtree(self.json_dir)
+
+    def frame(self, seq_no, frame_no):
+        vehicle = {"loc_x_p": 1.25, "loc_y_p": 2.5, "width_p": 6.0, "length_p": 8.0, "heading_rad": 0.5,
+                   "speed_pps": float(frame_no), "acc_ppss": -1.0, "turn": "no"}
+        return {"seq_no": seq_no, "frame_no": frame_no, "ref_frame_no": 25, "pix_per_m": 1.0,
+                "sim_name": str(seq_no).zfill(5), "num_actors": 2,
+                "ref_state": dict(vehicle, turn="left"),
+                "traffic": [vehicle, dict(vehicle, turn="right", loc_x_p=3.75)],
+                "stop_signs": [{"loc_x_p": float(i), "loc_y_p": 0.0} for i in range(4)]}
+
+    def write_run(self, seq_nos):
+        json_manager = NpzColumnsFileManager(self.filename)
+        for seq_no in seq_nos:
+            for frame_no in range(3):
+                json_manager.write_json(self.frame(seq_no, frame_no))
+            json_manager.end_experiment(seq_no, True)
+        json_manager.close()
+
+    def test_typed_columns(self):
+        self.write_run([4, 5])
+        with np.load(self.filename) as columns:
+            np.testing.assert_array_equal(columns["seq_no"], [4, 4, 4, 5, 5, 5])
+            self.assertEqual(columns["frame_no"].dtype, np.int32)
+            self.assertEqual(columns["ref_state_speed_pps"].dtype, np.float32)
+            np.testing.assert_array_equal(columns["ref_state_speed_pps"], [0, 1, 2, 0, 1, 2])
+            np.testing.assert_array_equal(columns["traffic_loc_x_p"][0], [1.25, 3.75])
+            np.testing.assert_array_equal(columns["ref_state_turn"], [1] * 6)
+            np.testing.assert_array_equal(columns["traffic_turn"][0], [0, 2])
+            self.assertEqual(columns["stop_signs_loc_x_p"].shape, (6, 4))
+
+    def test_runs_appended_and_rejected_dropped(self):
+        self.write_run([0])
+        json_manager = NpzColumnsFileManager(self.filename)
+        json_manager.write_json(self.frame(1, 0))
+        json_manager.end_experiment(1, False)
+        json_manager.write_json(self.frame(1, 1))
+        json_manager.end_experiment(1, True)
+        json_manager.write_json(self.frame(2, 0))
+        json_manager.close()
+        with np.load(self.filename) as columns:
+            np.testing.assert_array_equal(columns["seq_no"], [0, 0, 0, 1])
+            np.testing.assert_array_equal(columns["frame_no"], [0, 1, 2, 1])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+import pygame
+import stop_and_go_globals as sg
+from stop_and_go_actors import Stop_Line
+from stop_and_go_cord_transform import CoordinateTransform
+from stop_and_go_data import Save_Sim_Flow_Data
+from stop_and_go_feasibility import (check_recorded_stop_lines, feasible_start_frames, is_experiment_feasible,
+                                     predict_valid_stop_lines, stop_lines_within_bounds, validate_last_time_key)
+from stop_and_go_intersection_rules import Intersection_Rule
+from stop_and_go_rotate_image import RotateImage
+from stop_and_go_scheduler import Event_Scheduler
+from stop_and_go_view import Camera, Frame_State
+from stop_and_go_world import World_State
+from test_stop_and_go_world import generate_scene
+
+def generate_stop_lines(path_list, shift=0):
+    """ Same stop lines as Generator.generate_stop_lines """
+    mid_x, mid_y = sg.WINDOW_WIDTH_PIXELS / 2 + shift, sg.WINDOW_LENGTH_PIXELS / 2 + shift
+    half, offset = sg.STOP_LINE_HOR_PIXELS / 2, sg.STOP_LINE_LEN_OFFSET
+    y0, x1 = path_list[0].start[1] + shift, path_list[1].start[0] + shift
+    y2, x3 = path_list[2].start[1] + shift, path_list[3].start[0] + shift
+    return [
+        Stop_Line(mid_x - offset, y0 - half, mid_x - offset, y0 + half, sg.STOP_LINE_WIDTH),
+        Stop_Line(x1 - half, mid_y - offset, x1 + half, mid_y - offset, sg.STOP_LINE_WIDTH),
+        Stop_Line(mid_x + offset, y2 - half, mid_x + offset, y2 + half, sg.STOP_LINE_WIDTH),
+        Stop_Line(x3 - half, mid_y + offset, x3 + half, mid_y + offset, sg.STOP_LINE_WIDTH),
+    ]
+
+def make_frame_state(start_frame):
+    return SimpleNamespace(start_frame=start_frame, ref_frame=start_frame + sg.DATASET_REF_FRAMES,
+                           end_frame=start_frame + sg.DATASET_SPAN_FRAMES)
+
+def record(car_list, path_list, stop_line_list, sprite_mid, frame_state):
+    scheduler = Event_Scheduler(Intersection_Rule(), World_State(car_list))
+    scheduler.advance(car_list, path_list, sprite_mid, frame_state.start_frame - 1)
+    save_sim_flow_data = Save_Sim_Flow_Data(len(car_list))
+    draw_status = False
+    while not draw_status:
+        scheduler.advance(car_list, path_list, sprite_mid, 1)
+        draw_status = save_sim_flow_data.populate_sim_data_car_seq(car_list, stop_line_list, frame_state)
+    return save_sim_flow_data
+
+def transformed_stop_lines_valid(save_sim_flow_data, car_list, path_list, frame_state):
+    """ Drawer.check_valid_stop_lines after the first frame is transformed """
+    camera = Camera(car_list)
+    frame = frame_state.start_frame
+    cur_time = round(frame * sg.TIME_INCREMENT_STEP, 1)
+    cord_trns = CoordinateTransform(0, frame, camera, car_list, path_list, frame_state, save_sim_flow_data)
+    _, _, heading_ang_rad = camera.get_camera_cur_pos(cur_time, frame_state.ref_frame / 10.0, save_sim_flow_data)
+    rotate_img_trns = RotateImage(car_list, path_list, save_sim_flow_data, heading_ang_rad)
+    rotate_img_trns.save_rotated_positions(cur_time, cord_trns.save_sub_positions(frame))
+    stop_line_states = save_sim_flow_data.sim_data_dict_list[sg.REFERENCE_CAR_SEQ - 1][cur_time][2].stop_line_states
+    return all(sg.STOP_LINE_GENERATE_MIN <= stop_line_state.center_x_p <= sg.STOP_LINE_GENERATE_MAX and
+               sg.STOP_LINE_GENERATE_MIN <= stop_line_state.center_y_p <= sg.STOP_LINE_GENERATE_MAX
+               for stop_line_state in stop_line_states)
+
+class TestFeasibility(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.window = pygame.display.set_mode((sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS))
+        self.frame_state = make_frame_state(450)
+        # The scenes have a stop line on each of the 4 paths
+        paths_patcher = patch.object(sg, "NUMBER_OF_PATHS", 4)
+        paths_patcher.start()
+        self.addCleanup(paths_patcher.stop)
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_validate_last_time_key_rejects_short_simulations(self):
+        car_list, _, _, _ = generate_scene(self.window, 0)
+        last_sim_time = max(car.sim.num_ticks for car in car_list) * car_list[0].sim.sim_time_increment_s
+        self.assertFalse(validate_last_time_key(last_sim_time, car_list))
+
+    def test_predict_rejects_stop_lines_out_of_view(self):
+        car_list, path_list, _, sprite_mid = generate_scene(self.window, 0)
+        ref_car = car_list[sg.REFERENCE_CAR_SEQ - 1]
+        stop_line_list = generate_stop_lines(path_list, shift=sg.WINDOW_WIDTH_PIXELS)
+        self.assertFalse(predict_valid_stop_lines(ref_car, stop_line_list, sprite_mid, self.frame_state))
+        self.assertFalse(is_experiment_feasible(car_list, stop_line_list, sprite_mid, self.frame_state))
+
+    def test_checks_match_transformed_stop_lines(self):
+        num_checked = 0
+        for seed in range(40):
+            car_list, path_list, _, sprite_mid = generate_scene(self.window, seed)
+            stop_line_list = generate_stop_lines(path_list)
+            if not validate_last_time_key(self.frame_state.end_frame / 10.0, car_list):
+                continue
+
+            predicted = predict_valid_stop_lines(car_list[0], stop_line_list, sprite_mid, self.frame_state)
+            save_sim_flow_data = record(car_list, path_list, stop_line_list, sprite_mid, self.frame_state)
+            recorded = check_recorded_stop_lines(save_sim_flow_data, car_list, stop_line_list, self.frame_state)
+            self.assertEqual(recorded,
+                             transformed_stop_lines_valid(save_sim_flow_data, car_list, path_list, self.frame_state))
+            # The prediction never rejects a valid experiment
+            self.assertTrue(predicted or not recorded)
+            num_checked += 1
+
+        self.assertGreater(num_checked, 0)
+
+    def test_feasible_start_frames_match_experiment_check(self):
+        frame_state = Frame_State(sg.DATASET_SPAN_FRAMES, sg.DATASET_MOVING_WINDOW, sg.DATASET_REF_FRAMES,
+                                  sg.DATASET_TOTAL_FRAMES, sg.DATASET_START_FRAMES, sg.DATASET_START_FRAME_DEV)
+        num_feasible = 0
+        for seed in range(10):
+            car_list, path_list, _, sprite_mid = generate_scene(self.window, seed)
+            stop_line_list = generate_stop_lines(path_list)
+            feasible = feasible_start_frames(car_list, stop_line_list, sprite_mid, frame_state)
+            for start_frame, start_frame_feasible in zip(frame_state.candidate_start_frames(), feasible):
+                frame_state.set_start_frame(int(start_frame))
+                self.assertEqual(start_frame_feasible,
+                                 is_experiment_feasible(car_list, stop_line_list, sprite_mid, frame_state))
+            num_feasible += feasible.sum()
+
+        self.assertGreater(num_feasible, 0)
+
+    def test_stop_lines_within_bounds(self):
+        low, high = sg.STOP_LINE_GENERATE_MIN, sg.STOP_LINE_GENERATE_MAX
+        self.assertTrue(stop_lines_within_bounds([(low, high), (high, low)]))
+        self.assertFalse(stop_lines_within_bounds([(low, high), (high + 1, low)]))
+        self.assertFalse(stop_lines_within_bounds([(low - 1, low)]))
+
+    def test_reset_frames_within_feasible_start_frames(self):
+        frame_state = Frame_State(sg.DATASET_SPAN_FRAMES, sg.DATASET_MOVING_WINDOW, sg.DATASET_REF_FRAMES,
+                                  sg.DATASET_TOTAL_FRAMES, sg.DATASET_START_FRAMES, sg.DATASET_START_FRAME_DEV)
+        start_frames = frame_state.candidate_start_frames()
+        feasible = (start_frames >= 600) & (start_frames < 610)
+        for _ in range(20):
+            frame_state.reset_frames_within(feasible)
+            self.assertIn(frame_state.start_frame, range(600, 610))
+            self.assertEqual(frame_state.ref_frame, frame_state.start_frame + sg.DATASET_REF_FRAMES)
+            self.assertEqual(frame_state.end_frame, frame_state.start_frame + sg.DATASET_SPAN_FRAMES)
+
+        # Falls back to the uniform draw
+        frame_state.reset_frames_within(np.zeros(len(start_frames), dtype=bool))
+        self.assertIn(frame_state.start_frame, start_frames)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from stop_and_go_image_writer import Image_Files, Image_Shards, Image_Tensor, Image_Writer, decode_mask_rle, encode_mask_rle
+
+class TestImageWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.image_dir = tempfile.mkdtemp()
+        self.images = [np.full((16, 16, 3), value, dtype=np.uint8) for value in range(0, 250, 10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.image_dir)
+
+    def image_name(self, index):
+        return os.path.join(self.image_dir, "image_{:03d}.png".format(index))
+
+    def test_flush_writes_all_images(self):
+        for num_threads in (0, 3):
+            image_writer = Image_Writer(num_threads, queue_size=2)
+            for index, image in enumerate(self.images):
+                image_writer.write(self.image_name(index), image)
+            image_writer.flush()
+            for index, image in enumerate(self.images):
+                np.testing.assert_array_equal(cv2.imread(self.image_name(index)), image)
+            image_writer.close()
+            self.assertEqual(image_writer.images_written, len(self.images))
+
+    def test_view_is_copied_before_queued(self):
+        image_writer = Image_Writer(2, queue_size=4)
+        canvas = np.full((32, 32, 3), 100, dtype=np.uint8)
+        image_writer.write(self.image_name(0), canvas[8:24, 8:24])
+        canvas[:] = 0
+        image_writer.close()
+        self.assertTrue((cv2.imread(self.image_name(0)) == 100).all())
+
+    def test_flush_raises_write_error(self):
+        image_writer = Image_Writer(2, queue_size=4)
+        image_writer.write(os.path.join(self.image_dir, "missing", "image.png"), self.images[0])
+        image_writer.write(self.image_name(0), self.images[0])
+        with self.assertRaises(IOError):
+            image_writer.flush()
+        # The error is reported once
+        image_writer.flush()
+        image_writer.close()
+        self.assertTrue(os.path.exists(self.image_name(0)))
+
+    def test_kept_images_handed_over_once(self):
+        image_writer = Image_Writer(2, queue_size=4, keep_keywords=("_ref_",))
+        canvas = np.zeros((32, 32), dtype=np.uint8)
+        canvas[0, 0] = 255
+        ref_name = os.path.join(self.image_dir, "stop_00001_ref_000000.jpg")
+        lanes_name = os.path.join(self.image_dir, "stop_00001_LANES_000000.jpg")
+        image_writer.write(ref_name, canvas[:16, :16])
+        image_writer.write(lanes_name, self.images[1])
+        canvas[:] = 0
+        self.assertEqual(list(image_writer.kept), [ref_name])
+        # The kept mask is exact, the jpeg read back from the file isn't
+        kept = image_writer.read(ref_name)
+        self.assertEqual(kept.shape, (16, 16, 3))
+        self.assertEqual(kept[0, 0, 0], 255)
+        self.assertFalse(kept[1:, 1:].any())
+        self.assertNotEqual(image_writer.read(ref_name)[0, 1, 0], 0)
+        image_writer.close()
+
+    def test_kept_images_of_rejected_experiment_dropped(self):
+        image_writer = Image_Writer(0, queue_size=4, keep_keywords=("_ref_",))
+        for exp_no in (1, 2):
+            image_writer.write(os.path.join(self.image_dir, "stop_{:05d}_ref_000000.png".format(exp_no)), self.images[2])
+        image_writer.end_experiment(2, complete=False)
+        self.assertEqual(list(image_writer.kept), [os.path.join(self.image_dir, "stop_00001_ref_000000.png")])
+        image_writer.close()
+        self.assertEqual(image_writer.kept, {})
+
+    def test_close_stops_threads(self):
+        image_writer = Image_Writer(3, queue_size=4)
+        threads = list(image_writer.threads)
+        image_writer.close()
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+
+class TestMaskRle(unittest.TestCase):
+
+    def setUp(self):
+        self.mask = np.zeros((6, 5), dtype=np.uint8)
+        self.mask[0, 0] = 255
+        self.mask[2:5, 1:3] = 255
+        self.mask[5, 4] = 255
+
+    def test_round_trip(self):
+        for mask in (self.mask, np.zeros((4, 3), np.uint8), np.full((3, 4), 255, np.uint8)):
+            np.testing.assert_array_equal(decode_mask_rle(encode_mask_rle(mask)), mask)
+
+    def test_round_trip_of_rotated_mask(self):
+        # A turning reference car rotates the sub image with linear interpolation
+        mask = np.zeros((64, 64), dtype=np.uint8)
+        mask[12:52, 12:52] = 255
+        rotation = cv2.getRotationMatrix2D((32, 32), 30, 1.0)
+        mask = cv2.warpAffine(mask, rotation, (64, 64), flags=cv2.INTER_LINEAR)
+        mask[0, 0] = 20
+        self.assertGreater(len(np.unique(mask)), 2)
+        np.testing.assert_array_equal(decode_mask_rle(encode_mask_rle(mask)), np.where(mask > 0, 255, 0))
+
+    def test_coco_run_order(self):
+        counts = np.frombuffer(encode_mask_rle(self.mask), "<u4")
+        # Column by column, starting with the run of zeros before the first pixel
+        np.testing.assert_array_equal(counts, [6, 5, 0, 1, 7, 3, 3, 3, 12, 1])
+
+    def test_files_read_as_bgr(self):
+        image_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(image_dir, "stop_00000_ref_000000.rle")
+            mask = np.zeros((64, 64), dtype=np.uint8)
+            mask[10:20, 30:40] = 255
+            Image_Files().write(filename, mask)
+            self.assertLess(os.path.getsize(filename), mask.size // 8)
+            np.testing.assert_array_equal(Image_Files().read(filename), cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR))
+            with self.assertRaises(ValueError):
+                Image_Files().write(filename, cv2.cvtColor(self.mask, cv2.COLOR_GRAY2BGR))
+        finally:
+            shutil.rmtree(image_dir)
+
+class TestImageShards(unittest.TestCase):
+
+    def setUp(self):
+        self.image_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.image_dir)
+
+    def image_name(self, exp_no, frame):
+        return os.path.join(self.image_dir, "stop_{:05d}_ref_{:06d}.png".format(exp_no, frame))
+
+    def image(self, exp_no, frame):
+        return np.full((16, 16, 3), exp_no * 10 + frame, dtype=np.uint8)
+
+    def write_experiment(self, image_writer, exp_no, complete=True):
+        for frame in range(3):
+            image_writer.write(self.image_name(exp_no, frame), self.image(exp_no, frame))
+        image_writer.end_experiment(exp_no, complete)
+
+    def test_shards_named_by_experiment_range(self):
+        image_writer = Image_Writer(2, queue_size=4, output=Image_Shards(self.image_dir, max_bytes=4000))
+        for exp_no in range(5):
+            self.write_experiment(image_writer, exp_no)
+        image_writer.close()
+
+        shards = sorted(os.listdir(self.image_dir))
+        self.assertEqual(shards, ["stop_00000_00001.tar", "stop_00002_00003.tar", "stop_00004_00004.tar"])
+        with tarfile.open(os.path.join(self.image_dir, shards[0])) as tar:
+            self.assertEqual(
+                tar.getnames(), [os.path.basename(self.image_name(exp_no, frame)) for exp_no in (0, 1) for frame in range(3)]
+            )
+            image = cv2.imdecode(np.frombuffer(tar.extractfile(tar.getnames()[4]).read(), np.uint8), cv2.IMREAD_COLOR)
+            np.testing.assert_array_equal(image, self.image(1, 1))
+
+    def test_read_from_open_shard_and_pending_images(self):
+        image_writer = Image_Writer(2, queue_size=4, output=Image_Shards(self.image_dir, max_bytes=2 ** 20))
+        self.write_experiment(image_writer, 0)
+        image_writer.write(self.image_name(1, 0), self.image(1, 0))
+        np.testing.assert_array_equal(image_writer.read(self.image_name(0, 2)), self.image(0, 2))
+        np.testing.assert_array_equal(image_writer.read(self.image_name(1, 0)), self.image(1, 0))
+        self.assertIsNone(image_writer.read(self.image_name(1, 1)))
+        image_writer.close()
+        self.assertEqual(os.listdir(self.image_dir), ["stop_00000_00000.tar"])
+
+    def test_rejected_experiment_dropped(self):
+        image_writer = Image_Writer(0, queue_size=4, output=Image_Shards(self.image_dir, max_bytes=2 ** 20))
+        self.write_experiment(image_writer, 0, complete=False)
+        self.write_experiment(image_writer, 0)
+        # An image written again replaces the earlier one
+        image_writer.write(self.image_name(1, 0), self.image(1, 1))
+        image_writer.write(self.image_name(1, 0), self.image(1, 0))
+        image_writer.end_experiment(1)
+        image_writer.close()
+
+        with tarfile.open(os.path.join(self.image_dir, "stop_00000_00001.tar")) as tar:
+            self.assertEqual(len(tar.getnames()), 4)
+        self.assertIsNone(image_writer.read(self.image_name(2, 0)))
+        np.testing.assert_array_equal(image_writer.read(self.image_name(1, 0)), self.image(1, 0))
+
+class TestImageTensor(unittest.TestCase):
+
+    def setUp(self):
+        self.image_dir = tempfile.mkdtemp()
+        self.output = Image_Tensor(self.image_dir, 10, 13, num_frames=4, height=8, width=6)
+
+    def tearDown(self):
+        shutil.rmtree(self.image_dir)
+
+    def image_name(self, exp_no, keyword, frame):
+        return os.path.join(self.image_dir, "stop_{:05d}{}{:06d}.jpg".format(exp_no, keyword, frame))
+
+    def test_images_written_into_their_slots(self):
+        image_writer = Image_Writer(2, queue_size=4, output=self.output)
+        for exp_no in range(10, 13):
+            for frame in range(4):
+                image_writer.write(self.image_name(exp_no, "_ref_", frame), np.full((8, 6), exp_no + frame, np.uint8))
+                image_writer.write(self.image_name(exp_no, "_traffic_", frame), np.full((8, 6), frame, np.uint8))
+            image_writer.write(self.image_name(exp_no, "_LANES_", 0), np.full((8, 6, 3), exp_no, np.uint8))
+            image_writer.end_experiment(exp_no)
+        np.testing.assert_array_equal(image_writer.read(self.image_name(11, "_ref_", 2)), np.full((8, 6, 3), 13))
+        image_writer.close()
+
+        ref = np.load(os.path.join(self.image_dir, "stop_00010_00012_ref.npy"), mmap_mode="r")
+        traffic = np.load(os.path.join(self.image_dir, "stop_00010_00012_traffic.npy"), mmap_mode="r")
+        lanes = np.load(os.path.join(self.image_dir, "stop_00010_00012_lanes.npy"), mmap_mode="r")
+        self.assertEqual(ref.shape, (3, 4, 8, 6))
+        self.assertEqual(lanes.shape, (3, 8, 6, 3))
+        np.testing.assert_array_equal(ref[:, :, 0, 0], np.arange(10, 13)[:, None] + np.arange(4))
+        np.testing.assert_array_equal(traffic[:, :, 0, 0], np.tile(np.arange(4), (3, 1)))
+        np.testing.assert_array_equal(lanes[:, 0, 0, 0], np.arange(10, 13))
+
+    def test_rejected_experiment_cleared(self):
+        self.output.write(self.image_name(11, "_ref_", 3), np.full((8, 6), 255, np.uint8))
+        self.output.end_experiment(11, complete=False)
+        self.assertFalse(self.output.read(self.image_name(11, "_ref_", 3)).any())
+
+    def test_image_without_slot_raises(self):
+        image_writer = Image_Writer(2, queue_size=4, output=self.output)
+        image_writer.write(self.image_name(13, "_ref_", 0), np.zeros((8, 6), np.uint8))
+        with self.assertRaises(ValueError):
+            image_writer.flush()
+        image_writer.write(self.image_name(10, "_sub_", 0), np.zeros((8, 6), np.uint8))
+        with self.assertRaises(ValueError):
+            image_writer.flush()
+        image_writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
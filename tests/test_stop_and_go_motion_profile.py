@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from stop_and_go_motion_profile import Motion_Profile
+from stop_and_go_sim import Sim, Config_manager
+from stop_and_go_data_type import CarState
+
+class TestMotionProfile(unittest.TestCase):
+
+    def setUp(self):
+        # Cruise 10 s at 5 m/s, decel 5 s at -1, stop 1 s, accel 2 s at 4, cruise after at 8 m/s
+        self.profile = Motion_Profile(62.5, 100.0, 5.0, -1.0, 1.0, 4.0, 8.0, 1.0)
+
+    def test_phase_boundaries(self):
+        np.testing.assert_allclose(self.profile.phase_start_time, [0.0, 10.0, 15.0, 16.0, 18.0, 29.5])
+        np.testing.assert_allclose(self.profile.phase_start_pos, [0.0, 50.0, 62.5, 62.5, 70.5, 162.5])
+        self.assertEqual(self.profile.end_time_s, 29.5)
+
+    def test_scalar_query(self):
+        state, position, speed, accl = self.profile.query(12.0)
+        self.assertEqual(state, CarState.DECEL.value)
+        self.assertAlmostEqual(position, 50.0 + 10.0 - 2.0)
+        self.assertAlmostEqual(speed, 3.0)
+        self.assertAlmostEqual(accl, -1.0)
+        self.assertEqual(self.profile.state(15.5), CarState.STOP.value)
+        self.assertAlmostEqual(self.profile.speed(17.0), 4.0)
+        self.assertAlmostEqual(self.profile.position(30.0), 166.5)
+        self.assertEqual(self.profile.state(30.0), CarState.PAST_SIM.value)
+
+    def test_array_query(self):
+        times = np.array([-1.0, 0.0, 5.0, 16.0, 20.0])
+        states = self.profile.state(times)
+        np.testing.assert_array_equal(states, [0, 0, 0, 3, 4])
+        np.testing.assert_allclose(self.profile.position(times), [0.0, 0.0, 25.0, 62.5, 86.5])
+
+    def test_sim_profile_matches_tick_columns(self):
+        np.random.seed(2)
+        sim = Sim(Config_manager(), 3, 0.5)
+        positions = sim.motion_profile.position(np.arange(sim.num_ticks) * sim.sim_time_increment_s)
+        self.assertLess(np.abs(positions - sim.tick_total_dist).max(), 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
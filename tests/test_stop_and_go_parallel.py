@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_data import append_columns
+from stop_and_go_data_type import OptionChoice
+from stop_and_go_parallel import merge_metadata, run_parallel, split_experiment_range
+
+def write_experiment_numbers(dataset_storage_choice):
+    """ Stands in for stop_and_go_main.run_experiments """
+    with open(sg.OUPUT_JSON_FILENAME, "a+") as json_file:
+        for exp_no in range(sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS):
+            json_file.write("{}\n".format(exp_no))
+
+class TestParallelRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_split_covers_range(self):
+        shards = split_experiment_range(3, 20, 5, "meta")
+        self.assertEqual(len(shards), 5)
+        self.assertEqual(shards[0].exp_start, 3)
+        self.assertEqual(shards[-1].exp_stop, 20)
+        for shard, next_shard in zip(shards, shards[1:]):
+            self.assertEqual(shard.exp_stop, next_shard.exp_start)
+        sizes = [shard.exp_stop - shard.exp_start for shard in shards]
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+        self.assertEqual(len(set(shard.json_filename for shard in shards)), 5)
+
+    def test_split_more_shards_than_experiments(self):
+        shards = split_experiment_range(0, 2, 8, "meta")
+        self.assertEqual([(shard.exp_start, shard.exp_stop) for shard in shards], [(0, 1), (1, 2)])
+
+    def test_merge_appends_in_shard_order(self):
+        with open("meta", "w") as json_file:
+            json_file.write("old\n")
+        shards = split_experiment_range(0, 3, 3, "meta")
+        for shard in reversed(shards):
+            with open(shard.json_filename, "w") as shard_file:
+                shard_file.write("{}\n".format(shard.exp_start))
+        merge_metadata(shards, "meta")
+        with open("meta") as json_file:
+            self.assertEqual(json_file.read().split(), ["old", "0", "1", "2"])
+        self.assertFalse(any(os.path.exists(shard.json_filename) for shard in shards))
+
+    @patch.object(sg, "OUTPUT_JSON_FORMAT", sg.JSON_FORMAT_COLUMNS)
+    def test_merge_concatenates_columns(self):
+        append_columns("meta.npz", [{"seq_no": np.array([7], np.int32)}])
+        shards = split_experiment_range(0, 3, 3, "meta")
+        for shard in shards:
+            append_columns(shard.json_filename + ".npz", [{"seq_no": np.array([shard.exp_start] * 2, np.int32)}])
+        merge_metadata(shards, "meta")
+        with np.load("meta.npz") as npz_file:
+            np.testing.assert_array_equal(npz_file["seq_no"], [7, 0, 0, 1, 1, 2, 2])
+        self.assertFalse(any(os.path.exists(shard.json_filename + ".npz") for shard in shards))
+
+    def test_run_parallel_merges_in_experiment_order(self):
+        saved = (sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, sg.BASE_SEED)
+        sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, sg.BASE_SEED = 2, 13, 5
+        try:
+            run_parallel(write_experiment_numbers, OptionChoice.JSON_OPTION, 2)
+        finally:
+            sg.START_EXPERIMENT_NUMBER, sg.TOTAL_DATA_POINTS, sg.BASE_SEED = saved
+
+        with open(sg.OUPUT_JSON_FILENAME) as json_file:
+            self.assertEqual([int(line) for line in json_file], list(range(2, 13)))
+
+    def test_tetrys_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_parallel(write_experiment_numbers, OptionChoice.TETRYS_OPTION, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from stop_and_go_profile_cache import Profile_Cache
+from stop_and_go_sim import Sim, Config_manager
+
+class TestProfileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = Profile_Cache(2, 0.5, 0.5, 0.5)
+        self.config_manager = Config_manager()
+
+    def test_lru_eviction(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.put("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_hit_rate(self):
+        self.assertEqual(self.cache.hit_rate(), 0.0)
+        self.cache.put("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_rate(), 0.5)
+
+    def test_sims_share_quantized_profile(self):
+        params = {
+            "accl_after_stop_mpss": 8.1,
+            "decel_before_stop_mpss": -1.4,
+            "speed_before_stop_mps": 5.6,
+            "speed_after_stop_mps": 9.1,
+            "turn": 0,
+        }
+        sim1 = Sim(self.config_manager, 1, 0.6, params, self.cache)
+        params.update(accl_after_stop_mpss=7.9, speed_before_stop_mps=5.4, turn=1)
+        sim2 = Sim(self.config_manager, 1, 0.4, params, self.cache)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertIs(sim1.tick_total_dist, sim2.tick_total_dist)
+        self.assertEqual(sim2.speed_before_stop_mps, 5.5)
+        self.assertEqual(sim2.time_stopped_s, 0.5)
+        self.assertEqual(sim2.turn, 1)
+        self.assertEqual(sim2.num_ticks, sim1.num_ticks)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Profile_Cache.from_config(self.config_manager))
+
+if __name__ == '__main__':
+    unittest.main()
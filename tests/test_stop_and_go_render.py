@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_render import Numpy_Canvas, Pygame_Canvas, Viewport_Canvas, create_canvas
+from stop_and_go_rotate_image import RotateImage
+from stop_and_go_subimage import SubImage
+
+def draw_scene(canvas):
+    """ Stop area, paths, a stop line and an axis aligned car as drawn by the Drawer """
+    canvas.fill(sg.BLACK)
+    canvas.rect(sg.GREEN, (236.3, 236.7, 40, 40))
+    canvas.line(sg.WHITE, (0, 262.0), (sg.WINDOW_WIDTH_PIXELS, 262.0), sg.PATH_LINE_WIDTH)
+    canvas.line(sg.WHITE, (250.0, 0), (250.0, sg.WINDOW_LENGTH_PIXELS), sg.PATH_LINE_WIDTH)
+    canvas.line(sg.RED, (237.0, 256.0), (237.0, 268.0), sg.STOP_LINE_WIDTH)
+    canvas.polygon(sg.BLUE, [(100.2, 259.6), (108.2, 259.6), (108.2, 265.6), (100.2, 265.6)])
+
+class TestNumpyCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = Numpy_Canvas(sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS)
+
+    def test_colors_are_bgr(self):
+        self.canvas.fill(sg.BLUE)
+        image = self.canvas.to_array()
+        self.assertEqual(image.shape, (sg.WINDOW_LENGTH_PIXELS, sg.WINDOW_WIDTH_PIXELS, 3))
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertEqual(tuple(image[10, 20]), (255, 0, 0))
+
+    def test_rect_is_clipped(self):
+        self.canvas.fill(sg.BLACK)
+        self.canvas.rect(sg.WHITE, (-5, 500, 10, 40))
+        lit = np.argwhere(self.canvas.to_array()[:, :, 0] > 0)
+        self.assertEqual(len(lit), 5 * 12)
+        self.assertEqual(tuple(lit.min(axis=0)), (500, 0))
+        self.assertEqual(tuple(lit.max(axis=0)), (511, 4))
+
+    def test_wide_line_has_no_caps(self):
+        self.canvas.fill(sg.BLACK)
+        self.canvas.line(sg.WHITE, (100.0, 262.0), (200.0, 262.0), 3)
+        lit = np.argwhere(self.canvas.to_array()[:, :, 0] > 0)
+        self.assertEqual(tuple(lit.min(axis=0)), (261, 100))
+        self.assertEqual(tuple(lit.max(axis=0)), (263, 200))
+
+class TestViewportCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = Numpy_Canvas(sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS)
+        self.view = Viewport_Canvas(sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS)
+
+    def camera_view_of_frame(self, camera_pos_x, camera_pos_y, rotation_degree=None):
+        """ Camera view cropped and rotated from the whole frame """
+        sub_window_image, _ = SubImage().create_subimage(self.frame, camera_pos_x, camera_pos_y)
+        sub_window_image = np.ascontiguousarray(sub_window_image)
+        if rotation_degree is not None:
+            sub_window_image = RotateImage(None, None, None, 0).get_rotated_image(sub_window_image, rotation_degree)
+        return sub_window_image
+
+    def test_matches_crop_of_frame(self):
+        self.view.set_view(260, 250)
+        draw_scene(self.frame)
+        draw_scene(self.view)
+        self.assertEqual(self.view.to_array().shape, (sg.SUB_IMAGE_LENGTH, sg.SUB_IMAGE_WIDTH, 3))
+        np.testing.assert_array_equal(self.view.to_array(), self.camera_view_of_frame(260, 250))
+
+    def test_matches_right_angle_rotation_of_frame(self):
+        self.view.set_view(260, 250, 90.0)
+        draw_scene(self.frame)
+        draw_scene(self.view)
+        np.testing.assert_array_equal(self.view.to_array(), self.camera_view_of_frame(260, 250, 90.0))
+
+    def test_black_outside_frame(self):
+        self.view.set_view(20, 250)
+        self.frame.fill(sg.WHITE)
+        self.view.fill(sg.WHITE)
+        np.testing.assert_array_equal(self.view.to_array(), self.camera_view_of_frame(20, 250))
+        self.assertFalse(self.view.to_array()[:, : sg.SUB_IMAGE_WIDTH // 2 - 20].any())
+
+    def test_culls_primitives_out_of_view(self):
+        self.view.set_view(100, 100)
+        self.view.fill(sg.BLACK)
+        self.view.polygon(sg.BLUE, [(400.0, 400.0), (408.0, 400.0), (408.0, 406.0), (400.0, 406.0)])
+        self.assertFalse(self.view.image.any())
+
+class TestPygameCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = Pygame_Canvas(sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS)
+
+    def tearDown(self):
+        self.canvas.close()
+
+    def test_numpy_canvas_matches_axis_aligned_drawing(self):
+        numpy_canvas = Numpy_Canvas(sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS)
+        draw_scene(self.canvas)
+        draw_scene(numpy_canvas)
+        np.testing.assert_array_equal(self.canvas.to_array(), numpy_canvas.to_array())
+
+class TestCreateCanvas(unittest.TestCase):
+
+    def test_backend_switch(self):
+        with patch.object(sg, "RENDER_BACKEND", sg.RENDER_BACKEND_NUMPY):
+            self.assertIsInstance(create_canvas(), Numpy_Canvas)
+        with patch.object(sg, "RENDER_BACKEND", sg.RENDER_BACKEND_VIEWPORT):
+            self.assertIsInstance(create_canvas(), Viewport_Canvas)
+
+    def test_pygame_is_required_by_pygame_backend(self):
+        with patch.object(sg, "RENDER_BACKEND", sg.RENDER_BACKEND_PYGAME), \
+                patch("stop_and_go_render.pygame", None):
+            with self.assertRaises(ImportError):
+                create_canvas()
+
+    def test_unknown_backend(self):
+        with patch.object(sg, "RENDER_BACKEND", "sdl"):
+            with self.assertRaises(ValueError):
+                create_canvas()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+from stop_and_go_sampler import experiment_rng, truncated_normal, Sim_Param_Sampler, SIM_PARAM_NAMES
+from stop_and_go_sim import Config_manager
+
+class TestTruncatedNormal(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(11)
+
+    def test_values_within_bounds(self):
+        values = truncated_normal(0.0, 1.0, -0.5, 0.5, 1000)
+        self.assertEqual(values.shape, (1000,))
+        self.assertTrue(np.all((values > -0.5) & (values < 0.5)))
+
+    def test_tight_bounds_far_from_mean(self):
+        values = truncated_normal(0.0, 1.0, 3.0, 3.1, 50)
+        self.assertTrue(np.all((values > 3.0) & (values < 3.1)))
+
+    def test_broadcast_shape(self):
+        values = truncated_normal(np.array([[0.0], [10.0]]), np.array([1.0, 2.0]), np.array([[-1.0], [9.0]]), np.inf)
+        self.assertEqual(values.shape, (2, 2))
+        self.assertTrue(np.all(values[1] > 9.0))
+
+    def test_empty_interval_raises(self):
+        with self.assertRaises(ValueError):
+            truncated_normal(0.0, 1.0, 1.0, 1.0, 5)
+
+    def test_unreachable_interval_raises(self):
+        with self.assertRaises(ValueError):
+            truncated_normal(0.0, 1.0, 50.0, 51.0, 5, max_retries=3)
+
+class TestSimParamSampler(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(5)
+        self.config_manager = Config_manager()
+        self.sampler = Sim_Param_Sampler(self.config_manager)
+
+    def test_car_params_within_config_bounds(self):
+        params = self.sampler.sample_car_params(1, 200)
+        self.assertEqual(set(params), set(SIM_PARAM_NAMES))
+        self.assertTrue(np.all((params["accl_after_stop_mpss"] > 0.5) & (params["accl_after_stop_mpss"] < 10)))
+        self.assertTrue(np.all((params["decel_before_stop_mpss"] > -4) & (params["decel_before_stop_mpss"] < -1)))
+        self.assertTrue(np.all(params["speed_before_stop_mps"] > 1))
+        self.assertTrue(np.all(params["speed_after_stop_mps"] > 1))
+        self.assertTrue(np.all(np.isin(params["turn"], [0, 1, 2])))
+
+    def test_car_can_stop_before_stop_line(self):
+        params = self.sampler.sample_car_params(2, 200)
+        speed = params["speed_before_stop_mps"]
+        decel_dist = -(speed * speed) / (2 * params["decel_before_stop_mpss"])
+        self.assertTrue(np.all(decel_dist <= 229))
+
+    def test_time_stopped_positive(self):
+        self.assertTrue(np.all(self.sampler.sample_time_stopped(100) > 0))
+
+class TestExperimentRng(unittest.TestCase):
+
+    def test_matches_spawned_seed_sequence(self):
+        children = np.random.SeedSequence(1234).spawn(6)
+        for exp_no in (0, 5):
+            expected = np.random.default_rng(children[exp_no]).random(4)
+            np.testing.assert_array_equal(experiment_rng(1234, exp_no).random(4), expected)
+
+    def test_sampling_ignores_global_state(self):
+        config_manager = Config_manager()
+        samples = []
+        for global_seed in (0, 1):
+            np.random.seed(global_seed)
+            sampler = Sim_Param_Sampler(config_manager, experiment_rng(7, 3))
+            samples.append((sampler.sample_car_params(1, 10), sampler.sample_time_stopped(3)))
+
+        for name in SIM_PARAM_NAMES:
+            np.testing.assert_array_equal(samples[0][0][name], samples[1][0][name])
+        np.testing.assert_array_equal(samples[0][1], samples[1][1])
+
+        other = Sim_Param_Sampler(config_manager, experiment_rng(7, 4)).sample_car_params(1, 10)
+        self.assertFalse(np.array_equal(other["speed_after_stop_mps"], samples[0][0]["speed_after_stop_mps"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import pygame
+import stop_and_go_globals as sg
+from stop_and_go_intersection_rules import Intersection_Rule
+from stop_and_go_scheduler import Event_Scheduler
+from stop_and_go_world import World_State
+from test_stop_and_go_world import generate_scene
+
+def car_states(car_list):
+    return [(car.pose.x, car.pose.y, car.time_index, car.stop_time_index, car.sim_state.dp, car.sim_state.cur_state,
+             car.sim_state.end, car.sim_state.overlap, car.dynamic_state.speed, car.dynamic_state.accl)
+            for car in car_list]
+
+class TestEventScheduler(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.window = pygame.display.set_mode((sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_advance_matches_per_tick_update(self):
+        for seed in range(3):
+            car_list, path_list, _, sprite_mid = generate_scene(self.window, seed)
+            rule = Intersection_Rule()
+            expected = []
+            while not all(car.sim_state.end for car in car_list):
+                rule.update_cars_through_intersection(car_list, sprite_mid)
+                for car in car_list:
+                    car.update_car_position(path_list, sprite_mid)
+                    car.check_outside_boundary()
+                expected.append(car_states(car_list))
+
+            car_list, path_list, _, sprite_mid = generate_scene(self.window, seed)
+            scheduler = Event_Scheduler(Intersection_Rule(), World_State(car_list))
+            num_ticks = 0
+            for chunk in (1, 250, 37, 2000):
+                num_ticks += scheduler.advance(car_list, path_list, sprite_mid, chunk)
+                self.assertEqual(car_states(car_list), expected[num_ticks - 1])
+
+            # Stops after the tick all the cars reach the end
+            self.assertEqual(num_ticks, len(expected))
+            self.assertGreater(scheduler.free_ticks, scheduler.event_ticks)
+
+    def test_no_free_flight_with_waiting_car(self):
+        car_list, path_list, _, sprite_mid = generate_scene(self.window, 0)
+        scheduler = Event_Scheduler(Intersection_Rule(), World_State(car_list))
+        self.assertTrue(scheduler.is_free_flight(car_list))
+        car_list[1].sim_state.stop_car = True
+        self.assertFalse(scheduler.is_free_flight(car_list))
+
+if __name__ == '__main__':
+    unittest.main()
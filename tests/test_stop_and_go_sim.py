@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from stop_and_go_sim import Sim, Config_manager
+from stop_and_go_data_type import CarState
+
+class TestSim(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(7)
+        self.config_manager = Config_manager()
+        self.sim = Sim(self.config_manager, 1, 0.5)
+
+    def test_tick_columns_have_same_length(self):
+        self.assertGreater(self.sim.num_ticks, 0)
+        for column in (self.sim.tick_state, self.sim.tick_delta_dist, self.sim.tick_total_dist,
+                       self.sim.tick_speed, self.sim.tick_accl):
+            self.assertEqual(len(column), self.sim.num_ticks)
+
+    def test_phases_are_in_order(self):
+        states = self.sim.tick_state
+        self.assertEqual(states[0], CarState.CRUISE.value)
+        self.assertEqual(states[-1], CarState.PAST_SIM.value)
+        self.assertTrue(np.all(np.diff(states) >= 0))
+
+    def test_stop_phase_has_no_motion(self):
+        stopped = self.sim.tick_state == CarState.STOP.value
+        self.assertTrue(np.any(stopped))
+        self.assertTrue(np.all(self.sim.tick_speed[stopped] == 0.0))
+        self.assertTrue(np.all(self.sim.tick_delta_dist[stopped] == 0.0))
+
+    def test_delta_dist_adds_up_to_total_dist(self):
+        accel = self.sim.tick_state == CarState.ACCEL.value
+        self.assertTrue(np.all(self.sim.tick_delta_dist[accel] > 0))
+        np.testing.assert_allclose(np.cumsum(self.sim.tick_delta_dist), self.sim.tick_total_dist, atol=5e-2)
+
+    def test_regenerate_resets_columns(self):
+        num_ticks = self.sim.num_ticks
+        self.sim.generate_simulation_data()
+        self.assertEqual(len(self.sim.tick_state), self.sim.num_ticks)
+        self.assertNotEqual(self.sim.num_ticks, 0)
+        self.assertGreater(num_ticks, 0)
+
+    def test_time_to_tick(self):
+        self.assertEqual(self.sim.time_to_tick(0.0), 0)
+        self.assertEqual(self.sim.time_to_tick(12.3), 123)
+        self.assertEqual(self.sim.time_to_tick(0.1 + 0.2), 3)
+
+    def test_is_valid_tick(self):
+        self.assertTrue(self.sim.is_valid_tick(0))
+        self.assertTrue(self.sim.is_valid_tick(self.sim.num_ticks - 1))
+        self.assertFalse(self.sim.is_valid_tick(self.sim.num_ticks))
+        self.assertFalse(self.sim.is_valid_tick(-1))
+
+    def test_dist_travel_at_sec(self):
+        self.assertEqual(self.sim.dist_travel_at_sec(1.0), self.sim.tick_total_dist[10])
+
+if __name__ == '__main__':
+    unittest.main()
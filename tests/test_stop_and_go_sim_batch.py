@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from stop_and_go_sim import Config_manager
+from stop_and_go_sim_batch import Sim_Batch
+from stop_and_go_data_type import CarState
+
+class TestSimBatch(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(3)
+        self.batch = Sim_Batch(Config_manager(), 5)
+
+    def test_padded_shapes(self):
+        shape = self.batch.tick_state.shape
+        self.assertEqual(shape[:2], (5, 4))
+        self.assertEqual(shape[2], self.batch.num_ticks.max())
+        for column in (self.batch.tick_delta_dist, self.batch.tick_total_dist, self.batch.tick_speed,
+                       self.batch.tick_accl, self.batch.tick_mask):
+            self.assertEqual(column.shape, shape)
+        np.testing.assert_array_equal(self.batch.tick_mask.sum(axis=2), self.batch.num_ticks)
+
+    def test_padding_is_masked(self):
+        self.assertTrue(np.all(self.batch.tick_state[~self.batch.tick_mask] == -1))
+        self.assertTrue(np.all(self.batch.tick_state[self.batch.tick_mask] >= CarState.CRUISE.value))
+
+    def test_sampled_params_within_bounds(self):
+        params = self.batch.sim_params
+        self.assertTrue(np.all((params["accl_after_stop_mpss"] > 0.5) & (params["accl_after_stop_mpss"] < 10)))
+        self.assertTrue(np.all((params["decel_before_stop_mpss"] <= -1) & (params["decel_before_stop_mpss"] >= -4)))
+        self.assertTrue(np.all(params["speed_before_stop_mps"] > 1))
+        self.assertTrue(np.all(params["speed_after_stop_mps"] > 1))
+        self.assertTrue(np.all(self.batch.time_stopped > 0))
+
+    def test_sims_share_padded_arrays(self):
+        sims = self.batch.next_experiment()
+        self.assertEqual(len(sims), 4)
+        self.assertEqual(sims[1].seq_no, 2)
+        self.assertTrue(np.shares_memory(sims[1].tick_total_dist, self.batch.tick_total_dist))
+        np.testing.assert_array_equal(sims[1].tick_state, self.batch.tick_state[0, 1, :sims[1].num_ticks])
+
+    def test_next_experiment_until_exhausted(self):
+        for _ in range(5):
+            self.assertFalse(self.batch.is_exhausted())
+            self.batch.next_experiment()
+        self.assertTrue(self.batch.is_exhausted())
+
+if __name__ == '__main__':
+    unittest.main()
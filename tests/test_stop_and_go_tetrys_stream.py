@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import stop_and_go_globals as sg
+from stop_and_go_tetrys_stream import (TETRYS_DATASET_TABLE, TETRYS_IMAGE_TABLE, TETRYS_LANE_TABLE, LocalTetrysSink,
+                                       TetrysStreamer, image_rows, load_local_tetrys_table, partition_rows,
+                                       write_tables_concurrently)
+
+TABLES = (TETRYS_DATASET_TABLE, TETRYS_IMAGE_TABLE, TETRYS_LANE_TABLE)
+
+class RecordingSink(object):
+
+    def __init__(self):
+        self.groups = []
+
+    def write_tetrys_rows(self, table, rows, exp_start, exp_stop):
+        self.groups.append((table, exp_start, exp_stop, [row["seq_no"] for row in rows]))
+
+    def sorted_groups(self):
+        # The tables of a group are written concurrently
+        return sorted(self.groups, key=lambda group: (group[1], TABLES.index(group[0])))
+
+class TestTetrysStreamer(unittest.TestCase):
+
+    def setUp(self):
+        self.sink = RecordingSink()
+        self.read_names = []
+        self.streamer = TetrysStreamer(self.sink, self.read_image, 2)
+
+    def read_image(self, name):
+        self.read_names.append(name)
+        return None
+
+    def write_experiment(self, exp_no, complete=True):
+        for frame_no in range(2):
+            self.streamer.write_json({"seq_no": exp_no, "frame_no": frame_no})
+        self.streamer.end_experiment(exp_no, complete)
+
+    @patch.object(sg, "DATASET_SPAN_FRAMES", 2)
+    def test_rows_flushed_per_group_of_experiments(self):
+        self.write_experiment(3)
+        self.assertEqual(self.sink.groups, [])
+        self.write_experiment(4, complete=False)
+        self.write_experiment(4)
+        self.write_experiment(5)
+        self.streamer.write_json({"seq_no": 6, "frame_no": 0})
+        self.streamer.close()
+
+        groups = self.sink.sorted_groups()
+        self.assertEqual(
+            [group[:3] for group in groups],
+            [(table, exp_start, exp_stop) for exp_start, exp_stop in ((3, 5), (5, 6)) for table in TABLES],
+        )
+        self.assertEqual(groups[0][3], [3, 3, 4, 4])
+        self.assertEqual(groups[2][3], [3, 4])
+        self.assertIn("Images/stop_00004_traffic_000001" + sg.MASK_IMAGE_EXTENSION, self.read_names)
+        self.assertIn("Images/stop_00005_LANES_000000.jpg", self.read_names)
+
+class TestPartitionRows(unittest.TestCase):
+
+    def test_contiguous_seq_no_ranges(self):
+        rows = [{"seq_no": seq_no, "frame_no": frame_no} for seq_no in (4, 1, 2, 3, 0) for frame_no in range(2)]
+        partitions = partition_rows(rows, 2)
+        self.assertEqual([[row["seq_no"] for row in partition] for partition in partitions],
+                         [[0, 0, 1, 1, 2, 2], [3, 3, 4, 4]])
+
+    def test_experiment_never_split(self):
+        rows = [{"seq_no": 7, "frame_no": frame_no} for frame_no in range(3)]
+        self.assertEqual(partition_rows(rows, 4), [rows])
+        self.assertEqual(partition_rows([], 4), [])
+
+class TestWriteTablesConcurrently(unittest.TestCase):
+
+    def test_all_tables_written(self):
+        written = []
+        write_tables_concurrently(lambda table, value: written.append((table, value)), [("a", 1), ("b", 2)])
+        self.assertEqual(sorted(written), [("a", 1), ("b", 2)])
+
+    def test_error_raised(self):
+        def write_table(table):
+            if table == "b":
+                raise IOError(table)
+
+        with self.assertRaises(IOError):
+            write_tables_concurrently(write_table, [("a",), ("b",)])
+
+class TestLocalTetrysSink(unittest.TestCase):
+
+    def setUp(self):
+        self.tetrys_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tetrys_dir)
+
+    @patch.object(sg, "DATASET_SPAN_FRAMES", 2)
+    def test_row_groups_loaded_in_order(self):
+        sink = LocalTetrysSink(self.tetrys_dir)
+        images = {
+            "Images/stop_{:05d}_ref_000001{}".format(exp_no, sg.MASK_IMAGE_EXTENSION): np.full((4, 4, 3), 9, np.uint8)
+            for exp_no in (0, 2)
+        }
+        for exp_start in (2, 0):
+            rows = image_rows(exp_start, exp_start + 2, images.get)
+            sink.write_tetrys_rows(TETRYS_IMAGE_TABLE, rows, exp_start, exp_start + 2)
+
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tetrys_dir, TETRYS_IMAGE_TABLE))),
+                         ["seq_00000_00001.npz", "seq_00002_00003.npz"])
+        table = load_local_tetrys_table(os.path.join(self.tetrys_dir, TETRYS_IMAGE_TABLE))
+        np.testing.assert_array_equal(table["seq_no"], [0, 0, 1, 1, 2, 2, 3, 3])
+        np.testing.assert_array_equal(table["frame_no"], [0, 1] * 4)
+        self.assertEqual(table["ref_image"].shape, (8, 4, 4, 3))
+        self.assertEqual(table["traffic_image"].shape, (8, sg.SUB_IMAGE_LENGTH, sg.SUB_IMAGE_WIDTH, 3))
+        # Missing images are black
+        self.assertTrue((table["ref_image"][1] == 9).all())
+        self.assertFalse(table["ref_image"][0].any())
+
+    @patch.object(sg, "DATASET_SPAN_FRAMES", 2)
+    def test_partitions_written_as_row_groups(self):
+        sink = LocalTetrysSink(self.tetrys_dir, num_partitions=2)
+        rows = image_rows(0, 3, lambda name: None)
+        sink.write_tetrys_rows(TETRYS_IMAGE_TABLE, rows, 0, 3)
+
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tetrys_dir, TETRYS_IMAGE_TABLE))),
+                         ["seq_00000_00001.npz", "seq_00002_00002.npz"])
+        table = load_local_tetrys_table(os.path.join(self.tetrys_dir, TETRYS_IMAGE_TABLE))
+        np.testing.assert_array_equal(table["seq_no"], [0, 0, 1, 1, 2, 2])
+
+if __name__ == '__main__':
+    unittest.main()
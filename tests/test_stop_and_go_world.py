@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+import pygame
+import stop_and_go_globals as sg
+from stop_and_go_actors import Car, Path, Stop_Area
+from stop_and_go_intersection_rules import Intersection_Rule
+from stop_and_go_sampler import Sim_Param_Sampler
+from stop_and_go_sim import Config_manager, Sim
+from stop_and_go_world import World_State
+
+def generate_scene(window, seed):
+    """ Same scene as Generator.generate_objects """
+    np.random.seed(seed)
+    config_manager = Config_manager()
+    time_stopped = Sim_Param_Sampler(config_manager).sample_time_stopped(1)[0]
+    mid_x, mid_y = sg.WINDOW_WIDTH_PIXELS / 2, sg.WINDOW_LENGTH_PIXELS / 2
+    lane = sg.LANE_BUFFER_PIXELS / 2
+    path_list = [
+        Path(0, mid_y + lane, sg.WINDOW_WIDTH_PIXELS, mid_y + lane, 0, mid_y + lane),
+        Path(mid_x - lane, 0, mid_x - lane, sg.WINDOW_LENGTH_PIXELS, 1, mid_x - lane),
+        Path(sg.WINDOW_WIDTH_PIXELS, mid_y - lane, 0, mid_y - lane, 2, mid_y - lane),
+        Path(mid_x + lane, sg.WINDOW_LENGTH_PIXELS, mid_x + lane, 0, 3, mid_x + lane),
+    ]
+    half_width = sg.CAR_WIDTH_PIXELS / 2
+    car_list = [
+        Car(0, mid_y + lane - half_width, sg.CAR_LENGTH_PIXELS, sg.CAR_WIDTH_PIXELS, 1,
+            Sim(config_manager, 1, time_stopped), 0, window),
+        Car(mid_x - lane - half_width, 0, sg.CAR_WIDTH_PIXELS, sg.CAR_LENGTH_PIXELS, 2,
+            Sim(config_manager, 2, time_stopped), 0, window),
+        Car(sg.WINDOW_WIDTH_PIXELS - sg.CAR_LENGTH_PIXELS, mid_y - lane - half_width, sg.CAR_LENGTH_PIXELS,
+            sg.CAR_WIDTH_PIXELS, 3, Sim(config_manager, 3, time_stopped), 0, window),
+        Car(mid_x + lane - half_width, sg.WINDOW_LENGTH_PIXELS - sg.CAR_LENGTH_PIXELS, sg.CAR_WIDTH_PIXELS,
+            sg.CAR_LENGTH_PIXELS, 4, Sim(config_manager, 4, time_stopped), 0, window),
+    ]
+    sprite_mid = Stop_Area(mid_x - sg.SPRITE_MID_LEN_OFFSET, mid_y - sg.SPRITE_MID_LEN_OFFSET,
+                           2 * sg.SPRITE_MID_LEN_OFFSET, 2 * sg.SPRITE_MID_LEN_OFFSET, window)
+    return car_list, path_list, None, sprite_mid
+
+class TestWorldState(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.window = pygame.display.set_mode((sg.WINDOW_WIDTH_PIXELS, sg.WINDOW_LENGTH_PIXELS))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_cars_read_and_write_columns(self):
+        car_list, _, _, _ = generate_scene(self.window, 0)
+        world_state = World_State(car_list)
+        car = car_list[2]
+        self.assertEqual(car.pose.x, world_state.columns["x"][2])
+        self.assertIsInstance(car.pose.x, float)
+        self.assertIsInstance(car.sim_state.end, bool)
+
+        car.pose.y = 42.5
+        car.sim_state.stop_car = True
+        self.assertEqual(world_state.position[2, 1], 42.5)
+        self.assertTrue(world_state.columns["stop_car"][2])
+        # The previous pose isn't part of the world
+        car.prev_pose.x = 7
+        self.assertEqual(car.prev_pose.x, 7)
+
+    def test_step_matches_per_car_update(self):
+        for seed in range(3):
+            car_list, path_list, _, sprite_mid = generate_scene(self.window, seed)
+            world_car_list, world_path_list, _, world_sprite_mid = generate_scene(self.window, seed)
+            world_state = World_State(world_car_list)
+            rule, world_rule = Intersection_Rule(), Intersection_Rule()
+
+            for _ in range(1200):
+                rule.update_cars_through_intersection(car_list, sprite_mid)
+                for car in car_list:
+                    car.update_car_position(path_list, sprite_mid)
+                    car.check_outside_boundary()
+
+                world_rule.update_cars_through_intersection(world_car_list, world_sprite_mid, world_state)
+                world_state.step(world_car_list, world_path_list, world_sprite_mid)
+
+                for car, world_car in zip(car_list, world_car_list):
+                    self.assertEqual((car.pose.x, car.pose.y), (world_car.pose.x, world_car.pose.y))
+                    self.assertEqual(car.sim_state.cur_state, world_car.sim_state.cur_state)
+                    self.assertEqual(car.sim_state.end, world_car.sim_state.end)
+
+            self.assertTrue(all(car.sim_state.end for car in world_car_list))
+
+    def test_boundary_exit(self):
+        car_list, path_list, _, sprite_mid = generate_scene(self.window, 0)
+        world_state = World_State(car_list)
+        car_list[0].pose.x = sg.WINDOW_WIDTH_PIXELS + 1
+        world_state.update_outside_boundary()
+        self.assertTrue(car_list[0].sim_state.end)
+        self.assertFalse(any(car.sim_state.end for car in car_list[1:]))
+
+if __name__ == '__main__':
+    unittest.main()